@@ -0,0 +1,19 @@
+Feature: Parallelstore Metadata Performance Testing
+
+  Scenario: mdtest-style metadata operations in per-worker directory trees
+    Given a GKE cluster is running
+    And a deployment named "ps-perf" exists in the "ps" namespace
+    When the deployment runs metadata operations in "unique" trees of depth 2 and fan-out 4 on 50 replicas for 5 min
+    Then the client-side "create" rate should be at least 5000 ops/s with p99 below 50 ms
+    And the client-side "stat" rate should be at least 20000 ops/s with p99 below 20 ms
+    And the client-side "open_close" rate should be at least 10000 ops/s with p99 below 20 ms
+    And the client-side "rename" rate should be at least 2000 ops/s with p99 below 100 ms
+    And the client-side "unlink" rate should be at least 5000 ops/s with p99 below 50 ms
+
+  Scenario: mdtest-style metadata operations in one shared directory tree
+    Given a GKE cluster is running
+    And a deployment named "ps-perf" exists in the "ps" namespace
+    When the deployment runs metadata operations in "shared" trees of depth 1 and fan-out 4 on 50 replicas for 5 min
+    Then the client-side "create" rate should be at least 1000 ops/s with p99 below 250 ms
+    And the client-side "stat" rate should be at least 10000 ops/s with p99 below 50 ms
+    And the client-side "unlink" rate should be at least 1000 ops/s with p99 below 250 ms
\ No newline at end of file
@@ -1,8 +1,26 @@
 Feature: Parallelstore Read Performance Testing
 
-  Scenario: Successfully scale an exisitng deployment to 10,000 replicas and read to Parallelstore
+  Scenario Outline: Successfully scale an exisitng deployment to <replicas> replicas and read <file_size_mb>MB files from Parallelstore
+    Given a GKE cluster is running
+    And a deployment named "ps-perf" exists in the "ps" namespace
+    And <num_files> files of <file_size_mb>MB each exist in the Parallelstore mount
+    When the deployment has <replicas> replicas up and running until throughput is steady, for at most <minutes> min
+    Then the Parallelstore IOPS and throughput should be within the GCP official benchmarks over the steady window
+    And the pod startup and volume mount breakdown should be written to "results/read_startup_<replicas>.json"
+
+    Examples:
+      | num_files | file_size_mb | replicas | minutes |
+      | 100       | 5            | 5000     | 10      |
+
+  Scenario: Read scaling curve over replicas and file size
+    Given a GKE cluster is running
+    And a deployment named "ps-perf" exists in the "ps" namespace
+    When the read workload is swept over "500, 1000, 2500, 5000" replicas and "1, 5, 25" MB files of 100 files for at most 5 min per point
+    Then the scaling curve of IOPS and throughput should be written to "results/read_scaling_curve"
+
+  Scenario: Staged ramp-up to find where read throughput saturates
     Given a GKE cluster is running
     And a deployment named "ps-perf" exists in the "ps" namespace
     And 100 files of 5MB each exist in the Parallelstore mount
-    When the deployment has 5000 replicas up and running for 10 min
-    Then the Parallelstore IOPS and throughput should be within the GCP official benchmarks after 10min test
\ No newline at end of file
+    When the deployment is ramped through "100, 500, 1000, 2500, 5000" replicas holding each step until throughput is steady
+    Then the ramp report with the knee point should be written to "results/read_ramp"
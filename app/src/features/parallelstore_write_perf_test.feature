@@ -0,0 +1,13 @@
+Feature: Parallelstore Write Performance Testing
+
+  Scenario: Checkpoint-style file-per-process writes with fsync
+    Given a GKE cluster is running
+    And a deployment named "ps-perf" exists in the "ps" namespace
+    When the deployment runs "nn" writes with "fsync" sync policy on 100 replicas for 5 min
+    Then the client-side write throughput should be at least 500 MB/s
+
+  Scenario: Shared-file strided writes with O_DIRECT
+    Given a GKE cluster is running
+    And a deployment named "ps-perf" exists in the "ps" namespace
+    When the deployment runs "n1" writes with "o_direct,fsync" sync policy on 100 replicas for 5 min
+    Then the client-side write throughput should be at least 500 MB/s
\ No newline at end of file
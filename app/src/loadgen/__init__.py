@@ -0,0 +1,3 @@
+"""
+Parallelstore load generator (read_file.py) and tools to run it outside the cluster.
+"""
@@ -0,0 +1,4 @@
+import sys
+from src.loadgen.cli import main
+
+sys.exit(main())
@@ -0,0 +1,74 @@
+import os
+import json
+import time
+import tempfile
+import pytest
+
+# The generator reads its settings from the environment when it is imported,
+# so point it at a scratch directory before any benchmark module imports it.
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="loadgen_bench_"))
+os.environ["PROCESSES"] = "1"
+
+RESULTS = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark-json", default=None, help="Write per-benchmark timings to this JSON file.")
+
+
+class Benchmark:
+    """
+    Times a callable over repeated rounds, in the style of pytest-benchmark's fixture.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, func, *args, rounds=5, round_time=0.05):
+        """
+        Run func(*args) in `rounds` rounds of about `round_time` seconds each.
+
+        Returns:
+            dict: "min", "mean" and "max" seconds per call over the rounds, and "iterations" per round.
+        """
+        iterations, elapsed = 1, 0.0
+        while elapsed < round_time / 10:
+            iterations *= 10
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func(*args)
+            elapsed = time.perf_counter() - start
+        iterations = max(1, int(iterations * round_time / elapsed))
+
+        per_call = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func(*args)
+            per_call.append((time.perf_counter() - start) / iterations)
+        stats = {"min": min(per_call), "mean": sum(per_call) / rounds, "max": max(per_call), "iterations": iterations}
+        RESULTS[self.name] = stats
+        return stats
+
+
+@pytest.fixture
+def benchmark(request):
+    """
+    Fixture returning a Benchmark named after the test.
+    """
+    return Benchmark(request.node.name)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not RESULTS:
+        return
+    terminalreporter.section("load generator overhead")
+    for name, stats in RESULTS.items():
+        terminalreporter.write_line(
+            f"{name:<50} min {stats['min'] * 1e6:10.2f}us  mean {stats['mean'] * 1e6:10.2f}us  "
+            f"({stats['iterations']} iterations/round)"
+        )
+    path = config.getoption("--benchmark-json")
+    if path:
+        with open(path, "w") as f:
+            json.dump(RESULTS, f, indent=2)
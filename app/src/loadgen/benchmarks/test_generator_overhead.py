@@ -0,0 +1,85 @@
+"""
+Overhead of the load generator's own per-operation work.
+
+The budgets are an order of magnitude above what the code needs on a
+developer machine; they catch regressions that would start to skew cluster
+results, not small fluctuations. Run from app/ with:
+
+    PYTHONPATH=. pytest src/loadgen/benchmarks [--benchmark-json results.json]
+"""
+import os
+import pytest
+
+from src.loadgen import read_file
+from src.loadgen.cli import render_configmap, CONFIGMAP_PATH
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Seconds per call
+RECORD_BUDGET = 20e-6
+CHOOSER_BUDGET = 50e-6
+READ_OVERHEAD_BUDGET = 500e-6
+COLLECT_BUDGET = 0.5
+
+
+@pytest.fixture(scope="module", autouse=True)
+def generator_metrics():
+    """The generator's OpStats and gauges, created like main() does in a pod."""
+    read_file.setup()
+
+
+@pytest.fixture(scope="module")
+def indexed_files():
+    """Small test files in the generator's DATA_DIR, indexed like in a pod."""
+    for i in range(1, 101):
+        with open(os.path.join(read_file.DATA_DIR, f"test_file_{i}.txt"), "wb") as f:
+            f.write(os.urandom(4096))
+    read_file.file_index.refresh()
+    return read_file.file_index
+
+
+def test_hdr_index(benchmark):
+    stats = benchmark(read_file.hdr_index, 12345)
+    assert stats["min"] < RECORD_BUDGET
+
+
+def test_record_latency(benchmark):
+    stats = benchmark(read_file.op_stats.record, 0, "stat", 0.000123)
+    assert stats["min"] < RECORD_BUDGET
+
+
+def test_timed_metadata_call(benchmark):
+    stats = benchmark(read_file.timed, 0, "stat", int)
+    assert stats["min"] < RECORD_BUDGET
+
+
+@pytest.mark.parametrize("pattern", ["uniform", "zipf", "sequential", "hotcold"])
+def test_choose_file(benchmark, monkeypatch, indexed_files, pattern):
+    monkeypatch.setattr(read_file, "ACCESS_PATTERN", pattern)
+    monkeypatch.setattr(read_file, "thread_buffers", type(read_file.thread_buffers)())
+    chooser = read_file.get_chooser(0)
+    stats = benchmark(lambda: indexed_files.path(chooser(len(indexed_files))))
+    assert stats["min"] < CHOOSER_BUDGET
+
+
+def test_read_small_file(benchmark, monkeypatch, indexed_files):
+    # Buffered 4 KiB reads from local files: nearly all of the time is generator overhead
+    monkeypatch.setattr(read_file, "DIRECT_IO", False)
+    stats = benchmark(read_file.read_file, 0, 4096)
+    assert read_file.read_file(0, 4096)[0] == 4096
+    assert stats["min"] < READ_OVERHEAD_BUDGET
+
+
+def test_collect_all_shards(benchmark):
+    for worker_index in range(read_file.op_stats.workers):
+        for op in read_file.OPS:
+            for latency in (0.00005, 0.002, 0.3):
+                read_file.op_stats.record(worker_index, op, latency)
+    stats = benchmark(read_file.op_stats.collect, rounds=3, round_time=0.2)
+    assert stats["min"] < COLLECT_BUDGET
+
+
+def test_configmap_in_sync():
+    with open(os.path.join(APP_DIR, CONFIGMAP_PATH)) as f:
+        assert f.read() == render_configmap(), \
+            "examples/perf_configmap.yaml is out of date; run: PYTHONPATH=. python -m src.loadgen configmap"
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from src.loadgen.read_file import OPS
+from src.utils.logging_util import get_logger
+from src.utils.scrape_util import parse_histogram, parse_counter, summarize_client_latency, OP_LATENCY_METRIC
+
+logger = get_logger(__name__)
+
+GENERATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "read_file.py")
+
+CONFIGMAP_PATH = "examples/perf_configmap.yaml"
+CONFIGMAP_HEADER = """apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: threading-metric-cm
+  namespace: ps
+data:
+  read_file.py: |
+"""
+
+
+def render_configmap(source_path=GENERATOR_PATH):
+    """
+    Render the perf ConfigMap that mounts the load generator into the perf pods.
+
+    Args:
+        source_path (str): Path of the generator source to embed.
+
+    Returns:
+        str: ConfigMap YAML with the source as a literal block.
+    """
+    with open(source_path) as source:
+        lines = source.read().rstrip("\n").split("\n")
+    return CONFIGMAP_HEADER + "\n".join(f"    {line}" if line.strip() else "" for line in lines) + "\n"
+
+
+def seed_local_files(directory, num_files, file_size_bytes, prefix="test_file_"):
+    """
+    Create the read workload's test files in a local directory, keeping any that already exist.
+
+    Args:
+        directory (str): Directory to create the files in.
+        num_files (int): Number of files the directory should contain.
+        file_size_bytes (int): Size of each created file in bytes.
+        prefix (str): File name prefix the generator looks for.
+
+    Returns:
+        int: Number of files created.
+    """
+    os.makedirs(directory, exist_ok=True)
+    created = 0
+    for i in range(1, num_files + 1):
+        path = os.path.join(directory, f"{prefix}{i}.txt")
+        if os.path.exists(path) and os.path.getsize(path) == file_size_bytes:
+            continue
+        with open(path, "wb") as f:
+            f.write(os.urandom(file_size_bytes))
+        created += 1
+    logger.info(f"Created {created} of {num_files} test files ({file_size_bytes} bytes each) in {directory}.")
+    return created
+
+
+def _free_port():
+    """
+    Return a TCP port on localhost that is currently unused.
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _fetch_metrics(port, timeout=5):
+    """
+    Fetch the generator's /metrics page.
+    """
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=timeout) as response:
+        return response.read().decode()
+
+
+def _snapshot(text):
+    """
+    Extract per-operation histograms and counters from one /metrics page.
+    """
+    return {
+        "time": time.time(),
+        "histograms": {op: parse_histogram(text, OP_LATENCY_METRIC, {"op": op}) for op in OPS},
+        "errors": {op: parse_counter(text, "parallelstore_errors_total", {"op": op}) for op in OPS},
+        "bytes": {op: parse_counter(text, "parallelstore_bytes_total", {"op": op}) for op in OPS},
+        "completed": parse_counter(text, "parallelstore_completed_ops_total"),
+        "offered": parse_counter(text, "parallelstore_offered_ops_total"),
+        "dropped": parse_counter(text, "parallelstore_dropped_ops_total"),
+    }
+
+
+def run_local(data_dir, settings, duration=30, warmup=2, startup_timeout=30, log_file=None):
+    """
+    Run the load generator against a local directory and measure it like the perf scenarios do.
+
+    The generator runs as a subprocess exactly as in a pod, configured through
+    environment variables, and is scraped at both ends of the measurement window.
+
+    Args:
+        data_dir (str): Directory to run the workload in (tmpfs, local disk or a mount).
+        settings (dict): Generator environment variables, e.g. {"WORKLOAD": "read", "WORKERS": "4"}.
+        duration (float): Length of the measurement window in seconds.
+        warmup (float): Seconds to run before the window starts.
+        startup_timeout (float): Maximum time in seconds to wait for the metrics endpoint.
+        log_file (str): File to write the generator's output to; discarded if not given.
+
+    Returns:
+        dict: Machine-readable result with "settings", "duration_s", the pod-wide "completed_per_s",
+              "offered_per_s" and "dropped", and "ops" (operation -> ops_per_s, mb_per_s, errors,
+              p50, p99 and p999 in seconds) for every operation type that ran.
+
+    Raises:
+        RuntimeError: If the generator exits or its endpoint does not come up.
+    """
+    port = _free_port()
+    env = dict(os.environ, **{key: str(value) for key, value in settings.items()}, DATA_DIR=data_dir,
+               METRICS_PORT=str(port))
+    output = open(log_file, "ab") if log_file else subprocess.DEVNULL
+    logger.info(f"Starting load generator in {data_dir} on port {port} with {settings}")
+    process = subprocess.Popen([sys.executable, GENERATOR_PATH], env=env, stdout=output, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Load generator exited with code {process.returncode} during startup.")
+            try:
+                _fetch_metrics(port)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"Load generator metrics endpoint did not come up within {startup_timeout} seconds.")
+                time.sleep(0.1)
+
+        time.sleep(warmup)
+        before = _snapshot(_fetch_metrics(port))
+        time.sleep(duration)
+        after = _snapshot(_fetch_metrics(port))
+        if process.poll() is not None:
+            raise RuntimeError(f"Load generator exited with code {process.returncode} during the run.")
+    finally:
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if log_file:
+            output.close()
+
+    elapsed = after["time"] - before["time"]
+    result = {
+        "settings": dict(settings),
+        "duration_s": round(elapsed, 3),
+        "completed_per_s": (after["completed"] - before["completed"]) / elapsed,
+        "offered_per_s": (after["offered"] - before["offered"]) / elapsed,
+        "dropped": after["dropped"] - before["dropped"],
+        "ops": {},
+    }
+    for op in OPS:
+        if after["histograms"][op]["count"] == before["histograms"][op]["count"] and not after["errors"][op]:
+            continue
+        latency = summarize_client_latency(
+            {"time": before["time"], "histograms": {"local": before["histograms"][op]}},
+            {"time": after["time"], "histograms": {"local": after["histograms"][op]}},
+        )
+        result["ops"][op] = {
+            "ops_per_s": latency["ops_per_s"],
+            "mb_per_s": (after["bytes"][op] - before["bytes"][op]) / (1024 * 1024) / elapsed,
+            "errors": after["errors"][op] - before["errors"][op],
+            "p50": latency["p50"],
+            "p99": latency["p99"],
+            "p999": latency["p999"],
+        }
+    return result
+
+
+def _parse_settings(args):
+    """
+    Build the generator environment from the command line.
+    """
+    settings = {
+        "WORKLOAD": args.workload,
+        "LOAD_MODE": args.load_mode,
+        "WORKERS": args.workers,
+        "PROCESSES": args.processes,
+    }
+    for assignment in args.set:
+        key, separator, value = assignment.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid setting: {assignment}. Use KEY=VALUE.")
+        settings[key] = value
+    return settings
+
+
+def main(argv=None):
+    """
+    Command line entry point: python -m src.loadgen {run,configmap} ...
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.loadgen", description="Parallelstore load generator tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run a workload against a local directory and print a JSON result.")
+    run.add_argument("--data-dir", required=True, help="Directory to run the workload in.")
+    run.add_argument("--workload", default="read", choices=("read", "write", "metadata"))
+    run.add_argument("--load-mode", default="closed", choices=("closed", "open", "sweep"))
+    run.add_argument("--workers", type=int, default=4, help="Threads per process.")
+    run.add_argument("--processes", type=int, default=1)
+    run.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                     help="Any other generator environment variable, e.g. BLOCK_SIZE=65536. Repeatable.")
+    run.add_argument("--duration", type=float, default=30, help="Measurement window in seconds.")
+    run.add_argument("--warmup", type=float, default=2, help="Seconds to run before measuring.")
+    run.add_argument("--files", type=int, default=100, help="Test files to create for the read workload.")
+    run.add_argument("--file-size", type=int, default=5 * 1024 * 1024, help="Size of each test file in bytes.")
+    run.add_argument("--log-file", help="Write the generator's log to this file.")
+    run.add_argument("--output", help="Write the JSON result to this file instead of stdout.")
+
+    configmap = subparsers.add_parser("configmap", help="Render the perf ConfigMap from the generator source.")
+    configmap.add_argument("--output", default=CONFIGMAP_PATH)
+    configmap.add_argument("--check", action="store_true", help="Only report whether the ConfigMap is up to date.")
+
+    args = parser.parse_args(argv)
+    if args.command == "configmap":
+        rendered = render_configmap()
+        if args.check:
+            with open(args.output) as f:
+                in_sync = f.read() == rendered
+            logger.info(f"{args.output} is {'up to date' if in_sync else 'out of date'}.")
+            return 0 if in_sync else 1
+        with open(args.output, "w") as f:
+            f.write(rendered)
+        logger.info(f"Wrote {args.output}.")
+        return 0
+
+    settings = _parse_settings(args)
+    if args.workload == "read":
+        seed_local_files(args.data_dir, args.files, args.file_size)
+    result = run_local(args.data_dir, settings, args.duration, args.warmup, log_file=args.log_file)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
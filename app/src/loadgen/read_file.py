@@ -0,0 +1,778 @@
+"""Parallelstore load generator.
+
+Runs as /app/read_file.py in the perf deployment (mounted from
+examples/perf_configmap.yaml) and is configured entirely through environment
+variables. Importing the module only reads them; the metrics are created by
+setup(), which main() calls, so the functions can also be driven in-process
+after calling it. See src.loadgen.cli for local runs.
+"""
+import os
+import tempfile
+from prometheus_client import start_http_server, Gauge, REGISTRY, CollectorRegistry, multiprocess, values
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+import time
+import logging
+import random
+import multiprocessing
+import queue
+import signal  # Import signal module
+import threading
+import mmap
+import bisect
+import functools
+from array import array
+
+# Set up logging
+logger = logging.getLogger()
+
+# Get the pod name from the environment variable
+pod_name = os.getenv('POD_NAME', 'unknown_pod')
+
+# Load model configuration (see run_closed_loop / run_open_loop)
+PROCESSES = int(os.getenv('PROCESSES', '1'))  # Worker processes, each running WORKERS threads (see run_processes)
+LOAD_MODE = os.getenv('LOAD_MODE', 'closed')  # "closed": N workers back to back, "open": fixed ops/s
+WORKERS = int(os.getenv('WORKERS', '10'))  # Number of worker threads per process
+TOTAL_WORKERS = PROCESSES * WORKERS  # Workers in the pod; worker indices run from 0 to TOTAL_WORKERS - 1
+TARGET_OPS = float(os.getenv('TARGET_OPS', '100'))  # Open loop: offered reads per second for the whole pod
+QUEUE_SIZE = int(os.getenv('QUEUE_SIZE', str(2 * WORKERS)))  # Open loop: max reads waiting for a worker
+REPORT_INTERVAL = float(os.getenv('REPORT_INTERVAL', '10'))  # Seconds between rate reports
+DATA_DIR = os.getenv('DATA_DIR', '/data')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '7001'))  # Port of the Prometheus endpoint
+
+# Workload selection
+WORKLOAD = os.getenv('WORKLOAD', 'read')  # "read", "write" (see write_file) or "metadata" (see metadata_iteration)
+
+# Read path configuration (see read_file)
+BLOCK_SIZE = int(os.getenv('BLOCK_SIZE', str(1024 * 1024)))  # Bytes per block; a multiple of 4096 for O_DIRECT
+QUEUE_DEPTH = int(os.getenv('QUEUE_DEPTH', '4'))  # Blocks requested per readv() call
+DIRECT_IO = os.getenv('DIRECT_IO', '1') == '1'  # Read with O_DIRECT; set to 0 to go through the client cache
+SWEEP_BLOCK_SIZES = [int(size) for size in os.getenv(
+    'SWEEP_BLOCK_SIZES', '4096,16384,65536,262144,1048576,4194304,16777216').split(',')]  # 4K-16M
+SWEEP_DURATION = float(os.getenv('SWEEP_DURATION', '30'))  # Seconds per block size in sweep mode
+
+# File selection (see FileIndex and get_chooser)
+ACCESS_PATTERN = os.getenv('ACCESS_PATTERN', 'uniform')  # "uniform", "zipf", "sequential" or "hotcold"
+SEED = os.getenv('SEED') or None  # Seed for reproducible file sequences; unset for a random seed
+INDEX_REFRESH_INTERVAL = float(os.getenv('INDEX_REFRESH_INTERVAL', '60'))  # Seconds between rescans; 0 scans once
+ZIPF_EXPONENT = float(os.getenv('ZIPF_EXPONENT', '1.1'))  # Skew of the zipf pattern
+HOT_FRACTION = float(os.getenv('HOT_FRACTION', '0.2'))  # Hotcold: share of files in the hot set
+HOT_PROBABILITY = float(os.getenv('HOT_PROBABILITY', '0.8'))  # Hotcold: share of reads going to the hot set
+
+# Write path configuration (see write_file)
+WRITE_PATTERN = os.getenv('WRITE_PATTERN', 'nn')  # "nn": file per worker, "n1": one file shared by all pods, strided
+WRITE_SIZE = int(os.getenv('WRITE_SIZE', str(16 * 1024 * 1024)))  # Bytes each worker writes per operation
+SYNC_POLICY = {p for p in os.getenv('SYNC_POLICY', 'none').split(',') if p not in ('', 'none')}  # fsync, o_direct, o_sync
+WRITE_DIR = os.getenv('WRITE_DIR', os.path.join(DATA_DIR, 'writes'))
+N1_PODS = int(os.getenv('N1_PODS', '1'))  # Pods sharing the n1 file, i.e. the deployment's replica count
+N1_RUN_ID = os.getenv('N1_RUN_ID', 'default')  # Names the n1 file and its slot claims; use a new one per run
+
+# Metadata workload configuration (see metadata_iteration)
+METADATA_DIR = os.getenv('METADATA_DIR', os.path.join(DATA_DIR, 'metadata'))
+METADATA_TREE = os.getenv('METADATA_TREE', 'unique')  # "unique": tree per worker, "shared": one tree for all workers
+METADATA_DEPTH = int(os.getenv('METADATA_DEPTH', '2'))  # Directory levels below the tree root
+METADATA_FANOUT = int(os.getenv('METADATA_FANOUT', '4'))  # Subdirectories per directory
+METADATA_FILES_PER_DIR = int(os.getenv('METADATA_FILES_PER_DIR', '10'))  # Files per leaf directory and worker
+METADATA_OPS = ('create', 'stat', 'open_close', 'rename', 'unlink')
+
+# Operation types recorded by OpStats: "read" per file, "write" per block, "fsync" and "file"
+# per whole write operation, and the metadata operations
+OPS = ('read', 'write', 'fsync', 'file') + METADATA_OPS
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', '0.001'))  # Share of operations logged individually
+
+def setup_logging():
+    """Log INFO to the console and errors to DATA_DIR/error.log."""
+    logger.setLevel(logging.INFO)
+
+    # Create a file handler for error logging
+    error_handler = logging.FileHandler(os.path.join(DATA_DIR, 'error.log'))
+    error_handler.setLevel(logging.ERROR)
+
+    # Create a console handler for info logging
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+
+    # Create a formatter and set it for both handlers
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s [Thread: %(threadName)s]')
+    error_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    # Add the handlers to the logger
+    logger.addHandler(error_handler)
+    logger.addHandler(console_handler)
+
+# Latency histograms are log-linear (HDR) in microseconds: exact below HDR_SUB_BUCKETS us, then
+# HDR_SUB_BUCKETS / 2 buckets per power of two (under 1.6% relative error) up to 2**27 us (~134s).
+# The extra last bucket holds anything longer and is only exported as +Inf.
+HDR_SUB_BUCKETS = 128
+HDR_MAX_EXPONENT = 20
+HDR_BUCKETS = HDR_SUB_BUCKETS + HDR_MAX_EXPONENT * (HDR_SUB_BUCKETS // 2)
+
+def hdr_index(us):
+    """Return the histogram bucket of a latency in whole microseconds."""
+    if us < HDR_SUB_BUCKETS:
+        return us
+    exponent = us.bit_length() - 7
+    if exponent > HDR_MAX_EXPONENT:
+        return HDR_BUCKETS
+    return HDR_SUB_BUCKETS + (exponent - 1) * 64 + (us >> exponent) - 64
+
+def hdr_upper_bound(index):
+    """Return the exclusive upper bound of a histogram bucket in seconds."""
+    if index < HDR_SUB_BUCKETS:
+        return (index + 1) / 1e6
+    exponent, sub_bucket = divmod(index - HDR_SUB_BUCKETS, 64)
+    return ((sub_bucket + 65) << (exponent + 1)) / 1e6
+
+class OpStats:
+    """Per-worker operation counters and latency histograms in shared memory.
+
+    Every worker index owns one shard and is its only writer, so recording
+    takes no lock. The arrays are allocated before worker processes fork,
+    which lets the process serving /metrics merge all shards on each scrape.
+    """
+
+    def __init__(self, workers):
+        self.width = len(OPS) * (HDR_BUCKETS + 1)
+        self.counts = multiprocessing.RawArray('q', workers * self.width)
+        self.sums = multiprocessing.RawArray('d', workers * len(OPS))
+        self.ops = multiprocessing.RawArray('q', workers * len(OPS))
+        self.errors = multiprocessing.RawArray('q', workers * len(OPS))
+        self.bytes = multiprocessing.RawArray('q', workers * len(OPS))
+        # Load-model counters, one per worker index; in open-loop mode the dispatcher of a
+        # process writes offered and dropped in the slot of the process's first worker
+        self.offered = multiprocessing.RawArray('q', workers)
+        self.completed = multiprocessing.RawArray('q', workers)
+        self.dropped = multiprocessing.RawArray('q', workers)
+        self.workers = workers
+        self.op_slots = {op: slot for slot, op in enumerate(OPS)}
+
+    def record(self, worker_index, op, seconds, transferred=0):
+        """Record one successful operation of a worker."""
+        slot = worker_index * len(OPS) + self.op_slots[op]
+        self.counts[slot * (HDR_BUCKETS + 1) + hdr_index(int(seconds * 1e6))] += 1
+        self.sums[slot] += seconds
+        self.ops[slot] += 1
+        if transferred:
+            self.bytes[slot] += transferred
+
+    def error(self, worker_index, op):
+        """Count one failed operation of a worker."""
+        self.errors[worker_index * len(OPS) + self.op_slots[op]] += 1
+
+    def offer(self, worker_index):
+        """Count one operation offered by the load model."""
+        self.offered[worker_index] += 1
+
+    def complete(self, worker_index):
+        """Count one workload operation (read, file write or metadata iteration) completed."""
+        self.completed[worker_index] += 1
+
+    def drop(self, worker_index):
+        """Count one offered operation dropped because the work queue was full."""
+        self.dropped[worker_index] += 1
+
+    def merged_buckets(self, op):
+        """Sum the histogram of one operation over all workers that recorded it."""
+        merged = [0] * (HDR_BUCKETS + 1)
+        op_slot = self.op_slots[op]
+        for worker_index in range(self.workers):
+            slot = worker_index * len(OPS) + op_slot
+            if self.ops[slot]:
+                start = slot * (HDR_BUCKETS + 1)
+                merged = list(map(int.__add__, merged, self.counts[start:start + HDR_BUCKETS + 1]))
+        return merged
+
+    def collect(self):
+        """Export the merged shards; called by prometheus_client on every scrape."""
+        latency = HistogramMetricFamily('parallelstore_op_latency_seconds', 'Latency of individual operations in seconds',
+                                        labels=['op'])
+        ops = CounterMetricFamily('parallelstore_ops', 'Operations completed', labels=['op'])
+        errors = CounterMetricFamily('parallelstore_errors', 'Operations failed', labels=['op'])
+        transferred = CounterMetricFamily('parallelstore_bytes', 'Bytes read or written', labels=['op'])
+        offered = CounterMetricFamily('parallelstore_offered_ops', 'Operations offered by the load model',
+                                      value=sum(self.offered))
+        completed = CounterMetricFamily('parallelstore_completed_ops', 'Operations completed', value=sum(self.completed))
+        dropped = CounterMetricFamily('parallelstore_dropped_ops',
+                                      'Open-loop operations dropped because the work queue was full',
+                                      value=sum(self.dropped))
+        for op, op_slot in self.op_slots.items():
+            slots = range(op_slot, self.workers * len(OPS), len(OPS))
+            count = sum(self.ops[slot] for slot in slots)
+            ops.add_metric([op], count)
+            errors.add_metric([op], sum(self.errors[slot] for slot in slots))
+            transferred.add_metric([op], sum(self.bytes[slot] for slot in slots))
+            if not count:
+                continue
+            # Only non-empty buckets are exported, each preceded by its lower edge, so the
+            # exposition stays small while quantiles can still be interpolated per bucket.
+            buckets, cumulative = [], 0
+            merged = self.merged_buckets(op)
+            for index in range(HDR_BUCKETS):
+                if not merged[index]:
+                    continue
+                if index and not merged[index - 1]:
+                    buckets.append((f"{hdr_upper_bound(index - 1):.9g}", cumulative))
+                cumulative += merged[index]
+                buckets.append((f"{hdr_upper_bound(index):.9g}", cumulative))
+            buckets.append(("+Inf", cumulative + merged[HDR_BUCKETS]))
+            latency.add_metric([op], buckets, sum(self.sums[slot] for slot in slots))
+        return [latency, ops, errors, transferred, offered, completed, dropped]
+
+op_stats = None  # OpStats of all workers in the pod, created by setup()
+
+def log_sampled(level, message):
+    """Log a per-operation message for a random LOG_SAMPLE_RATE share of operations."""
+    if random.random() < LOG_SAMPLE_RATE:
+        logger.log(level, message)
+
+# Gauges, created by setup(): file index size, block-size sweep results and open-loop backlog
+index_files = sweep_iops = sweep_throughput = queue_depth = None
+
+def setup():
+    """Allocate the OpStats shards and create the metrics; safe to call more than once.
+
+    In multi-process mode (see run_processes) the gauges have to live in
+    prometheus_client's memory-mapped value store, which it picks from
+    PROMETHEUS_MULTIPROC_DIR, so the directory is set and the value class
+    chosen again before any gauge is created.
+    """
+    global op_stats, index_files, sweep_iops, sweep_throughput, queue_depth
+    if op_stats is not None:
+        return
+    if PROCESSES > 1:
+        os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', tempfile.mkdtemp(prefix='prometheus_'))
+        values.ValueClass = values.get_value_class()
+    op_stats = OpStats(TOTAL_WORKERS)
+    REGISTRY.register(op_stats)
+    # Gauges say how values of several processes combine in multi-process mode
+    index_files = Gauge('parallelstore_index_files', 'Test files in the cached file index', multiprocess_mode='livemax')
+    sweep_iops = Gauge('parallelstore_sweep_iops', 'Block reads per second in the block-size sweep', ['block_size'],
+                       multiprocess_mode='livesum')
+    sweep_throughput = Gauge('parallelstore_sweep_mb_per_s', 'MB/s read in the block-size sweep', ['block_size'],
+                             multiprocess_mode='livesum')
+    # Offered, completed and dropped operations are counted in op_stats
+    queue_depth = Gauge('parallelstore_queue_depth', 'Open-loop reads waiting for a worker', multiprocess_mode='livesum')
+
+shutdown_event = threading.Event()  # Create a shutdown event
+
+def signal_handler(sig, frame):
+    logger.info("Received SIGTERM, shutting down...")
+    shutdown_event.set()  # Set the shutdown event
+
+thread_buffers = threading.local()  # Per-thread read buffers, reused across reads
+
+def get_buffers(block_size):
+    """Return this thread's QUEUE_DEPTH page-aligned block views for block_size.
+
+    Anonymous mmaps are page-aligned, which O_DIRECT requires, and are allocated
+    once per thread and block size instead of once per read.
+    """
+    buffers = getattr(thread_buffers, 'by_size', None)
+    if buffers is None:
+        buffers = thread_buffers.by_size = {}
+    if block_size not in buffers:
+        if block_size % mmap.PAGESIZE:
+            raise ValueError(f"Block size {block_size} is not a multiple of the page size ({mmap.PAGESIZE}).")
+        view = memoryview(mmap.mmap(-1, block_size * QUEUE_DEPTH))
+        buffers[block_size] = [view[i * block_size:(i + 1) * block_size] for i in range(QUEUE_DEPTH)]
+    return buffers[block_size]
+
+class FileIndex:
+    """Compact, periodically refreshed index of the test files in DATA_DIR.
+
+    Names are stored back to back in one string with their start offsets in an
+    array, sorted so that positions (and therefore seeded access sequences) are
+    stable across pods and runs. A refresh builds a new index and swaps it in
+    with a single assignment, so readers never wait for a directory scan.
+    """
+
+    def __init__(self, directory, prefix="test_file_", suffix=".txt"):
+        self.directory = directory
+        self.prefix = prefix
+        self.suffix = suffix
+        self._index = ("", array('L', [0]))
+
+    def refresh(self):
+        """Rescan the directory and swap in the new index."""
+        with os.scandir(self.directory) as entries:
+            names = sorted(e.name for e in entries if e.name.startswith(self.prefix) and e.name.endswith(self.suffix))
+        offsets = array('L', [0])
+        for name in names:
+            offsets.append(offsets[-1] + len(name))
+        self._index = ("".join(names), offsets)
+        index_files.set(len(names))
+
+    def run_refresher(self, interval):
+        """Refresh the index every interval seconds until shutdown."""
+        while not shutdown_event.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error in {pod_name} refreshing file index: {e}")
+
+    def __len__(self):
+        return len(self._index[1]) - 1
+
+    def path(self, position):
+        """Return the full path of the file at a position in the index."""
+        names, offsets = self._index
+        return os.path.join(self.directory, names[offsets[position]:offsets[position + 1]])
+
+file_index = FileIndex(DATA_DIR)
+
+@functools.lru_cache(maxsize=4)
+def zipf_cdf(n):
+    """Cumulative zipf weights for n files; rank 0 (the first file in the index) is the hottest."""
+    cdf, total = array('d'), 0.0
+    for rank in range(1, n + 1):
+        total += rank ** -ZIPF_EXPONENT
+        cdf.append(total)
+    return cdf
+
+def get_chooser(worker_index):
+    """Return this thread's function picking the next index position for ACCESS_PATTERN.
+
+    Each worker draws from its own Random seeded with SEED and its index, so a
+    seeded run replays the same file sequence per worker.
+    """
+    chooser = getattr(thread_buffers, 'chooser', None)
+    if chooser is not None:
+        return chooser
+    rng = random.Random(None if SEED is None else f"{SEED}:{worker_index}")
+
+    if ACCESS_PATTERN == 'uniform':
+        def chooser(n):
+            return rng.randrange(n)
+    elif ACCESS_PATTERN == 'zipf':
+        def chooser(n):
+            cdf = zipf_cdf(n)
+            return min(bisect.bisect_left(cdf, rng.random() * cdf[-1]), n - 1)
+    elif ACCESS_PATTERN == 'sequential':
+        cursor = [None]
+        def chooser(n):
+            # Workers start spread over the index and each scans forward, wrapping around
+            if cursor[0] is None:
+                cursor[0] = worker_index * n // TOTAL_WORKERS
+            position, cursor[0] = cursor[0] % n, cursor[0] + 1
+            return position
+    elif ACCESS_PATTERN == 'hotcold':
+        def chooser(n):
+            hot = max(1, min(n, round(n * HOT_FRACTION)))
+            if hot == n or rng.random() < HOT_PROBABILITY:
+                return rng.randrange(hot)
+            return rng.randrange(hot, n)
+    else:
+        raise ValueError(f"Invalid ACCESS_PATTERN: {ACCESS_PATTERN}. Use 'uniform', 'zipf', 'sequential' or 'hotcold'.")
+    thread_buffers.chooser = chooser
+    return chooser
+
+def read_file(worker_index, block_size=BLOCK_SIZE):
+    """Read the next test file of ACCESS_PATTERN into the reusable buffers and record its latency.
+
+    Returns:
+        tuple: (bytes read, blocks read), or (0, 0) if the read failed.
+    """
+    try:
+        n = len(file_index)
+        if n == 0:
+            raise FileNotFoundError(f"No test files indexed in {DATA_DIR}")
+        FILE_PATH = file_index.path(get_chooser(worker_index)(n))
+        filename = os.path.basename(FILE_PATH)
+        blocks = get_buffers(block_size)
+        request_size = block_size * len(blocks)
+
+        start_time = time.perf_counter()  # Start time for latency measurement
+
+        # Open the file (with O_DIRECT unless disabled) and read straight into the aligned buffers
+        fd = os.open(FILE_PATH, os.O_RDONLY | (os.O_DIRECT if DIRECT_IO else 0))
+        try:
+            bytes_read, blocks_read = 0, 0
+            while True:
+                n = os.readv(fd, blocks)
+                bytes_read += n
+                blocks_read += -(-n // block_size)
+                if n < request_size:  # Short read: end of file
+                    break
+        finally:
+            os.close(fd)
+        latency = time.perf_counter() - start_time  # Calculate latency
+        op_stats.record(worker_index, 'read', latency, bytes_read)
+        op_stats.complete(worker_index)
+        log_sampled(logging.INFO, f"{filename} read successfully: {bytes_read} bytes, Latency: {latency:.6f} seconds")
+        return bytes_read, blocks_read
+    except Exception as e:
+        op_stats.error(worker_index, 'read')
+        log_sampled(logging.ERROR, f"Error in {pod_name} reading file: {e}")
+        return 0, 0
+
+def get_write_buffer(block_size):
+    """Return this thread's aligned write block, filled with random data once."""
+    buffers = getattr(thread_buffers, 'write_by_size', None)
+    if buffers is None:
+        buffers = thread_buffers.write_by_size = {}
+    if block_size not in buffers:
+        if block_size % mmap.PAGESIZE:
+            raise ValueError(f"Block size {block_size} is not a multiple of the page size ({mmap.PAGESIZE}).")
+        block = mmap.mmap(-1, block_size)
+        block.write(os.urandom(block_size))
+        buffers[block_size] = memoryview(block)
+    return buffers[block_size]
+
+pod_slot = 0  # Slot of this pod in the n1 stride, claimed in main()
+
+def claim_pod_slot():
+    """Claim this pod's slot in the n1 stride and return its number.
+
+    Deployment pods have no ordinal, so each pod takes the lowest free slot
+    below N1_PODS by creating a claim file with O_EXCL on the shared mount. A
+    restarted container finds the slot it claimed before by its pod name.
+    """
+    slots_dir = os.path.join(WRITE_DIR, f"n1_{N1_RUN_ID}.slots")
+    os.makedirs(slots_dir, exist_ok=True)
+    for slot in range(N1_PODS):
+        path = os.path.join(slots_dir, str(slot))
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            with open(path) as f:
+                if f.read() == pod_name:
+                    return slot
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(pod_name)
+        return slot
+    raise RuntimeError(f"All {N1_PODS} n1 slots in {slots_dir} are taken; set N1_PODS to the replica count "
+                       f"and a new N1_RUN_ID for each run.")
+
+def write_file(worker_index, block_size=BLOCK_SIZE):
+    """Write WRITE_SIZE bytes in block_size blocks and record per-operation latencies.
+
+    With WRITE_PATTERN "nn" every worker rewrites its own file. With "n1" all
+    workers of all N1_PODS pods share one file: worker i of the pod in slot p
+    (see claim_pod_slot) is writer p * TOTAL_WORKERS + i and writes every
+    N1_PODS * TOTAL_WORKERS-th block starting at its writer number, the strided
+    layout of a shared checkpoint. SYNC_POLICY adds O_DIRECT/O_SYNC to the open
+    flags and/or an fsync before close.
+
+    Returns:
+        tuple: (bytes written, blocks written), or (0, 0) if the write failed.
+    """
+    op = 'file'
+    try:
+        block = get_write_buffer(block_size)
+        blocks = max(1, WRITE_SIZE // block_size)
+        if WRITE_PATTERN == 'nn':
+            FILE_PATH = os.path.join(WRITE_DIR, f"{pod_name}_{worker_index}.dat")
+            offsets = [i * block_size for i in range(blocks)]
+        elif WRITE_PATTERN == 'n1':
+            FILE_PATH = os.path.join(WRITE_DIR, f"n1_{N1_RUN_ID}.dat")
+            writers, writer = N1_PODS * TOTAL_WORKERS, pod_slot * TOTAL_WORKERS + worker_index
+            offsets = [(i * writers + writer) * block_size for i in range(blocks)]
+        else:
+            raise ValueError(f"Invalid WRITE_PATTERN: {WRITE_PATTERN}. Use 'nn' or 'n1'.")
+        flags = os.O_WRONLY | os.O_CREAT
+        if 'o_direct' in SYNC_POLICY:
+            flags |= os.O_DIRECT
+        if 'o_sync' in SYNC_POLICY:
+            flags |= os.O_SYNC
+
+        start_time = time.perf_counter()
+        fd = os.open(FILE_PATH, flags, 0o644)
+        try:
+            op = 'write'
+            for offset in offsets:
+                block_start = time.perf_counter()
+                os.pwrite(fd, block, offset)
+                op_stats.record(worker_index, 'write', time.perf_counter() - block_start, block_size)
+            if 'fsync' in SYNC_POLICY:
+                op = 'fsync'
+                fsync_start = time.perf_counter()
+                os.fsync(fd)
+                op_stats.record(worker_index, 'fsync', time.perf_counter() - fsync_start)
+        finally:
+            os.close(fd)
+        latency = time.perf_counter() - start_time
+        op_stats.record(worker_index, 'file', latency)
+        op_stats.complete(worker_index)
+        log_sampled(logging.INFO, f"{FILE_PATH} written successfully: {blocks * block_size} bytes, Latency: {latency:.6f} seconds")
+        return blocks * block_size, blocks
+    except Exception as e:
+        op_stats.error(worker_index, op)
+        log_sampled(logging.ERROR, f"Error in {pod_name} writing file: {e}")
+        return 0, 0
+
+def metadata_leaf_dirs(root):
+    """Return the leaf directories of a tree METADATA_DEPTH levels deep with METADATA_FANOUT children each."""
+    dirs = [root]
+    for level in range(METADATA_DEPTH):
+        dirs = [os.path.join(parent, f"d{level}.{i}") for parent in dirs for i in range(METADATA_FANOUT)]
+    return dirs
+
+def timed(worker_index, op, func, *args):
+    """Run one metadata call and record its latency under the given operation label."""
+    start = time.perf_counter()
+    func(*args)
+    op_stats.record(worker_index, op, time.perf_counter() - start)
+
+def remove_metadata_files(files):
+    """Unlink whatever an interrupted iteration left of its files, so O_EXCL creates succeed again."""
+    for path in files:
+        for leftover in (path, path + '.r'):
+            try:
+                os.unlink(leftover)
+            except FileNotFoundError:
+                pass
+
+# Workers whose files from a previous run of the container have been cleaned up
+metadata_cleaned_workers = set()
+
+def metadata_iteration(worker_index):
+    """Run one mdtest-style iteration: create, stat, open/close, rename and unlink every file of the tree.
+
+    Each phase completes for all files before the next starts, and every call is
+    timed individually. With METADATA_TREE "shared" all workers of all pods work
+    in the same directories, which contends on directory entries; with "unique"
+    each worker has a private tree.
+
+    Returns:
+        tuple: (0, number of metadata calls), or (0, 0) if the iteration failed.
+    """
+    op = 'create'
+    files = []
+    try:
+        owner = f"{pod_name}_{worker_index}"
+        root = os.path.join(METADATA_DIR, 'shared' if METADATA_TREE == 'shared' else owner)
+        leaves = metadata_leaf_dirs(root)
+        for leaf in leaves:
+            os.makedirs(leaf, exist_ok=True)
+        files = [os.path.join(leaf, f"{owner}.{i}") for leaf in leaves for i in range(METADATA_FILES_PER_DIR)]
+        if worker_index not in metadata_cleaned_workers:
+            remove_metadata_files(files)
+            metadata_cleaned_workers.add(worker_index)
+
+        start_time = time.perf_counter()
+        phase_rates = {}
+        for op in METADATA_OPS:
+            phase_start = time.perf_counter()
+            for path in files:
+                if op == 'create':
+                    timed(worker_index, op, lambda p: os.close(os.open(p, os.O_CREAT | os.O_WRONLY | os.O_EXCL, 0o644)), path)
+                elif op == 'stat':
+                    timed(worker_index, op, os.stat, path)
+                elif op == 'open_close':
+                    timed(worker_index, op, lambda p: os.close(os.open(p, os.O_RDONLY)), path)
+                elif op == 'rename':
+                    timed(worker_index, op, os.rename, path, path + '.r')
+                else:
+                    timed(worker_index, op, os.unlink, path + '.r')
+            phase_rates[op] = len(files) / max(time.perf_counter() - phase_start, 1e-9)
+        latency = time.perf_counter() - start_time
+        op_stats.complete(worker_index)
+        rates = ", ".join(f"{op}={rate:.0f}/s" for op, rate in phase_rates.items())
+        log_sampled(logging.INFO, f"Metadata iteration on {len(files)} files finished in {latency:.6f} seconds: {rates}")
+        return 0, len(files) * len(METADATA_OPS)
+    except Exception as e:
+        op_stats.error(worker_index, op)
+        log_sampled(logging.ERROR, f"Error in {pod_name} running {op} operations: {e}")
+        try:
+            remove_metadata_files(files)
+        except OSError as cleanup_error:
+            log_sampled(logging.ERROR, f"Error in {pod_name} cleaning up after {op}: {cleanup_error}")
+        return 0, 0
+
+def run_operation(worker_index, block_size=BLOCK_SIZE):
+    """Perform one operation of the configured WORKLOAD."""
+    if WORKLOAD == 'write':
+        return write_file(worker_index, block_size)
+    if WORKLOAD == 'metadata':
+        return metadata_iteration(worker_index)
+    return read_file(worker_index, block_size)
+
+def closed_loop_worker(worker_index):
+    """Issue operations back to back; throughput is set by the number of workers."""
+    while not shutdown_event.is_set():
+        op_stats.offer(worker_index)
+        run_operation(worker_index)
+
+def open_loop_worker(work_queue, worker_index):
+    """Serve operations offered by the dispatcher until shutdown."""
+    while not shutdown_event.is_set():
+        try:
+            work_queue.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        run_operation(worker_index)
+
+def open_loop_dispatcher(work_queue, target_ops, worker_index):
+    """Offer reads at target_ops per second using a token bucket.
+
+    Reads that find the bounded queue full are dropped and counted, so an
+    overloaded pod shows up as offered > achieved instead of growing memory.
+    """
+    burst = max(1.0, target_ops / 10)  # Allow at most 100ms worth of catch-up
+    tokens = 0.0
+    last = time.monotonic()
+    while not shutdown_event.is_set():
+        now = time.monotonic()
+        tokens = min(burst, tokens + (now - last) * target_ops)
+        last = now
+        while tokens >= 1:
+            tokens -= 1
+            op_stats.offer(worker_index)
+            try:
+                work_queue.put_nowait(now)
+            except queue.Full:
+                op_stats.drop(worker_index)
+        queue_depth.set(work_queue.qsize())
+        time.sleep(min(0.01, 1 / target_ops))
+
+def report_rates(registry=REGISTRY):
+    """Periodically log offered and achieved operation rates, as seen by the given registry."""
+    last_offered, last_completed, last_time = 0.0, 0.0, time.monotonic()
+    while not shutdown_event.wait(REPORT_INTERVAL):
+        offered = registry.get_sample_value('parallelstore_offered_ops_total')
+        completed = registry.get_sample_value('parallelstore_completed_ops_total')
+        dropped = registry.get_sample_value('parallelstore_dropped_ops_total')
+        errors = sum(op_stats.errors)
+        now = time.monotonic()
+        elapsed = now - last_time
+        logger.info(f"Offered: {(offered - last_offered) / elapsed:.1f} ops/s, Achieved: {(completed - last_completed) / elapsed:.1f} ops/s, Dropped total: {dropped:.0f}, Errors total: {errors}")
+        last_offered, last_completed, last_time = offered, completed, now
+
+def sweep_worker(block_size, deadline, totals, slot, worker_index):
+    """Run operations back to back with one block size until the deadline, summing bytes and blocks."""
+    while not shutdown_event.is_set() and time.monotonic() < deadline:
+        op_stats.offer(worker_index)
+        transferred, blocks = run_operation(worker_index, block_size)
+        totals[slot][0] += transferred
+        totals[slot][1] += blocks
+
+def run_sweep(first_index):
+    """Run the closed loop for SWEEP_DURATION at each block size and report IOPS and MB/s."""
+    for block_size in SWEEP_BLOCK_SIZES:
+        if shutdown_event.is_set():
+            break
+        totals = [[0, 0] for _ in range(WORKERS)]
+        start = time.monotonic()
+        threads = [threading.Thread(target=sweep_worker, args=(block_size, start + SWEEP_DURATION, totals, i, first_index + i),
+                                    name=f"sweep-{first_index + i}") for i in range(WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+        total_bytes = sum(t[0] for t in totals)
+        total_blocks = sum(t[1] for t in totals)
+        iops, mb_per_s = total_blocks / elapsed, total_bytes / (1024 * 1024) / elapsed
+        sweep_iops.labels(block_size=str(block_size)).set(iops)
+        sweep_throughput.labels(block_size=str(block_size)).set(mb_per_s)
+        logger.info(f"Sweep block size {block_size}: {iops:.1f} IOPS, {mb_per_s:.1f} MB/s over {elapsed:.1f}s")
+    logger.info("Block-size sweep finished.")
+
+def run_closed_loop(first_index):
+    return [threading.Thread(target=closed_loop_worker, args=(i,), name=f"worker-{i}")
+            for i in range(first_index, first_index + WORKERS)]
+
+def run_open_loop(first_index):
+    work_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    threads = [threading.Thread(target=open_loop_worker, args=(work_queue, i), name=f"worker-{i}")
+               for i in range(first_index, first_index + WORKERS)]
+    threads.append(threading.Thread(target=open_loop_dispatcher, args=(work_queue, TARGET_OPS / PROCESSES, first_index),
+                                    name="dispatcher"))
+    return threads
+
+def validate_settings():
+    """Reject invalid settings before any worker starts."""
+    if LOAD_MODE not in ('closed', 'open', 'sweep'):
+        raise ValueError(f"Invalid LOAD_MODE: {LOAD_MODE}. Use 'closed', 'open' or 'sweep'.")
+    if LOAD_MODE == 'open' and not TARGET_OPS > 0:
+        raise ValueError(f"Invalid TARGET_OPS: {TARGET_OPS}. Open-loop mode needs a positive rate in ops/s.")
+    if WORKLOAD not in ('read', 'write', 'metadata'):
+        raise ValueError(f"Invalid WORKLOAD: {WORKLOAD}. Use 'read', 'write' or 'metadata'.")
+    if METADATA_TREE not in ('unique', 'shared'):
+        raise ValueError(f"Invalid METADATA_TREE: {METADATA_TREE}. Use 'unique' or 'shared'.")
+
+def run_workers(first_index):
+    """Run this process's WORKERS threads, numbered from first_index, until shutdown."""
+    if LOAD_MODE == 'closed':
+        threads = run_closed_loop(first_index)
+    elif LOAD_MODE == 'open':
+        threads = run_open_loop(first_index)
+    else:
+        threads = [threading.Thread(target=run_sweep, args=(first_index,), name="sweep")]
+    if WORKLOAD == 'read':
+        file_index.refresh()
+        logger.info(f"Indexed {len(file_index)} test files in {DATA_DIR}, access pattern '{ACCESS_PATTERN}', seed {SEED}.")
+        if INDEX_REFRESH_INTERVAL > 0:
+            threads.append(threading.Thread(target=file_index.run_refresher, args=(INDEX_REFRESH_INTERVAL,),
+                                            name="index-refresher", daemon=True))
+
+    for thread in threads:
+        thread.start()
+    while not shutdown_event.is_set():  # Check if shutdown is initiated
+        shutdown_event.wait(1)
+    for thread in threads:
+        thread.join(timeout=5)
+
+def run_processes():
+    """Run PROCESSES forked worker processes and export their combined metrics.
+
+    Every process records its counters and gauges in memory-mapped files under
+    PROMETHEUS_MULTIPROC_DIR and its latencies in the shared OpStats shards; the
+    parent only serves METRICS_PORT, merging both on each scrape, and forwards
+    SIGTERM to the workers.
+    """
+    context = multiprocessing.get_context('fork')
+
+    def start_process(first_index):
+        process = context.Process(target=run_workers, args=(first_index,), name=f"loadgen-{first_index // WORKERS}")
+        process.start()
+        return process
+
+    processes = {first_index: start_process(first_index) for first_index in range(0, TOTAL_WORKERS, WORKERS)}
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(op_stats)
+    start_http_server(METRICS_PORT, registry=registry)
+    logger.info(f"Prometheus metrics server started on port {METRICS_PORT} for {PROCESSES} worker processes.")
+    threading.Thread(target=report_rates, args=(registry,), name="reporter", daemon=True).start()
+
+    while not shutdown_event.wait(1):
+        for first_index, process in processes.items():
+            if not process.is_alive():
+                logger.error(f"Worker process {process.name} exited with code {process.exitcode}, restarting it.")
+                multiprocess.mark_process_dead(process.pid)
+                processes[first_index] = start_process(first_index)
+    for process in processes.values():
+        process.terminate()  # Sends SIGTERM, handled like in a single-process pod
+    for process in processes.values():
+        process.join(timeout=10)
+        multiprocess.mark_process_dead(process.pid)
+
+def main():
+    """Run the configured load until SIGTERM."""
+    setup_logging()
+    signal.signal(signal.SIGTERM, signal_handler)  # Register the signal handler
+    validate_settings()
+    setup()
+    if WORKLOAD == 'write':
+        os.makedirs(WRITE_DIR, exist_ok=True)
+        if WRITE_PATTERN == 'n1':
+            # Claimed before forking, so every worker process inherits the slot
+            global pod_slot
+            pod_slot = claim_pod_slot()
+            logger.info(f"Writing n1 file {N1_RUN_ID} as slot {pod_slot} of {N1_PODS} pods.")
+    logger.info(f"Starting {LOAD_MODE} {WORKLOAD} load with {PROCESSES} process(es) of {WORKERS} workers, queue depth {QUEUE_DEPTH}" + (f" at {TARGET_OPS} ops/s" if LOAD_MODE == 'open' else ""))
+
+    if PROCESSES > 1:
+        run_processes()
+    else:
+        # Start the Prometheus metrics server
+        start_http_server(METRICS_PORT)
+        logger.info(f"Prometheus metrics server started on port {METRICS_PORT}.")
+        threading.Thread(target=report_rates, name="reporter", daemon=True).start()
+        run_workers(0)
+
+if __name__ == '__main__':
+    main()
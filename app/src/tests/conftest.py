@@ -22,14 +22,25 @@ def pytest_runtest_protocol(item):
     logger.info(f"Finished test: {item.name} in {duration:.3f} seconds.")
 
 
-@pytest.fixture(scope="module")
-def k8s_client():
+@pytest.fixture(scope="session")
+def kubernetes_client():
     """
-    Fixture to provide Kubernetes API clients dynamically.
+    Fixture to provide the shared KubernetesClient instance.
     """
     config_file = "config/settings.toml"
     logger.info(f"Initializing Kubernetes client with config file: {config_file}")
     k8s = KubernetesClient(config_file=config_file)
+    yield k8s
+    logger.info(f"Kubernetes API connection pool stats: {k8s.pool_stats()}")
+    k8s.close()
+
+
+@pytest.fixture(scope="session")
+def k8s_client(kubernetes_client):
+    """
+    Fixture to provide Kubernetes API clients dynamically.
+    """
+    k8s = kubernetes_client
 
     def get_client(api_type):
         """
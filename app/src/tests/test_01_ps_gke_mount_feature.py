@@ -23,8 +23,8 @@ def verify_cluster_running(k8s_client):
 @given('a deployment named "ps-test" exists in the "ps" namespace')
 def verify_deployment_exists(k8s_client):
     """Ensure the deployment exists in the specified namespace."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
 
     # Retrieve AppsV1Api client
     apps_api = k8s_client("AppsV1Api")
@@ -34,20 +34,17 @@ def verify_deployment_exists(k8s_client):
     logger.info(f"Deployment '{deployment_name}' exists.")
 
 @when('the deployment starts')
-def verify_pod_running(k8s_client):
+def verify_pod_running(kubernetes_client):
     """Ensure the pod for the deployment is running."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    app_name = CONFIG["k8s"]["app_name"]
-
-    # Retrieve CoreV1Api client for Pod checks
-    core_api = k8s_client("CoreV1Api")
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
+    app_name = CONFIG.k8s.app_name
 
     retries = 5  # Retry up to 10 times (adjust as needed)
     for _ in range(retries):
         logger.info(f"Checking if pod for deployment '{deployment_name}' is running...")
-        pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={app_name}")
-        for pod in pods.items:
+        pods = kubernetes_client.list_pods(namespace, label_selector=f"app={app_name}")
+        for pod in pods:
             if pod.status.phase == "Running":
                 logger.info(f"Pod '{pod.metadata.name}' is running.")
                 return pod.metadata.name
@@ -56,17 +53,17 @@ def verify_pod_running(k8s_client):
     pytest.fail(f"Pod for deployment '{deployment_name}' did not start running.")
 
 @then("the Parallelstore mount should be accessible")
-def verify_parallelstore_mount(k8s_client):
+def verify_parallelstore_mount(k8s_client, kubernetes_client):
     """Ensure the Parallelstore mount is accessible inside the pod."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-    app_name = CONFIG["k8s"]["app_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
+    mount_path = CONFIG.parallelstore.mount_path
+    app_name = CONFIG.k8s.app_name
 
     core_api = k8s_client("CoreV1Api")
-    pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={app_name}")
-    assert pods.items, f"No pod found for deployment '{deployment_name}'."
-    pod_name = pods.items[0].metadata.name
+    pods = kubernetes_client.list_pods(namespace, label_selector=f"app={app_name}")
+    assert pods, f"No pod found for deployment '{deployment_name}'."
+    pod_name = pods[0].metadata.name
 
     logger.info(f"Checking if Parallelstore mount is accessible on pod '{pod_name}' at path '{mount_path}'...")
 
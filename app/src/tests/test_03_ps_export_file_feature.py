@@ -1,5 +1,4 @@
 import os
-import subprocess
 import hashlib
 from google.cloud import storage
 import pytest
@@ -7,6 +6,9 @@ from pytest_bdd import given, when, then, scenarios
 from src.utils.logging_util import get_logger
 import time
 from src.utils.config_util import load_config
+from src.utils.dataset_util import list_files, checksum_files
+from src.utils.transfer_util import ParallelstoreOperationsApi, run_transfer
+from src.utils.gcs_util import compare_with_bucket, compare_checksums
 from kubernetes.stream import stream
 
 logger = get_logger(__name__)
@@ -26,8 +28,8 @@ def verify_cluster_running(k8s_client):
 @given('a deployment named "ps-test" exists in the "ps" namespace')
 def verify_deployment_exists(k8s_client):
     """Ensure the deployment exists in the specified namespace."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
 
     # Retrieve AppsV1Api client
     apps_api = k8s_client("AppsV1Api")
@@ -37,17 +39,17 @@ def verify_deployment_exists(k8s_client):
     logger.info(f"Deployment '{deployment_name}' exists.")
 
 @given("a file is written to Parallelstore mount path")
-def prepare_parallelstore_file(k8s_client):
+def prepare_parallelstore_file(k8s_client, kubernetes_client):
     """Test read and write operations on the Parallelstore mount."""
-    namespace = CONFIG["k8s"]["namespace"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-    app_name = CONFIG["k8s"]["app_name"]
+    namespace = CONFIG.k8s.namespace
+    mount_path = CONFIG.parallelstore.mount_path
+    app_name = CONFIG.k8s.app_name
     core_api = k8s_client("CoreV1Api")
 
     # Get pod name
-    pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={app_name}")
-    assert pods.items, f"No pods found for app '{app_name}' in namespace '{namespace}'."
-    pod_name = pods.items[0].metadata.name
+    pods = kubernetes_client.list_pods(namespace, label_selector=f"app={app_name}")
+    assert pods, f"No pods found for app '{app_name}' in namespace '{namespace}'."
+    pod_name = pods[0].metadata.name
 
     # Generate a unique test file name
     test_filename = f"test_data_transfer.txt"
@@ -67,91 +69,64 @@ def prepare_parallelstore_file(k8s_client):
 
 @when("the file is exported from Parallelstore to the GCS bucket using gcloud")
 def export_to_gcs():
-    """Export data from Parallelstore to GCS using gcloud."""
-    bucket_name = CONFIG["GCS"]["bucket_name"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
+    """Export data from Parallelstore to GCS and measure the transfer."""
+    bucket_name = CONFIG.gcs.bucket_name
+    mount_path = CONFIG.parallelstore.mount_path
     destination_path = f"gs://{bucket_name}/"
-    instance_name = CONFIG["parallelstore"]["instance_name"]
-    region = CONFIG["parallelstore"]["region"]
-
-    command = [
-        "gcloud", "beta", "parallelstore", "instances", "export-data",
-        f"{instance_name}",
-        f"--location={region}",
-        f"--source-parallelstore-path=/",
-        f"--destination-gcs-bucket-uri={destination_path}"
-    ]
-
-    logger.info("Starting export using gcloud...")
-    logger.info(f"Running command: {' '.join(command)}")
-
-    result = subprocess.run(command, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        logger.error("Export failed!")
-        logger.error(f"stdout:\n{result.stdout}")
-        logger.error(f"stderr:\n{result.stderr}")
-    else:
-        logger.info("Export completed successfully.")
-        logger.info(f"stdout:\n{result.stdout}")
+    instance_name = CONFIG.parallelstore.instance_name
+    region = CONFIG.parallelstore.region
+
+    operations_api = ParallelstoreOperationsApi(CONFIG.parallelstore.project_id, region)
+    stats = run_transfer(
+        operations_api, instance_name, "export", "/", destination_path,
+        timeout=CONFIG.transfer.timeout,
+        initial_interval=CONFIG.transfer.poll_initial_interval,
+        max_interval=CONFIG.transfer.poll_max_interval,
+    )
+    logger.info(f"Export statistics: {stats}")
 
-    assert result.returncode == 0
+    min_mb_per_s = CONFIG.transfer.min_mb_per_s
+    assert stats["mb_per_s"] >= min_mb_per_s, \
+        f"Export throughput too low: {stats['mb_per_s']} MB/s (expected >= {min_mb_per_s} MB/s)"
 
 @then("the files in Parallelstore should all be in GCS bucket")
-def verify_file_in_gcs(k8s_client):
+def verify_file_in_gcs(kubernetes_client):
     """List files in the pod's Parallelstore mount path and verify they exist in the GCS bucket."""
-    namespace = CONFIG["k8s"]["namespace"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-    app_name = CONFIG["k8s"]["app_name"]
-    bucket_name = CONFIG["GCS"]["bucket_name"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    core_api = k8s_client("CoreV1Api")
-    
+    namespace = CONFIG.k8s.namespace
+    mount_path = CONFIG.parallelstore.mount_path
+    app_name = CONFIG.k8s.app_name
+    bucket_name = CONFIG.gcs.bucket_name
+    deployment_name = CONFIG.k8s.deployment_name
+
     # Log the beginning of the file listing process in the pod
     logger.info(f"Starting to list files inside pod at mount path '{mount_path}'...")
 
-    core_api = k8s_client("CoreV1Api")
-    pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={app_name}")
-    assert pods.items, f"No pod found for deployment '{deployment_name}'."
-    pod_name = pods.items[0].metadata.name
-
-    logger.info(f"Checking if Parallelstore mount is accessible on pod '{pod_name}' at path '{mount_path}'...")
-
-    exec_command = ["/bin/sh", "-c", f"find {mount_path} -type f | sed 's|^{mount_path}/||' | sed 's|^/||'"]
-
-    try:
-        output = stream(
-            core_api.connect_get_namespaced_pod_exec,
-            pod_name,
-            namespace,
-            command=exec_command,
-            stderr=True, stdin=False,
-            stdout=True, tty=False
-        )
-        files = output.strip().splitlines()
-        logger.info(f"Files found in pod '{pod_name}': {files}")
-    except Exception as e:
-        logger.error(f"Error occurred while listing files in pod '{pod_name}': {str(e)}")
-        raise
+    pods = kubernetes_client.list_pods(namespace, label_selector=f"app={app_name}")
+    assert pods, f"No pod found for deployment '{deployment_name}'."
+    pod_name = pods[0].metadata.name
 
-    # Now check that these files exist in the GCS bucket
+    files = list_files(kubernetes_client, pod_name, namespace, mount_path)
+
+    # Now check that these files exist in the GCS bucket with the same sizes
     logger.info(f"Starting verification of files in the GCS bucket '{bucket_name}'...")
+    result = compare_with_bucket(bucket_name, files)
+
+    if result["missing"] or result["size_mismatch"]:
+        logger.error(f"Files missing in GCS: {result['missing']}")
+        logger.error(f"Files with size mismatches (name, Parallelstore size, GCS size): {result['size_mismatch']}")
+        raise FileNotFoundError(
+            f"{len(result['missing'])} files missing and {len(result['size_mismatch'])} size mismatches in GCS."
+        )
 
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-
-    for filename in files:
-        blob = bucket.blob(filename)  # No path needed, just the file name
-        logger.info(f"Checking GCS blob: {filename}")
-        
-        try:
-            if blob.exists():
-                logger.info(f"File '{filename}' exists in GCS.")
-            else:
-                logger.warning(f"File '{filename}' not found in GCS!")
-                raise FileNotFoundError(f"GCS blob '{filename}' not found.")
-        except Exception as e:
-            logger.error(f"Error occurred while checking '{filename}' in GCS: {str(e)}")
-            raise
-
-    logger.info("All files in Parallelstore are found in GCS.")
\ No newline at end of file
+    if CONFIG.gcs.verify_checksums:
+        checksums = checksum_files(kubernetes_client, pod_name, namespace, mount_path, crc32c=CONFIG.gcs.pod_crc32c)
+        integrity = compare_checksums(bucket_name, checksums)
+        if integrity["mismatch"]:
+            logger.error(f"Checksum mismatches (name, Parallelstore checksum, GCS checksum): {integrity['mismatch']}")
+            raise AssertionError(f"{len(integrity['mismatch'])} files differ between Parallelstore and GCS.")
+        if integrity["unverified"]:
+            logger.error(f"Objects that could not be verified: {integrity['unverified']}")
+            raise AssertionError(f"{len(integrity['unverified'])} composite objects could not be verified; "
+                                 f"set [GCS] pod_crc32c to verify them by CRC32C.")
+
+    logger.info(f"All {len(files)} files in Parallelstore are found in GCS ({len(result['extra'])} extra objects in bucket).")
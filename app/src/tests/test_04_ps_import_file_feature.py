@@ -1,5 +1,4 @@
 import os
-import subprocess
 import hashlib
 from google.cloud import storage
 import pytest
@@ -7,7 +6,9 @@ from pytest_bdd import given, when, then, scenarios
 from src.utils.logging_util import get_logger
 import time
 from src.utils.config_util import load_config
-from kubernetes.stream import stream
+from src.utils.dataset_util import list_files, checksum_files
+from src.utils.transfer_util import ParallelstoreOperationsApi, run_transfer
+from src.utils.gcs_util import compare_with_bucket, compare_checksums
 
 logger = get_logger(__name__)
 
@@ -28,8 +29,8 @@ def verify_cluster_running(k8s_client):
 @given('a deployment named "ps-test" exists in the "ps" namespace')
 def verify_deployment_exists(k8s_client):
     """Ensure the deployment exists in the specified namespace."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
 
     # Retrieve AppsV1Api client
     apps_api = k8s_client("AppsV1Api")
@@ -42,10 +43,12 @@ def verify_deployment_exists(k8s_client):
 @given("a file is written to GCS bucket")
 def upload_file_to_gcs():
     """Upload a file to the GCS bucket."""
-    bucket_name = CONFIG["GCS"]["bucket_name"]
+    bucket_name = CONFIG.gcs.bucket_name
     test_filename = "test_data_transfer.txt"
-    test_content = "Test data transfer between GCS and Parallelstore!"
-    
+    # Same bytes as the export scenario writes with echo (including its trailing newline),
+    # since both scenarios share the object and the file in Parallelstore
+    test_content = "Test data transfer between GCS and Parallelstore!\n"
+
     storage_client = storage.Client()
     bucket = storage_client.bucket(bucket_name)
     blob = bucket.blob(test_filename)
@@ -57,90 +60,65 @@ def upload_file_to_gcs():
 
 @when("the file is imported from GCS bucket to Parallelstore instance using gcloud")
 def import_from_gcs():
-    """Import data from GCS to Parallelstore using gcloud."""
-    bucket_name = CONFIG["GCS"]["bucket_name"]
-    instance_name = CONFIG["parallelstore"]["instance_name"]
-    region = CONFIG["parallelstore"]["region"]
+    """Import data from GCS to Parallelstore and measure the transfer."""
+    bucket_name = CONFIG.gcs.bucket_name
+    instance_name = CONFIG.parallelstore.instance_name
+    region = CONFIG.parallelstore.region
     source_path = f"gs://{bucket_name}/"
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-
-    command = [
-        "gcloud", "beta", "parallelstore", "instances", "import-data",
-        f"{instance_name}",
-        f"--location={region}",
-        f"--source-gcs-bucket-uri={source_path}",
-        f"--destination-parallelstore-path=/"
-    ]
-
-    logger.info("Starting import using gcloud...")
-    logger.info(f"Running command: {' '.join(command)}")
+    mount_path = CONFIG.parallelstore.mount_path
 
-    result = subprocess.run(command, capture_output=True, text=True)
+    operations_api = ParallelstoreOperationsApi(CONFIG.parallelstore.project_id, region)
+    stats = run_transfer(
+        operations_api, instance_name, "import", source_path, "/",
+        timeout=CONFIG.transfer.timeout,
+        initial_interval=CONFIG.transfer.poll_initial_interval,
+        max_interval=CONFIG.transfer.poll_max_interval,
+    )
+    logger.info(f"Import statistics: {stats}")
 
-    if result.returncode != 0:
-        logger.error("Import failed!")
-        logger.error(f"stdout:\n{result.stdout}")
-        logger.error(f"stderr:\n{result.stderr}")
-    else:
-        logger.info("Import completed successfully.")
-        logger.info(f"stdout:\n{result.stdout}")
-
-    assert result.returncode == 0
+    min_mb_per_s = CONFIG.transfer.min_mb_per_s
+    assert stats["mb_per_s"] >= min_mb_per_s, \
+        f"Import throughput too low: {stats['mb_per_s']} MB/s (expected >= {min_mb_per_s} MB/s)"
 
 
 @then("the files in GCS bucket should all be in Parallelstore")
-def verify_files_in_parallelstore(k8s_client):
+def verify_files_in_parallelstore(kubernetes_client):
     """Verify that all files in the GCS bucket are also present in the Parallelstore mount path."""
-    namespace = CONFIG["k8s"]["namespace"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-    app_name = CONFIG["k8s"]["app_name"]
-    bucket_name = CONFIG["GCS"]["bucket_name"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    core_api = k8s_client("CoreV1Api")
+    namespace = CONFIG.k8s.namespace
+    mount_path = CONFIG.parallelstore.mount_path
+    app_name = CONFIG.k8s.app_name
+    bucket_name = CONFIG.gcs.bucket_name
 
     # Log the beginning of the file listing process in the pod
     logger.info(f"Starting to list all files recursively inside pod at mount path '{mount_path}'...")
 
     # Get pod name
-    pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={app_name}")
-    assert pods.items, f"No pods found for app '{app_name}' in namespace '{namespace}'."
-    pod_name = pods.items[0].metadata.name
-
-    logger.info(f"Checking if Parallelstore mount is accessible on pod '{pod_name}' at path '{mount_path}'...")
-
-    exec_command = ["/bin/sh", "-c", f"find {mount_path} -type f | sed 's|^{mount_path}/||' | sed 's|^/||'"]
-
-    try:
-        output = stream(
-            core_api.connect_get_namespaced_pod_exec,
-            pod_name,
-            namespace,
-            command=exec_command,
-            stderr=True, stdin=False,
-            stdout=True, tty=False
-        )
-        parallelstore_files = output.strip().splitlines()
-        logger.info(f"Files found in Parallelstore mount path '{mount_path}': {parallelstore_files}")
-    except Exception as e:
-        logger.error(f"Error occurred while listing files in Parallelstore mount path: {str(e)}")
-        raise
+    pods = kubernetes_client.list_pods(namespace, label_selector=f"app={app_name}")
+    assert pods, f"No pods found for app '{app_name}' in namespace '{namespace}'."
+    pod_name = pods[0].metadata.name
 
-    # Now check that these files exist in the GCS bucket
-    logger.info(f"Starting verification of files in the GCS bucket '{bucket_name}'...")
+    parallelstore_files = list_files(kubernetes_client, pod_name, namespace, mount_path)
 
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-
-    # List files in the GCS bucket
-    blobs = bucket.list_blobs()
-    gcs_files = [blob.name for blob in blobs if not blob.name.endswith('/')]  # Filter out folder prefixes
-    logger.info(f"Files found in GCS bucket '{bucket_name}': {gcs_files}")
+    # List the bucket once and compare; objects not in Parallelstore come back as "extra"
+    logger.info(f"Starting verification of files in the GCS bucket '{bucket_name}'...")
+    result = compare_with_bucket(bucket_name, parallelstore_files, mode="list")
 
-    # Ensure every file in the GCS bucket is present in Parallelstore
-    missing_files = [file for file in gcs_files if file not in parallelstore_files]
+    if result["extra"] or result["size_mismatch"]:
+        logger.error(f"The following files are missing in Parallelstore: {result['extra']}")
+        logger.error(f"Files with size mismatches (name, Parallelstore size, GCS size): {result['size_mismatch']}")
+        raise FileNotFoundError(
+            f"{len(result['extra'])} files missing and {len(result['size_mismatch'])} size mismatches in Parallelstore."
+        )
 
-    if missing_files:
-        logger.error(f"The following files are missing in Parallelstore: {missing_files}")
-        raise FileNotFoundError(f"Files missing in Parallelstore: {missing_files}")
-    else:
-        logger.info("All files in the GCS bucket are present in Parallelstore.")
\ No newline at end of file
+    if CONFIG.gcs.verify_checksums:
+        checksums = checksum_files(kubernetes_client, pod_name, namespace, mount_path, crc32c=CONFIG.gcs.pod_crc32c)
+        integrity = compare_checksums(bucket_name, checksums)
+        if integrity["mismatch"]:
+            logger.error(f"Checksum mismatches (name, Parallelstore checksum, GCS checksum): {integrity['mismatch']}")
+            raise AssertionError(f"{len(integrity['mismatch'])} files differ between Parallelstore and GCS.")
+        if integrity["unverified"]:
+            logger.error(f"Objects that could not be verified: {integrity['unverified']}")
+            raise AssertionError(f"{len(integrity['unverified'])} composite objects could not be verified; "
+                                 f"set [GCS] pod_crc32c to verify them by CRC32C.")
+
+    logger.info("All files in the GCS bucket are present in Parallelstore.")
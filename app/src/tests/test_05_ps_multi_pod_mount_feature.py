@@ -1,9 +1,7 @@
 import pytest
 from pytest_bdd import given, when, then, scenarios
 from src.utils.logging_util import get_logger
-import time
 from src.utils.config_util import load_config
-from kubernetes.stream import stream
 
 logger = get_logger(__name__)
 # Load configuration once at module level
@@ -23,8 +21,8 @@ def verify_cluster_running(k8s_client):
 @given('a deployment named "ps-test" exists in the "ps" namespace')
 def verify_deployment_exists(k8s_client):
     """Ensure the deployment exists in the specified namespace."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
 
     # Retrieve AppsV1Api client
     apps_api = k8s_client("AppsV1Api")
@@ -34,13 +32,12 @@ def verify_deployment_exists(k8s_client):
     logger.info(f"Deployment '{deployment_name}' exists.")
 
 @when('I scale "ps-test" to 10 replicas')
-def scale_deployment_to_1000(k8s_client):
+def scale_deployment_to_1000(k8s_client, kubernetes_client):
     """Scale the deployment to 10 replicas and monitor the progress."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
     replicas = 10
-    timeout = CONFIG["scaling"]["timeout"]  # Timeout in seconds
-    interval = 10  # Polling interval in seconds
+    timeout = CONFIG.scaling.timeout  # Timeout in seconds
 
     # Retrieve AppsV1Api client
     apps_api = k8s_client("AppsV1Api")
@@ -48,53 +45,38 @@ def scale_deployment_to_1000(k8s_client):
     body = {"spec": {"replicas": replicas}}
     apps_api.patch_namespaced_deployment_scale(name=deployment_name, namespace=namespace, body=body)
 
-    logger.info(f"Waiting for deployment '{deployment_name}' to reach {replicas} replicas...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        response = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
-        logger.debug(f"Current replicas: {response.status.replicas}, Available replicas: {response.status.available_replicas}")
-        if (
-            response.status.replicas == replicas
-            and response.status.available_replicas == replicas
-        ):
-            logger.info(f"Deployment '{deployment_name}' successfully scaled to {replicas} replicas.")
-            return
-        time.sleep(interval)
-
-    logger.error(f"Deployment '{deployment_name}' did not scale to {replicas} replicas within {timeout} seconds.")
-    raise RuntimeError(f"Deployment '{deployment_name}' did not scale to {replicas} replicas within {timeout} seconds.")
+    durations = kubernetes_client.wait_for_deployment_rollout(deployment_name, namespace, replicas, timeout)
+    logger.info(f"Deployment '{deployment_name}' rollout step durations (s): {durations}")
 
 @then("the Parallelstore mount should be accessible by all pods in the deployment")
-def verify_parallelstore_mount(k8s_client):
+def verify_parallelstore_mount(kubernetes_client):
     """Ensure the Parallelstore mount is accessible inside all pods of the deployment."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["deployment_name"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-    app_name = CONFIG["k8s"]["app_name"]
-
-    core_api = k8s_client("CoreV1Api")
-    pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={app_name}")
-
-    assert pods.items, "No pods found for the deployment."
-
-    for pod in pods.items:
-        pod_name = pod.metadata.name
-        logger.info(f"Checking mount access in pod '{pod_name}' at path '{mount_path}'...")
-        exec_command = ["/bin/sh", "-c", f"ls {mount_path} || echo 'ls failed'"]
-
-        try:
-            exec_response = stream(
-                core_api.connect_get_namespaced_pod_exec,
-                name=pod_name,
-                namespace=namespace,
-                command=exec_command,
-                stderr=True, stdin=False, stdout=True, tty=False
-            )
-
-            if "ls failed" in exec_response:
-                pytest.fail(f"Mount path '{mount_path}' is inaccessible in pod '{pod_name}'.")
-            else:
-                logger.info(f"Mount path '{mount_path}' is accessible in pod '{pod_name}'. Contents:\n{exec_response.strip() or '(empty)'}")
-
-        except Exception as e:
-            pytest.fail(f"Failed to access mount path in pod '{pod_name}': {str(e)}")
\ No newline at end of file
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.deployment_name
+    mount_path = CONFIG.parallelstore.mount_path
+    app_name = CONFIG.k8s.app_name
+
+    # Only pod names are needed, so fetch slim metadata for running pods page by page
+    pod_names = [
+        pod["metadata"]["name"]
+        for pod in kubernetes_client.iter_pods(
+            namespace, label_selector=f"app={app_name}", field_selector="status.phase=Running", metadata_only=True
+        )
+    ]
+
+    assert pod_names, "No pods found for the deployment."
+
+    exec_command = ["/bin/sh", "-c", f"ls {mount_path}"]
+    results = kubernetes_client.exec_in_pods(pod_names, namespace, exec_command)
+
+    for result in results:
+        logger.info(
+            f"{result['pod']}: exit_code={result['exit_code']}, latency={result['latency']}s"
+            + (f", error={result['error']}" if result["error"] else "")
+        )
+
+    failed = [result for result in results if result["exit_code"] != 0]
+    if failed:
+        details = "; ".join(f"{r['pod']}: {r['error'] or r['stderr'].strip()}" for r in failed)
+        pytest.fail(f"Mount path '{mount_path}' is inaccessible in {len(failed)}/{len(results)} pods: {details}")
+    logger.info(f"Mount path '{mount_path}' is accessible in all {len(results)} pods.")
@@ -1,20 +1,168 @@
-import time
+import os
+import json
 import pytest
-from google.cloud import monitoring_v3
-from pytest_bdd import given, when, then, scenarios
-from kubernetes import client, config
+from pytest_bdd import given, when, then, scenarios, parsers
 
 from src.utils.logging_util import get_logger
 from src.utils.config_util import load_config
-from kubernetes.stream import stream
-import random
-import string
+from src.utils.dataset_util import seed_files
+from src.utils.workload_util import scale_and_measure, ramp_deployment, wait_for_running_pods
+from src.utils.metrics_util import MetricsCollector, IOPS_METRIC, THROUGHPUT_METRIC, instance_filter
+from src.utils.results_store import (
+    ResultsStore, config_fingerprint, evaluate_against_baseline, read_run_metrics, HIGHER_IS_BETTER, LOWER_IS_BETTER,
+)
+from src.utils.startup_util import PHASES
+from src.utils.sweep_util import (
+    parse_values, sweep_points, run_sweep, scaling_curve, write_scaling_curve, find_knee, CURVE_METRICS,
+)
 
 logger = get_logger(__name__)
 CONFIG = load_config()
 
 scenarios("../features/parallelstore_perf_test.feature")
 
+SCENARIO = "parallelstore_read_perf"
+SWEEP_SCENARIO = "parallelstore_read_sweep"
+RAMP_SCENARIO = "parallelstore_read_ramp"
+
+# Metrics gated against the rolling baseline of earlier comparable runs
+GATED_METRICS = {
+    "iops_sustained": HIGHER_IS_BETTER,
+    "throughput_mbps_sustained": HIGHER_IS_BETTER,
+    "client_p99_ms": LOWER_IS_BETTER,
+}
+
+
+def seed_read_files(kubernetes_client, num_files, file_size_mb, pod_name=None):
+    """Remove existing files and create the read workload's test files in the Parallelstore mount path."""
+    namespace = CONFIG.k8s.namespace
+    mount_path = CONFIG.parallelstore.mount_path
+    perf_app_name = CONFIG.k8s.perf_app_name
+    parallelism = CONFIG.perf.seed_parallelism
+
+    # Get pod name
+    if pod_name is None:
+        pods = kubernetes_client.list_pods(namespace, label_selector=f"app={perf_app_name}")
+        assert pods, f"No pods found for app '{perf_app_name}' in namespace '{namespace}'."
+        pod_name = pods[0].metadata.name
+
+    file_size_bytes = file_size_mb * 1024 * 1024  # Convert to bytes
+
+    # Clear the mount path and write all files in a single exec session
+    logger.info(f"Creating {num_files} test files ({file_size_mb}MB each) inside Parallelstore mount: {mount_path}")
+    manifest = seed_files(
+        kubernetes_client, pod_name, namespace, mount_path, num_files, file_size_bytes,
+        parallelism=parallelism, clean=True,
+    )
+    logger.info(f"Successfully created {len(manifest)} test files in Parallelstore.")
+    return {"files": num_files, "file_size_mb": file_size_mb}
+
+
+def scale_perf_deployment(kubernetes_client, replicas):
+    """Scale the deployment without measuring and return its pods once exactly that many are running."""
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.perf_deployment_name
+    logger.info(f"Scaling deployment '{deployment_name}' in namespace '{namespace}' to {replicas} replicas.")
+    kubernetes_client.get_client("AppsV1Api").patch_namespaced_deployment_scale(
+        name=deployment_name, namespace=namespace, body={"spec": {"replicas": replicas}}
+    )
+    return wait_for_running_pods(
+        kubernetes_client, namespace, f"app={CONFIG.k8s.perf_app_name}", replicas, CONFIG.scaling.timeout
+    )
+
+
+def reseed_read_files(kubernetes_client, num_files, file_size_mb):
+    """Replace the test files with no pods reading them, so the next rollout starts on a fresh file index."""
+    # Seeding runs in a perf pod, so one is kept while the files are replaced; the
+    # readers indexed the old files and would miss new ones until their next rescan.
+    seeder = scale_perf_deployment(kubernetes_client, 1)[0]
+    dataset = seed_read_files(kubernetes_client, num_files, file_size_mb, pod_name=seeder.metadata.name)
+    scale_perf_deployment(kubernetes_client, 0)
+    return dataset
+
+
+def measure_read_point(kubernetes_client, replicas, minutes):
+    """Scale the deployment, wait for steady throughput (at most the given minutes) and return the steady window."""
+    # Only the steady window is measured; client-side latency histograms are scraped
+    # at both ends of it and diffed, and Cloud Monitoring is queried for the same span.
+    steady_state = CONFIG.steady_state
+    window = scale_and_measure(
+        kubernetes_client, CONFIG.k8s.perf_deployment_name, CONFIG.k8s.namespace, f"app={CONFIG.k8s.perf_app_name}",
+        replicas, CONFIG.scaling.timeout, steady_state.interval, steady_state.window, steady_state.cv_tolerance,
+        minutes * 60,
+        port=CONFIG.perf.metrics_port, mode=CONFIG.perf.scrape_mode, concurrency=CONFIG.perf.scrape_concurrency,
+    )
+    logger.info(f"Measured {window['end'] - window['start']:.0f}s at {replicas} replicas "
+                f"after {window['warmup_s']}s of warm-up.")
+    return {**window, "minutes": minutes}
+
+
+def collect_run_metrics(window):
+    """Fetch Parallelstore IOPS and throughput over a window once ingested and flatten them with the client-side figures."""
+    collector = MetricsCollector(CONFIG.parallelstore.project_id)
+    rates = collector.collect_settled(
+        {"iops": IOPS_METRIC, "throughput": THROUGHPUT_METRIC},
+        instance_filter(CONFIG.parallelstore.instance_name), window["start"], window["end"],
+        timeout=CONFIG.perf.monitoring_ingestion_timeout, poll_interval=CONFIG.perf.monitoring_poll_interval,
+    )
+    metrics = {
+        **read_run_metrics(rates, window["client_latency"], window["rollout"]),
+        "steady_state": float(window["steady"]),
+        "warmup_s": window["warmup_s"],
+        "measured_s": window["end"] - window["start"],
+    }
+    if window["startup"]:
+        startup = window["startup"]["summary"]
+        metrics["startup_pods"] = startup["pods"]
+        metrics["startup_mount_failures"] = startup["mount_failures"]
+        for phase in PHASES:
+            for stat in ("p50", "p95", "max"):
+                metrics[f"startup_{phase}_{stat}_s"] = startup["phases"][phase][stat]
+    return metrics
+
+
+def record_run(scenario, metrics, settings, environment):
+    """Append an ungated run to the results store."""
+    store = ResultsStore(CONFIG.results.path)
+    try:
+        return store.record_run(scenario, metrics, {"settings": settings, "environment": environment},
+                                fingerprint=config_fingerprint(settings))
+    finally:
+        store.close()
+
+
+def describe_run(k8s_client, dataset, replicas, minutes):
+    """
+    Collect what makes perf runs comparable, and the environment they ran in.
+
+    Returns:
+        tuple: (settings that feed the fingerprint, environment recorded alongside them).
+    """
+    deployment = k8s_client("AppsV1Api").read_namespaced_deployment(
+        name=CONFIG.k8s.perf_deployment_name, namespace=CONFIG.k8s.namespace
+    )
+    container = deployment.spec.template.spec.containers[0]
+    settings = {
+        "instance": CONFIG.parallelstore.instance_name,
+        "replicas": replicas,
+        "files": dataset["files"],
+        "file_size_mb": dataset["file_size_mb"],
+        "max_minutes": minutes,
+        "steady_state": {
+            "interval": CONFIG.steady_state.interval,
+            "window": CONFIG.steady_state.window,
+            "cv_tolerance": CONFIG.steady_state.cv_tolerance,
+        },
+        "image": container.image,
+        "generator_env": {env.name: env.value for env in container.env or []},
+    }
+    environment = {"kubernetes_version": None, "project": CONFIG.parallelstore.project_id}
+    try:
+        environment["kubernetes_version"] = k8s_client("VersionApi").get_code().git_version
+    except Exception as e:
+        logger.warning(f"Could not read the Kubernetes server version: {e}")
+    return settings, environment
+
 
 @given("a GKE cluster is running")
 def verify_cluster_running(k8s_client):
@@ -26,8 +174,8 @@ def verify_cluster_running(k8s_client):
 @given('a deployment named "ps-perf" exists in the "ps" namespace')
 def verify_deployment_exists(k8s_client):
     """Ensure the deployment exists in the specified namespace."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["perf_deployment_name"]
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.perf_deployment_name
 
     # Retrieve AppsV1Api client
     apps_api = k8s_client("AppsV1Api")
@@ -36,159 +184,170 @@ def verify_deployment_exists(k8s_client):
     assert response is not None, f"Deployment '{deployment_name}' does not exist in namespace '{namespace}'."
     logger.info(f"Deployment '{deployment_name}' exists.")
 
-@given("100 files of 5MB each exist in the Parallelstore mount")
-def prepare_parallelstore_files(k8s_client):
-    """Remove existing files and create 100 test files of 5MB each in the Parallelstore mount path."""
-    namespace = CONFIG["k8s"]["namespace"]
-    mount_path = CONFIG["parallelstore"]["mount_path"]
-    app_name = CONFIG["k8s"]["app_name"]
-    core_api = k8s_client("CoreV1Api")
-    perf_app_name = CONFIG["k8s"]["perf_app_name"]
+@given(parsers.parse("{num_files:d} files of {file_size_mb:d}MB each exist in the Parallelstore mount"), target_fixture="dataset")
+def prepare_parallelstore_files(kubernetes_client, num_files, file_size_mb):
+    """Remove existing files and create the test files in the Parallelstore mount path."""
+    return seed_read_files(kubernetes_client, num_files, file_size_mb)
+
+@when(
+    parsers.parse("the deployment has {replicas:d} replicas up and running until throughput is steady, for at most {minutes:d} min"),
+    target_fixture="measurement_window",
+)
+def scale_deployment(kubernetes_client, replicas, minutes):
+    """Scale the deployment, wait until throughput is steady and return the steady window."""
+    return measure_read_point(kubernetes_client, replicas, minutes)
+
+@then("the Parallelstore IOPS and throughput should be within the GCP official benchmarks over the steady window")
+def validate_parallelstore_metrics(k8s_client, dataset, measurement_window):
+    """Fetch Parallelstore IOPS and throughput over the steady window, record the run and gate it against the baseline."""
+    client_latency = measurement_window["client_latency"]
+    max_client_p99_ms = CONFIG.perf.max_client_p99_ms
+    metrics = collect_run_metrics(measurement_window)
 
-    # Get pod name
-    pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=f"app={perf_app_name}")
-    assert pods.items, f"No pods found for app '{app_name}' in namespace '{namespace}'."
-    pod_name = pods.items[0].metadata.name
-
-    num_files = 10
-    file_size_mb = 5
-    file_size_bytes = file_size_mb * 1024 * 1024  # Convert to bytes
+    logger.info(f"Retrieved Parallelstore Metrics:")
+    logger.info(f"IOPS: sustained={metrics['iops_sustained']}, p50={metrics['iops_p50']}, peak={metrics['iops_peak']}")
+    logger.info(
+        f"Throughput: sustained={metrics['throughput_mbps_sustained']}, p50={metrics['throughput_mbps_p50']}, "
+        f"peak={metrics['throughput_mbps_peak']} MBps"
+    )
+    logger.info(
+        f"Client-side: {client_latency['ops_per_s']:.1f} ops/s from {client_latency['pods']} pods, "
+        f"p50={client_latency['p50']}s, p99={client_latency['p99']}s, p999={client_latency['p999']}s"
+    )
 
-    # Step 1: **Remove all existing files in the mount path**
-    logger.info(f"Clearing all files in {mount_path} before creating new ones.")
-    cleanup_command = ["/bin/sh", "-c", f"rm -rf {mount_path}/*"]
-    stream(
-        core_api.connect_get_namespaced_pod_exec,
-        name=pod_name,
-        namespace=namespace,
-        command=cleanup_command,
-        stderr=True, stdin=False, stdout=True, tty=False
+    # Compare with earlier runs of the same settings, then append this run to the store
+    settings, environment = describe_run(
+        k8s_client, dataset, measurement_window["replicas"], measurement_window["minutes"]
     )
-    logger.info("All existing files deleted.")
-
-    # Step 2: **Create new test files**
-    logger.info(f"Creating {num_files} test files (5MB each) inside Parallelstore mount: {mount_path}")
-
-    for i in range(num_files):
-        test_filename = f"test_file_{i}.txt"
-        test_filepath = f"{mount_path}/{test_filename}"
-        
-        # Generate a random content pattern
-        test_content = "".join(random.choices(string.ascii_letters + string.digits, k=1024))  # 1KB of random text
-        repeat_count = file_size_bytes // len(test_content)  # Repeat to make it 5MB
-
-        logger.debug(f"Creating file {i+1}/{num_files}: {test_filename}")
-
-        # Write 5MB file via shell command
-        write_command = [
-            "/bin/sh",
-            "-c",
-            f"printf '{test_content}' > {test_filepath} && yes '{test_content}' | head -c {file_size_bytes} >> {test_filepath}"
-        ]
-        stream(
-            core_api.connect_get_namespaced_pod_exec,
-            name=pod_name,
-            namespace=namespace,
-            command=write_command,
-            stderr=True, stdin=False, stdout=True, tty=False
+    fingerprint = config_fingerprint(settings)
+    results = CONFIG.results
+    store = ResultsStore(results.path)
+    try:
+        verdicts = evaluate_against_baseline(
+            store, SCENARIO, fingerprint, metrics, GATED_METRICS, window=results.baseline_window,
+            min_runs=results.baseline_min_runs, sigma=results.baseline_sigma, tolerance=results.baseline_tolerance,
         )
-
-        logger.info(f"File created: {test_filepath}")
-        time.sleep(0.2)  # Slight delay to avoid overwhelming storage
-
-    logger.info("Successfully created 100 test files in Parallelstore.")
-
-@when('the deployment has 5000 replicas up and running for 10 min')
-def scale_deployment(k8s_client):
-    """Scale the deployment to 5000 replicas and monitor the progress."""
-    namespace = CONFIG["k8s"]["namespace"]
-    deployment_name = CONFIG["k8s"]["perf_deployment_name"]
-    replicas = 5000
-    timeout = CONFIG["scaling"]["timeout"]  # Timeout in seconds
-    interval = 10  # Polling interval in seconds
-
-    # Retrieve AppsV1Api client
-    apps_api = k8s_client("AppsV1Api")
-    logger.info(f"Scaling deployment '{deployment_name}' in namespace '{namespace}' to {replicas} replicas.")
-    body = {"spec": {"replicas": replicas}}
-    apps_api.patch_namespaced_deployment_scale(name=deployment_name, namespace=namespace, body=body)
-
-    logger.info(f"Waiting for deployment '{deployment_name}' to reach {replicas} replicas...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        response = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
-        logger.debug(f"Current replicas: {response.status.replicas}, Available replicas: {response.status.available_replicas}")
-        if (
-            response.status.replicas == replicas
-            and response.status.available_replicas == replicas
-        ):
-            logger.info(f"Deployment '{deployment_name}' successfully scaled to {replicas} replicas.")
-            break
-        time.sleep(interval)
-
-    else:
-        logger.error(f"Deployment '{deployment_name}' did not scale to {replicas} replicas within {timeout} seconds.")
-        raise RuntimeError(f"Deployment '{deployment_name}' did not scale to {replicas} replicas within {timeout} seconds.")
-
-    # Wait for 10 minutes before proceeding
-    wait_time = 10 * 60  # 10 minutes in seconds
-    logger.info(f"Waiting for {wait_time / 60} minutes to let all pods run before performance testing...")
-    time.sleep(wait_time)
-    logger.info("10-minute waiting period completed. Proceeding with performance validation.")
-
-@then("the Parallelstore IOPS and throughput should be within the GCP official benchmarks after 10min test")
-def validate_parallelstore_metrics():
-    """Fetch and validate Parallelstore IOPS and throughput using Cloud Monitoring API."""
-    project_id = CONFIG["parallelstore"]["project_id"]
-    instance_id = CONFIG["parallelstore"]["instance_name"]
-    region = CONFIG["parallelstore"]["region"]
-
-    # Expected benchmarks (example values, update based on GCP docs)
-    EXPECTED_IOPS = 30000
-    EXPECTED_THROUGHPUT_MBPS = 1.15  # 1GB/s
-
-    def fetch_metric(metric_type, instance_id):
-        """Query Cloud Monitoring API for Parallelstore metrics and return the max value."""
-        client = monitoring_v3.MetricServiceClient()
-        project_name = f"projects/{project_id}"
-
-        # Query last 15 minutes of data
-        interval = monitoring_v3.TimeInterval(
-            end_time={"seconds": int(time.time())},
-            start_time={"seconds": int(time.time() - 300)},  # Last 10 minutes
+        regressions = [metric for metric, verdict in verdicts.items() if verdict["ok"] is False]
+        client_p99_ms = metrics["client_p99_ms"]
+        failures = []
+        if not measurement_window["steady"]:
+            failures.append(f"throughput did not reach steady state within {measurement_window['minutes']} min")
+        if metrics["iops_sustained"] is None or metrics["throughput_mbps_sustained"] is None:
+            failures.append("no Cloud Monitoring data for the test window")
+        if max_client_p99_ms and (client_p99_ms is None or client_p99_ms > max_client_p99_ms):
+            failures.append(f"client-side p99 latency too high: {client_p99_ms} ms")
+        failures += [
+            f"{metric} regressed: {verdicts[metric]['value']} vs baseline mean {verdicts[metric]['mean']:.1f} "
+            f"(threshold {verdicts[metric]['threshold']:.1f}, {verdicts[metric]['runs']} runs)"
+            for metric in regressions
+        ]
+        run_id = store.record_run(
+            SCENARIO, metrics, {"settings": settings, "environment": environment},
+            fingerprint=fingerprint, passed=not failures,
         )
+    finally:
+        store.close()
 
-        filter_str = f'metric.type="{metric_type}" AND resource.type="parallelstore.googleapis.com/Instance" AND resource.label.instance_id="{instance_id}"'
-        request = monitoring_v3.ListTimeSeriesRequest(
-            name=project_name,
-            filter=filter_str,
-            interval=interval,
-            view=monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
+    if all(verdict["ok"] is None for verdict in verdicts.values()):
+        logger.info(
+            f"Run {run_id} is building the baseline for fingerprint {fingerprint} "
+            f"({results.baseline_min_runs} passing runs needed before it gates)."
         )
-
-        result = client.list_time_series(request=request)
-        
-        # Extract all the values from the time series data
-        values = [point.value.double_value for ts in result for point in ts.points]
-        
-        # Return the max value or None if no values found
-        return max(values) if values else None
-
-    # Fetch IOPS and throughput
-    iops_metric = "parallelstore.googleapis.com/instance/read_ops_count"
-    throughput_metric = "parallelstore.googleapis.com/instance/transferred_byte_count"
-
-    actual_iops = fetch_metric(iops_metric, instance_id)
-    actual_throughput = fetch_metric(throughput_metric, instance_id)
-    # actual_cpu = fetch_metric("kubernetes.io/container/cpu/core_usage_time")
-
-    logger.info(f"Retrieved Parallelstore Metrics:")
-    # logger.info(f"CPU Usage: {actual_cpu}")
-    logger.info(f"Max IOPS: {actual_iops} (Expected: {EXPECTED_IOPS})")
-    logger.info(f"Max Throughput: {actual_throughput} MBps (Expected: {EXPECTED_THROUGHPUT_MBPS})")
-
-    # Validation against expected benchmarks
-    assert actual_iops is not None and actual_iops >= EXPECTED_IOPS, f"IOPS too low: {actual_iops}"
-    assert actual_throughput is not None and actual_throughput >= EXPECTED_THROUGHPUT_MBPS, f"Throughput too low: {actual_throughput} MBps"
-
-    logger.info("Parallelstore performance meets GCP benchmarks!")
\ No newline at end of file
+    assert not failures, f"Parallelstore perf run {run_id} failed: " + "; ".join(failures)
+
+    logger.info(f"Parallelstore performance of run {run_id} is in line with its baseline!")
+
+@when(
+    parsers.parse(
+        'the read workload is swept over "{replicas}" replicas and "{file_sizes_mb}" MB files '
+        'of {num_files:d} files for at most {minutes:d} min per point'
+    ),
+    target_fixture="sweep_results",
+)
+def sweep_read_workload(k8s_client, kubernetes_client, replicas, file_sizes_mb, num_files, minutes):
+    """Measure every combination of replica count and file size, reseeding the files once per size."""
+    points = sweep_points(parse_values(replicas), parse_values(file_sizes_mb))
+    logger.info(f"Sweeping {len(points)} points of at most {minutes} min each...")
+    state = {"dataset": None}
+
+    def run_point(point):
+        if state["dataset"] is None or state["dataset"]["file_size_mb"] != point["file_size_mb"]:
+            state["dataset"] = reseed_read_files(kubernetes_client, num_files, point["file_size_mb"])
+        window = measure_read_point(kubernetes_client, point["replicas"], minutes)
+        metrics = collect_run_metrics(window)
+        record_run(SWEEP_SCENARIO, metrics, *describe_run(k8s_client, state["dataset"], point["replicas"], minutes))
+        return metrics
+
+    return run_sweep(points, run_point)
+
+@then(parsers.parse('the scaling curve of IOPS and throughput should be written to "{path_prefix}"'))
+def write_sweep_curve(sweep_results, path_prefix):
+    """Write the scaling curve and check that every point was measured."""
+    rows = scaling_curve(sweep_results)
+    write_scaling_curve(rows, path_prefix)
+
+    failed = [f"{row['file_size_mb']} MB x {row['replicas']} replicas: {row['error']}" for row in rows if row["error"]]
+    missing = [
+        f"{row['file_size_mb']} MB x {row['replicas']} replicas" for row in rows
+        if not row["error"] and row["iops_sustained"] is None
+    ]
+    assert not failed, f"Sweep points failed: {failed}"
+    assert not missing, f"No Cloud Monitoring data for sweep points: {missing}"
+    logger.info(f"Scaling curve with {len(rows)} points written to {path_prefix}.csv/.json.")
+
+@when(parsers.parse('the deployment is ramped through "{steps}" replicas holding each step until throughput is steady'),
+      target_fixture="ramp_results")
+def ramp_read_workload(k8s_client, kubernetes_client, dataset, steps):
+    """Scale up in stages, measure each steady plateau server-side and client-side and record it."""
+    ramp, steady_state = CONFIG.ramp, CONFIG.steady_state
+    plateaus = ramp_deployment(
+        kubernetes_client, CONFIG.k8s.perf_deployment_name, CONFIG.k8s.namespace, f"app={CONFIG.k8s.perf_app_name}",
+        parse_values(steps), CONFIG.scaling.timeout, steady_state.interval, steady_state.window,
+        steady_state.cv_tolerance, ramp.max_hold,
+        port=CONFIG.perf.metrics_port, mode=CONFIG.perf.scrape_mode, concurrency=CONFIG.perf.scrape_concurrency,
+    )
+    # Server-side rates are only queried once the ramp is done; collect_run_metrics() still
+    # waits for the last plateau to be ingested
+    results = []
+    for plateau in plateaus:
+        metrics = collect_run_metrics(plateau)
+        settings, environment = describe_run(k8s_client, dataset, plateau["replicas"], round(ramp.max_hold / 60, 2))
+        record_run(RAMP_SCENARIO, metrics, {**settings, "ramp_steps": steps}, environment)
+        results.append({"file_size_mb": dataset["file_size_mb"], "replicas": plateau["replicas"],
+                        "metrics": metrics, "error": None})
+    return results
+
+@then(parsers.parse('the ramp report with the knee point should be written to "{path_prefix}"'))
+def write_ramp_report(ramp_results, path_prefix):
+    """Write the per-step throughput with the knee point where added replicas stop adding IOPS."""
+    rows = scaling_curve(ramp_results, CURVE_METRICS + ("steady_state", "warmup_s"))
+    knee = find_knee(rows, "iops_sustained", CONFIG.ramp.knee_min_gain)
+    gains = {gain["replicas"]: gain["gain"] for gain in knee["marginal_gains"]}
+    for row in rows:
+        row["marginal_gain"] = gains.get(row["replicas"])
+        row["knee"] = row["replicas"] == knee["replicas"]
+    write_scaling_curve(rows, path_prefix)
+
+    missing = [row["replicas"] for row in rows if row["iops_sustained"] is None]
+    assert not missing, f"No Cloud Monitoring data for ramp steps: {missing}"
+    if knee["replicas"] is None:
+        logger.info(f"IOPS kept scaling up to {rows[-1]['replicas']} replicas; no knee within the ramp.")
+    else:
+        logger.info(f"Knee point: {knee['replicas']} replicas at {knee['value']:.1f} IOPS; size the fleet there.")
+
+@then(parsers.parse('the pod startup and volume mount breakdown should be written to "{path}"'))
+def write_startup_breakdown(measurement_window, path):
+    """Write the per-phase startup latency of the rollout's pods and check the mount phase."""
+    startup = measurement_window["startup"]
+    assert startup is not None, "The pod startup breakdown could not be collected."
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(startup, f, indent=2)
+    logger.info(f"Wrote the startup breakdown of {startup['summary']['pods']} pods to {path}.")
+
+    mount_p95 = startup["summary"]["phases"]["volume_mount"]["p95"]
+    max_mount_p95_s = CONFIG.perf.max_mount_p95_s
+    if max_mount_p95_s and startup["summary"]["pods"]:
+        assert mount_p95 is not None and mount_p95 <= max_mount_p95_s, \
+            f"Volume mount p95 too high: {mount_p95}s (nodes: {startup['summary']['node_outliers'][:5]})"
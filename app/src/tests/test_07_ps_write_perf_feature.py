@@ -0,0 +1,98 @@
+import os
+import time
+from pytest_bdd import given, when, then, scenarios, parsers
+
+from src.utils.logging_util import get_logger
+from src.utils.config_util import load_config
+from src.utils.workload_util import switch_workload, measure_op_latency, wait_for_running_pods
+from src.utils.dataset_util import remove_directory
+
+logger = get_logger(__name__)
+CONFIG = load_config()
+
+scenarios("../features/parallelstore_write_perf_test.feature")
+
+
+@given("a GKE cluster is running")
+def verify_cluster_running(k8s_client):
+    """Verify that the Kubernetes cluster is accessible."""
+    logger.info("Verifying Kubernetes cluster is running...")
+    assert k8s_client is not None, "Kubernetes client could not be initialized."
+    logger.info("Kubernetes cluster verification successful.")
+
+@given('a deployment named "ps-perf" exists in the "ps" namespace')
+def verify_deployment_exists(k8s_client):
+    """Ensure the deployment exists in the specified namespace."""
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.perf_deployment_name
+
+    # Retrieve AppsV1Api client
+    apps_api = k8s_client("AppsV1Api")
+    logger.info(f"Checking if deployment '{deployment_name}' exists in namespace '{namespace}'...")
+    response = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+    assert response is not None, f"Deployment '{deployment_name}' does not exist in namespace '{namespace}'."
+    logger.info(f"Deployment '{deployment_name}' exists.")
+
+@when(
+    parsers.parse('the deployment runs "{pattern}" writes with "{sync_policy}" sync policy on {replicas:d} replicas for {minutes:d} min'),
+    target_fixture="write_window",
+)
+def run_write_workload(request, kubernetes_client, pattern, sync_policy, replicas, minutes):
+    """Switch the load generator to the write workload, scale it and measure client-side write latency."""
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.perf_deployment_name
+    label_selector = f"app={CONFIG.k8s.perf_app_name}"
+    write_dir = os.path.join(CONFIG.parallelstore.mount_path, "writes")
+
+    def remove_written_files():
+        """Delete the scenario's files (several GiB per run) once the previous workload is back."""
+        apps_api = kubernetes_client.get_client("AppsV1Api")
+        restored = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace).spec.replicas
+        kubernetes_client.wait_for_deployment_rollout(deployment_name, namespace, restored, CONFIG.scaling.timeout)
+        pods = wait_for_running_pods(kubernetes_client, namespace, label_selector, restored, CONFIG.scaling.timeout)
+        if not pods:
+            logger.warning(f"No running pod to remove '{write_dir}' from; it is left in place.")
+            return
+        remove_directory(kubernetes_client, pods[0].metadata.name, namespace, write_dir)
+
+    # Finalizers run last-in first-out: restore the previous workload first, then clean up
+    request.addfinalizer(remove_written_files)
+    restore = switch_workload(kubernetes_client, deployment_name, namespace, {
+        "WORKLOAD": "write",
+        "WRITE_PATTERN": pattern,
+        "SYNC_POLICY": sync_policy,
+        "BLOCK_SIZE": CONFIG.perf.write_block_size,
+        "WRITE_SIZE": CONFIG.perf.write_size,
+        # Every pod claims one slot of the shared n1 file; a new run id starts from free slots
+        "N1_PODS": replicas,
+        "N1_RUN_ID": f"{int(time.time())}",
+    }, replicas, CONFIG.scaling.timeout)
+    request.addfinalizer(restore)
+
+    # Per-block ("write") and whole-operation ("file") latency over the window
+    pods = wait_for_running_pods(kubernetes_client, namespace, label_selector, replicas, CONFIG.scaling.timeout)
+    logger.info(f"Running '{pattern}' writes with sync policy '{sync_policy}' for {minutes} minutes...")
+    return measure_op_latency(
+        kubernetes_client, namespace, pods, ("write", "file"), minutes * 60,
+        port=CONFIG.perf.metrics_port, mode=CONFIG.perf.scrape_mode, concurrency=CONFIG.perf.scrape_concurrency,
+    )
+
+@then(parsers.parse("the client-side write throughput should be at least {min_mb_per_s:d} MB/s"))
+def validate_write_throughput(write_window, min_mb_per_s):
+    """Check aggregate write throughput and, if configured, the p99 latency of a whole write operation."""
+    blocks, operations = write_window["write"], write_window["file"]
+    throughput = blocks["ops_per_s"] * CONFIG.perf.write_block_size / (1024 * 1024)
+    max_write_p99_ms = CONFIG.perf.max_write_p99_ms
+
+    logger.info(
+        f"Client-side writes: {throughput:.1f} MB/s from {blocks['pods']} pods, block p99={blocks['p99']}s, "
+        f"operation p50={operations['p50']}s, p99={operations['p99']}s, p999={operations['p999']}s"
+    )
+    assert blocks["pods"] > 0, "No load generator pod reported write metrics."
+    assert throughput >= min_mb_per_s, f"Write throughput too low: {throughput:.1f} MB/s"
+    if max_write_p99_ms:
+        write_p99_ms = operations["p99"] * 1000 if operations["p99"] is not None else None
+        assert write_p99_ms is not None and write_p99_ms <= max_write_p99_ms, \
+            f"Client-side p99 write latency too high: {write_p99_ms} ms"
+
+    logger.info("Parallelstore write performance meets the expected throughput!")
@@ -0,0 +1,80 @@
+from pytest_bdd import given, when, then, scenarios, parsers
+
+from src.utils.logging_util import get_logger
+from src.utils.config_util import load_config
+from src.utils.workload_util import switch_workload, measure_op_latency, wait_for_running_pods
+
+logger = get_logger(__name__)
+CONFIG = load_config()
+
+scenarios("../features/parallelstore_metadata_perf_test.feature")
+
+# Operation labels reported by the load generator's metadata workload
+METADATA_OPS = ("create", "stat", "open_close", "rename", "unlink")
+
+
+@given("a GKE cluster is running")
+def verify_cluster_running(k8s_client):
+    """Verify that the Kubernetes cluster is accessible."""
+    logger.info("Verifying Kubernetes cluster is running...")
+    assert k8s_client is not None, "Kubernetes client could not be initialized."
+    logger.info("Kubernetes cluster verification successful.")
+
+@given('a deployment named "ps-perf" exists in the "ps" namespace')
+def verify_deployment_exists(k8s_client):
+    """Ensure the deployment exists in the specified namespace."""
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.perf_deployment_name
+
+    # Retrieve AppsV1Api client
+    apps_api = k8s_client("AppsV1Api")
+    logger.info(f"Checking if deployment '{deployment_name}' exists in namespace '{namespace}'...")
+    response = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+    assert response is not None, f"Deployment '{deployment_name}' does not exist in namespace '{namespace}'."
+    logger.info(f"Deployment '{deployment_name}' exists.")
+
+@when(
+    parsers.parse(
+        'the deployment runs metadata operations in "{tree}" trees of depth {depth:d} and fan-out {fanout:d} '
+        'on {replicas:d} replicas for {minutes:d} min'
+    ),
+    target_fixture="metadata_window",
+)
+def run_metadata_workload(request, kubernetes_client, tree, depth, fanout, replicas, minutes):
+    """Switch the load generator to the metadata workload, scale it and measure each operation type."""
+    namespace = CONFIG.k8s.namespace
+    deployment_name = CONFIG.k8s.perf_deployment_name
+
+    # Restore the previous read workload once the scenario is done
+    restore = switch_workload(kubernetes_client, deployment_name, namespace, {
+        "WORKLOAD": "metadata",
+        "METADATA_TREE": tree,
+        "METADATA_DEPTH": depth,
+        "METADATA_FANOUT": fanout,
+    }, replicas, CONFIG.scaling.timeout)
+    request.addfinalizer(restore)
+
+    pods = wait_for_running_pods(
+        kubernetes_client, namespace, f"app={CONFIG.k8s.perf_app_name}", replicas, CONFIG.scaling.timeout
+    )
+    logger.info(f"Running metadata operations in '{tree}' trees (depth {depth}, fan-out {fanout}) for {minutes} minutes...")
+    return measure_op_latency(
+        kubernetes_client, namespace, pods, METADATA_OPS, minutes * 60,
+        port=CONFIG.perf.metrics_port, mode=CONFIG.perf.scrape_mode, concurrency=CONFIG.perf.scrape_concurrency,
+    )
+
+@then(parsers.parse('the client-side "{op}" rate should be at least {min_ops:d} ops/s with p99 below {max_p99_ms:d} ms'))
+def validate_metadata_rate(metadata_window, op, min_ops, max_p99_ms):
+    """Check the aggregate rate and p99 latency of one metadata operation type."""
+    summary = metadata_window[op]
+    p99_ms = summary["p99"] * 1000 if summary["p99"] is not None else None
+
+    logger.info(
+        f"Client-side '{op}': {summary['ops_per_s']:.1f} ops/s from {summary['pods']} pods, "
+        f"p50={summary['p50']}s, p99={summary['p99']}s, p999={summary['p999']}s"
+    )
+    assert summary["pods"] > 0, f"No load generator pod reported '{op}' metrics."
+    assert summary["ops_per_s"] >= min_ops, f"'{op}' rate too low: {summary['ops_per_s']:.1f} ops/s"
+    assert p99_ms is not None and p99_ms <= max_p99_ms, f"'{op}' p99 latency too high: {p99_ms} ms"
+
+    logger.info(f"Parallelstore '{op}' metadata performance meets the expectation!")
@@ -1,25 +1,222 @@
+import os
+import functools
+import dataclasses
+from dataclasses import dataclass
 import tomli
-import logging
-from src.utils.logging_util import get_logger
 
-logger = get_logger(__name__)
+# Sections whose keys can be overridden with environment variables named
+# <PREFIX>_<KEY>, e.g. PS_PERF_SEED_PARALLELISM=32.
+ENV_OVERRIDE_PREFIXES = {"perf": "PS_PERF"}
 
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+CONFIG_MODES = ("local", "in-cluster")
+
+
+@dataclass(frozen=True, slots=True)
+class K8sConfig:
+    namespace: str
+    deployment_name: str
+    app_name: str
+    perf_deployment_name: str
+    perf_app_name: str
+    config_mode: str = "local"
+
+
+@dataclass(frozen=True, slots=True)
+class ScalingConfig:
+    timeout: int = 3600
+    interval: int = 10
+
+
+@dataclass(frozen=True, slots=True)
+class ExecConfig:
+    max_workers: int = 50
+    timeout: int = 60
+
+
+@dataclass(frozen=True, slots=True)
+class PerfConfig:
+    seed_parallelism: int = 16
+    metrics_port: int = 7001
+    scrape_mode: str = "proxy"
+    scrape_concurrency: int = 64
+    max_client_p99_ms: float = 0.0
+    write_block_size: int = 1048576
+    write_size: int = 16777216
+    max_write_p99_ms: float = 0.0
+    max_mount_p95_s: float = 0.0
+    monitoring_ingestion_timeout: int = 300
+    monitoring_poll_interval: int = 30
+
+
+@dataclass(frozen=True, slots=True)
+class TransferConfig:
+    timeout: int = 3600
+    poll_initial_interval: float = 2.0
+    poll_max_interval: float = 30.0
+    min_mb_per_s: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class SteadyStateConfig:
+    interval: int = 30
+    window: int = 6
+    cv_tolerance: float = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class RampConfig:
+    max_hold: int = 900
+    knee_min_gain: float = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class ResultsConfig:
+    path: str = "results/perf_results.sqlite"
+    baseline_window: int = 10
+    baseline_min_runs: int = 3
+    baseline_sigma: float = 3.0
+    baseline_tolerance: float = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class LoggingConfig:
+    log_level: str = "INFO"
+
+
+@dataclass(frozen=True, slots=True)
+class ProxyConfig:
+    http_proxy: str = ""
+    https_proxy: str = ""
+    verify_ssl: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionConfig:
+    pool_maxsize: int = 64
+    pool_block: bool = False
+    tcp_keepalive: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ParallelstoreConfig:
+    mount_path: str
+    instance_name: str
+    region: str
+    project_id: str
+
+
+@dataclass(frozen=True, slots=True)
+class GCSConfig:
+    bucket_name: str
+    verify_checksums: bool = True
+    pod_crc32c: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    k8s: K8sConfig
+    parallelstore: ParallelstoreConfig
+    gcs: GCSConfig
+    scaling: ScalingConfig = ScalingConfig()
+    exec: ExecConfig = ExecConfig()
+    perf: PerfConfig = PerfConfig()
+    transfer: TransferConfig = TransferConfig()
+    steady_state: SteadyStateConfig = SteadyStateConfig()
+    ramp: RampConfig = RampConfig()
+    results: ResultsConfig = ResultsConfig()
+    logging: LoggingConfig = LoggingConfig()
+    proxy: ProxyConfig = ProxyConfig()
+    connection: ConnectionConfig = ConnectionConfig()
+
+
+# TOML table name for each Settings field, where it differs from the field name.
+SECTION_NAMES = {"gcs": "GCS"}
+
+
+def _coerce(value, field_type, where):
+    """
+    Check a configuration value against its declared type, converting strings
+    from environment variables where needed.
+    """
+    if isinstance(value, str) and field_type is not str:
+        try:
+            if field_type is bool:
+                if value.lower() not in ("true", "false", "1", "0"):
+                    raise ValueError(value)
+                return value.lower() in ("true", "1")
+            return field_type(value)
+        except ValueError:
+            raise ValueError(f"Invalid value {value!r} for {where}: expected {field_type.__name__}.")
+    if field_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, field_type) or (field_type is int and isinstance(value, bool)):
+        raise ValueError(f"Invalid value {value!r} for {where}: expected {field_type.__name__}.")
+    return value
+
+
+def _build_section(section_cls, section_name, values, config_file):
+    """
+    Build one configuration section, rejecting unknown keys and applying
+    environment-variable overrides.
+    """
+    fields = {field.name: field for field in dataclasses.fields(section_cls)}
+    unknown = sorted(set(values) - set(fields))
+    if unknown:
+        raise ValueError(
+            f"Unknown key(s) {unknown} in [{section_name}] of {config_file}. Valid keys: {sorted(fields)}."
+        )
+
+    values = dict(values)
+    prefix = ENV_OVERRIDE_PREFIXES.get(section_name)
+    if prefix:
+        for name in fields:
+            env_value = os.environ.get(f"{prefix}_{name.upper()}")
+            if env_value is not None:
+                values[name] = env_value
+
+    missing = sorted(name for name, field in fields.items()
+                     if name not in values and field.default is dataclasses.MISSING)
+    if missing:
+        raise ValueError(f"Missing required key(s) {missing} in [{section_name}] of {config_file}.")
+
+    return section_cls(**{
+        name: _coerce(value, fields[name].type, f"{section_name}.{name}") for name, value in values.items()
+    })
+
+
+@functools.lru_cache(maxsize=None)
 def load_config(config_file="config/settings.toml"):
     """
-    Load configuration from a TOML file.
+    Load and validate configuration from a TOML file.
+
+    The result is cached, so the file is parsed once per process.
 
     Args:
         config_file (str): Path to the configuration file.
 
     Returns:
-        dict: Parsed configuration data.
+        Settings: Parsed configuration data.
+
+    Raises:
+        ValueError: If a section or key is unknown, missing or has the wrong type.
     """
-    logger.info(f"Loading configuration from {config_file}...")
-    try:
-        with open(config_file, "rb") as file:
-            config = tomli.load(file)
-        logger.info("Configuration loaded successfully.")
-        return config
-    except Exception as e:
-        logger.error(f"Failed to load configuration: {e}")
-        raise
\ No newline at end of file
+    with open(config_file, "rb") as file:
+        data = tomli.load(file)
+
+    sections = {SECTION_NAMES.get(field.name, field.name): field for field in dataclasses.fields(Settings)}
+    unknown = sorted(set(data) - set(sections))
+    if unknown:
+        raise ValueError(f"Unknown section(s) or top-level key(s) {unknown} in {config_file}.")
+
+    settings = Settings(**{
+        field.name: _build_section(field.type, section_name, data.get(section_name, {}), config_file)
+        for section_name, field in sections.items()
+        if section_name in data or field.default is dataclasses.MISSING or section_name in ENV_OVERRIDE_PREFIXES
+    })
+
+    if settings.logging.log_level.upper() not in LOG_LEVELS:
+        raise ValueError(f"Invalid logging.log_level {settings.logging.log_level!r}. Use one of {LOG_LEVELS}.")
+    if settings.k8s.config_mode not in CONFIG_MODES:
+        raise ValueError(f"Invalid k8s.config_mode {settings.k8s.config_mode!r}. Use one of {CONFIG_MODES}.")
+    return settings
@@ -0,0 +1,184 @@
+import shlex
+import time
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+
+def seed_files(kubernetes_client, pod_name, namespace, directory, num_files, file_size_bytes,
+               prefix="test_file_", parallelism=16, clean=False, timeout=600):
+    """
+    Create a set of test files inside a pod using a single exec session.
+
+    The files are generated in the pod by parallel writers (xargs -P), so no file
+    content crosses the network. Each writer checksums its file while writing it.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to exec into the pod.
+        pod_name (str): Name of the pod to run the writers in.
+        namespace (str): Namespace of the pod.
+        directory (str): Directory to create the files in.
+        num_files (int): Number of files to create.
+        file_size_bytes (int): Size of each file in bytes.
+        prefix (str): File name prefix; files are named "<prefix><index>.txt".
+        parallelism (int): Number of concurrent writers inside the pod.
+        clean (bool): Remove everything in the directory before writing.
+        timeout (int): Maximum time in seconds for the exec session.
+
+    Returns:
+        dict: Manifest mapping each file name to {"size": int, "md5": str}.
+
+    Raises:
+        RuntimeError: If the exec fails or the manifest does not match the request.
+    """
+    quoted_dir = shlex.quote(directory.rstrip("/"))
+    writer = (
+        f'f={quoted_dir}/{prefix}$0.txt; '
+        f's=$(base64 /dev/urandom | head -c {file_size_bytes} | tee "$f" | md5sum | cut -d" " -f1) '
+        f'&& echo "$f $(stat -c %s "$f") $s"'
+    )
+    script = "set -e; "
+    if clean:
+        script += f"rm -rf {quoted_dir}/*; "
+    script += f"seq 0 {num_files - 1} | xargs -P {parallelism} -n 1 sh -c {shlex.quote(writer)}"
+
+    logger.info(f"Seeding {num_files} files of {file_size_bytes} bytes in '{directory}' on pod '{pod_name}' "
+                f"with {parallelism} writers...")
+    start_time = time.monotonic()
+    result = kubernetes_client.exec_in_pod(pod_name, namespace, ["/bin/sh", "-c", script], timeout=timeout)
+    if result["exit_code"] != 0:
+        raise RuntimeError(f"Seeding files on pod '{pod_name}' failed: {result['error'] or result['stderr'].strip()}")
+
+    manifest = {}
+    for line in result["stdout"].splitlines():
+        path, size, md5 = line.rsplit(" ", 2)
+        manifest[path.rsplit("/", 1)[-1]] = {"size": int(size), "md5": md5}
+
+    wrong_size = [name for name, entry in manifest.items() if entry["size"] != file_size_bytes]
+    if len(manifest) != num_files or wrong_size:
+        raise RuntimeError(f"Expected {num_files} files of {file_size_bytes} bytes, got {len(manifest)} files "
+                           f"({len(wrong_size)} with the wrong size).")
+
+    elapsed = time.monotonic() - start_time
+    total_mb = num_files * file_size_bytes / (1024 * 1024)
+    logger.info(f"Seeded {num_files} files ({total_mb:.1f} MB) in {elapsed:.1f}s ({total_mb / elapsed:.1f} MB/s).")
+    return manifest
+
+
+def list_files(kubernetes_client, pod_name, namespace, directory, timeout=600):
+    """
+    Recursively list the files under a directory inside a pod, with their sizes.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to exec into the pod.
+        pod_name (str): Name of the pod.
+        namespace (str): Namespace of the pod.
+        directory (str): Directory to list.
+        timeout (int): Maximum time in seconds for the exec session.
+
+    Returns:
+        dict: File path relative to the directory -> size in bytes.
+
+    Raises:
+        RuntimeError: If the listing fails.
+    """
+    command = ["/bin/sh", "-c", f"find {shlex.quote(directory)} -type f -printf '%s %P\\n'"]
+    result = kubernetes_client.exec_in_pod(pod_name, namespace, command, timeout=timeout)
+    if result["exit_code"] != 0:
+        raise RuntimeError(f"Listing files in '{directory}' on pod '{pod_name}' failed: "
+                           f"{result['error'] or result['stderr'].strip()}")
+
+    files = {}
+    for line in result["stdout"].splitlines():
+        size, path = line.split(" ", 1)
+        files[path] = int(size)
+    logger.info(f"Found {len(files)} files in '{directory}' on pod '{pod_name}'.")
+    return files
+
+
+# Computes the MD5 (hex) and CRC32C (base64 big-endian, as in GCS metadata) of each
+# file given as an argument, reading it once. Needs python3 with google-crc32c or crcmod.
+CHECKSUM_SCRIPT = """
+import base64, hashlib, sys
+try:
+    from google_crc32c import Checksum as CRC32C
+except ImportError:
+    from crcmod.predefined import Crc
+    CRC32C = lambda: Crc('crc-32c')
+for path in sys.argv[1:]:
+    md5, crc32c = hashlib.md5(), CRC32C()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            md5.update(chunk)
+            crc32c.update(chunk)
+    print(md5.hexdigest(), base64.b64encode(crc32c.digest()).decode(), path)
+"""
+
+
+def checksum_files(kubernetes_client, pod_name, namespace, directory, parallelism=16, crc32c=False, timeout=3600):
+    """
+    Compute checksums of all files under a directory inside a pod in one exec session.
+
+    The checksums are computed by parallel processes in the pod, so no file
+    content crosses the network. MD5 is computed with md5sum; with crc32c the
+    files are hashed by CHECKSUM_SCRIPT instead, which also yields the CRC32C
+    that composite GCS objects are verified against.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to exec into the pod.
+        pod_name (str): Name of the pod.
+        namespace (str): Namespace of the pod.
+        directory (str): Directory to checksum.
+        parallelism (int): Number of concurrent checksum processes inside the pod.
+        crc32c (bool): Also compute CRC32C; needs python3 with google-crc32c or crcmod in the pod.
+        timeout (int): Maximum time in seconds for the exec session.
+
+    Returns:
+        dict: File path relative to the directory -> {"md5": hex digest} plus "crc32c"
+              (base64 big-endian digest) when requested.
+
+    Raises:
+        RuntimeError: If the checksum run fails.
+    """
+    hasher = f"python3 -c {shlex.quote(CHECKSUM_SCRIPT)}" if crc32c else "md5sum"
+    script = (f"cd {shlex.quote(directory)} && find . -type f -printf '%P\\0' "
+              f"| xargs -0 -r -P {parallelism} -n 64 {hasher}")
+    logger.info(f"Computing checksums of files in '{directory}' on pod '{pod_name}' with {parallelism} workers...")
+    start_time = time.monotonic()
+    result = kubernetes_client.exec_in_pod(pod_name, namespace, ["/bin/sh", "-c", script], timeout=timeout)
+    if result["exit_code"] != 0:
+        raise RuntimeError(f"Computing checksums in '{directory}' on pod '{pod_name}' failed: "
+                           f"{result['error'] or result['stderr'].strip()}")
+
+    checksums = {}
+    for line in result["stdout"].splitlines():
+        if crc32c:
+            md5, crc, path = line.split(" ", 2)
+            checksums[path] = {"md5": md5, "crc32c": crc}
+        else:
+            md5, path = line.split("  ", 1)
+            checksums[path] = {"md5": md5}
+    logger.info(f"Computed {len(checksums)} checksums in {time.monotonic() - start_time:.1f}s.")
+    return checksums
+
+def remove_directory(kubernetes_client, pod_name, namespace, directory, timeout=600):
+    """
+    Remove a directory and everything under it from inside a pod.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to exec into the pod.
+        pod_name (str): Name of the pod.
+        namespace (str): Namespace of the pod.
+        directory (str): Directory to remove; a missing directory is not an error.
+        timeout (int): Maximum time in seconds for the exec session.
+
+    Raises:
+        RuntimeError: If the removal fails.
+    """
+    start_time = time.monotonic()
+    command = ["/bin/sh", "-c", f"rm -rf {shlex.quote(directory)}"]
+    result = kubernetes_client.exec_in_pod(pod_name, namespace, command, timeout=timeout)
+    if result["exit_code"] != 0:
+        raise RuntimeError(f"Removing '{directory}' on pod '{pod_name}' failed: "
+                           f"{result['error'] or result['stderr'].strip()}")
+    logger.info(f"Removed '{directory}' on pod '{pod_name}' in {time.monotonic() - start_time:.1f}s.")
@@ -0,0 +1,139 @@
+import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
+from google.cloud import storage
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+# Up to this many expected files, parallel per-object lookups are cheaper than
+# listing the whole prefix.
+TARGETED_LOOKUP_THRESHOLD = 200
+
+# Objects requested per page when listing a bucket prefix.
+LIST_PAGE_SIZE = 1000
+
+
+def _iter_objects(storage_client, bucket_name, prefix, fields):
+    """
+    Stream (name relative to prefix, blob) pairs for a bucket prefix, one page at a time,
+    skipping folder placeholder objects.
+    """
+    blobs = storage_client.list_blobs(
+        bucket_name, prefix=prefix or None, page_size=LIST_PAGE_SIZE, fields=f"items({fields}),nextPageToken"
+    )
+    for page in blobs.pages:
+        for blob in page:
+            name = blob.name[len(prefix):]
+            if name and not name.endswith("/"):
+                yield name, blob
+
+
+def compare_with_bucket(bucket_name, expected_files, prefix="", mode="auto", max_workers=32, storage_client=None):
+    """
+    Compare a set of files and their sizes against the objects in a GCS bucket.
+
+    In "list" mode the prefix is listed once, page by page, and compared as a set
+    difference. In "lookup" mode each expected object is fetched with parallel
+    metadata requests; this cannot detect extra objects. "auto" picks lookup for
+    small file sets and list otherwise.
+
+    Args:
+        bucket_name (str): Name of the GCS bucket.
+        expected_files (dict): Object name (relative to prefix) -> expected size in bytes.
+        prefix (str): Object name prefix the files live under.
+        mode (str): "auto", "list" or "lookup".
+        max_workers (int): Concurrent metadata requests in lookup mode.
+        storage_client (storage.Client): Client to use; a new one is created if not given.
+
+    Returns:
+        dict: Comparison with keys "mode", "checked", "missing" (names), "extra" (names,
+              list mode only) and "size_mismatch" (tuples of name, expected size, actual size).
+    """
+    storage_client = storage_client or storage.Client()
+    if mode == "auto":
+        mode = "lookup" if len(expected_files) <= TARGETED_LOOKUP_THRESHOLD else "list"
+    if mode not in ("list", "lookup"):
+        raise ValueError(f"Invalid mode: {mode}. Use 'auto', 'list' or 'lookup'.")
+
+    logger.info(f"Comparing {len(expected_files)} files against gs://{bucket_name}/{prefix} using {mode} mode...")
+    start_time = time.monotonic()
+    remaining = dict(expected_files)
+    result = {"mode": mode, "checked": len(expected_files), "missing": [], "extra": [], "size_mismatch": []}
+
+    if mode == "list":
+        for name, blob in _iter_objects(storage_client, bucket_name, prefix, "name,size"):
+            expected_size = remaining.pop(name, None)
+            if expected_size is None:
+                result["extra"].append(name)
+            elif blob.size != expected_size:
+                result["size_mismatch"].append((name, expected_size, blob.size))
+        result["missing"] = sorted(remaining)
+    else:
+        bucket = storage_client.bucket(bucket_name)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gcs-lookup") as executor:
+            blobs = executor.map(lambda name: bucket.get_blob(prefix + name), remaining)
+            for (name, expected_size), blob in zip(remaining.items(), blobs):
+                if blob is None:
+                    result["missing"].append(name)
+                elif blob.size != expected_size:
+                    result["size_mismatch"].append((name, expected_size, blob.size))
+
+    logger.info(
+        f"Compared against gs://{bucket_name}/{prefix} in {time.monotonic() - start_time:.1f}s: "
+        f"{len(result['missing'])} missing, {len(result['extra'])} extra, "
+        f"{len(result['size_mismatch'])} size mismatches."
+    )
+    return result
+
+
+def compare_checksums(bucket_name, checksums, prefix="", storage_client=None):
+    """
+    Compare checksums computed in a pod with the checksums stored in GCS object metadata.
+
+    Only object metadata is read, so no file content is transferred. Regular
+    objects are compared on their md5Hash. Composite objects carry only a
+    CRC32C; they are compared on it when the entry has one and are reported as
+    unverified otherwise.
+
+    Args:
+        bucket_name (str): Name of the GCS bucket.
+        checksums (dict): Object name (relative to prefix) -> {"md5": hex digest, "crc32c": base64
+                          big-endian digest (optional)}, as returned by checksum_files().
+        prefix (str): Object name prefix the files live under.
+        storage_client (storage.Client): Client to use; a new one is created if not given.
+
+    Returns:
+        dict: Comparison with keys "verified" (count), "mismatch" (tuples of name, local checksum,
+              GCS checksum), "unverified" (composite objects without a local CRC32C) and "missing"
+              (names not in the bucket).
+    """
+    storage_client = storage_client or storage.Client()
+    logger.info(f"Comparing {len(checksums)} checksums against gs://{bucket_name}/{prefix} object metadata...")
+    start_time = time.monotonic()
+    remaining = dict(checksums)
+    result = {"verified": 0, "mismatch": [], "unverified": [], "missing": []}
+
+    for name, blob in _iter_objects(storage_client, bucket_name, prefix, "name,md5Hash,crc32c"):
+        local = remaining.pop(name, None)
+        if local is None:
+            continue
+        if blob.md5_hash:
+            local_checksum, gcs_checksum = local["md5"], base64.b64decode(blob.md5_hash).hex()
+        elif local.get("crc32c"):
+            local_checksum, gcs_checksum = local["crc32c"], blob.crc32c
+        else:
+            result["unverified"].append(name)
+            continue
+        if local_checksum == gcs_checksum:
+            result["verified"] += 1
+        else:
+            result["mismatch"].append((name, local_checksum, gcs_checksum))
+    result["missing"] = sorted(remaining)
+
+    logger.info(
+        f"Checksums compared in {time.monotonic() - start_time:.1f}s: {result['verified']} verified, "
+        f"{len(result['mismatch'])} mismatched, {len(result['unverified'])} unverified, "
+        f"{len(result['missing'])} missing."
+    )
+    return result
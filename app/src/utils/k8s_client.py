@@ -1,13 +1,185 @@
-import tomli
-from kubernetes import client, config
+import json
+import time
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes import client, config, watch
+from kubernetes.client.rest import ApiException
+from kubernetes.stream import stream
 from kubernetes.client.configuration import Configuration
 from kubernetes.client.api_client import ApiClient
 from src.utils.logging_util import get_logger
+from src.utils.config_util import load_config
 import urllib3
-import base64
 
 logger = get_logger(__name__)
 
+# Number of objects requested per page when listing pods.
+LIST_PAGE_SIZE = 500
+
+# Accept header asking the API server for PartialObjectMetadata instead of full objects.
+PARTIAL_METADATA_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"
+
+# Rollout steps tracked by wait_for_deployment_rollout, in the order they are
+# expected to complete. Each check receives the deployment and the target count.
+ROLLOUT_STEPS = (
+    ("observed", lambda d, n: (d.status.observed_generation or 0) >= (d.metadata.generation or 0)),
+    ("updated", lambda d, n: (d.status.updated_replicas or 0) == n),
+    ("ready", lambda d, n: (d.status.ready_replicas or 0) == n),
+    ("available", lambda d, n: (d.status.available_replicas or 0) == n and (d.status.replicas or 0) == n),
+)
+
+class PodInformer:
+    """
+    Local cache of the pods in a namespace, kept current by a list followed by a watch.
+
+    Pods are indexed by label, node and phase so lookups do not hit the API server.
+    """
+
+    def __init__(self, core_api, namespace):
+        """
+        Initializes the informer. Call start() to begin syncing.
+
+        Args:
+            core_api (CoreV1Api): Client used for the list and watch calls.
+            namespace (str): Namespace to cache pods for.
+        """
+        self.core_api = core_api
+        self.namespace = namespace
+        self.pods = {}  # Pod name -> V1Pod
+        self.label_index = {}  # (label key, label value) -> set of pod names
+        self.node_index = {}  # Node name -> set of pod names
+        self.phase_index = {}  # Pod phase -> set of pod names
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    def start(self, timeout=60):
+        """
+        Start the background list/watch thread and wait for the initial list.
+
+        Args:
+            timeout (int): Maximum time in seconds to wait for the initial sync.
+        """
+        self._thread = threading.Thread(target=self._run, name=f"pod-informer-{self.namespace}", daemon=True)
+        self._thread.start()
+        if not self._synced.wait(timeout):
+            raise RuntimeError(f"Pod informer for namespace '{self.namespace}' did not sync within {timeout} seconds.")
+        logger.info(f"Pod informer for namespace '{self.namespace}' synced with {len(self.pods)} pods.")
+
+    def stop(self):
+        """
+        Stop the background watch.
+        """
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    def _index_keys(self, pod):
+        labels = pod.metadata.labels or {}
+        return (
+            [(self.label_index, item) for item in labels.items()]
+            + [(self.node_index, pod.spec.node_name), (self.phase_index, pod.status.phase)]
+        )
+
+    def _add(self, pod):
+        name = pod.metadata.name
+        self._remove(name)
+        self.pods[name] = pod
+        for index, key in self._index_keys(pod):
+            index.setdefault(key, set()).add(name)
+
+    def _remove(self, name):
+        pod = self.pods.pop(name, None)
+        if pod is None:
+            return
+        for index, key in self._index_keys(pod):
+            names = index.get(key)
+            names.discard(name)
+            if not names:
+                del index[key]
+
+    def _relist(self):
+        pods, continue_token = [], None
+        while True:
+            pod_list = self.core_api.list_namespaced_pod(
+                namespace=self.namespace, limit=LIST_PAGE_SIZE, _continue=continue_token
+            )
+            pods.extend(pod_list.items)
+            continue_token = pod_list.metadata._continue
+            if not continue_token:
+                break
+        with self._lock:
+            self.pods, self.label_index, self.node_index, self.phase_index = {}, {}, {}, {}
+            for pod in pods:
+                self._add(pod)
+        self._synced.set()
+        return pod_list.metadata.resource_version
+
+    def _run(self):
+        resource_version = None
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._relist()
+                self._watch = watch.Watch()
+                for event in self._watch.stream(
+                    self.core_api.list_namespaced_pod,
+                    namespace=self.namespace,
+                    resource_version=resource_version,
+                    timeout_seconds=300,
+                ):
+                    pod = event["object"]
+                    resource_version = pod.metadata.resource_version
+                    with self._lock:
+                        if event["type"] == "DELETED":
+                            self._remove(pod.metadata.name)
+                        else:
+                            self._add(pod)
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info(f"Pod watch in namespace '{self.namespace}' expired, re-listing.")
+                    resource_version = None
+                else:
+                    logger.warning(f"Pod watch in namespace '{self.namespace}' failed, retrying: {e}")
+                    self._stopped.wait(1)
+            except Exception as e:
+                logger.warning(f"Pod watch in namespace '{self.namespace}' interrupted, resuming: {e}")
+                self._stopped.wait(1)
+
+    def list_pods(self, label_selector=None, node_name=None, phase=None):
+        """
+        Return cached pods matching all of the given filters.
+
+        Args:
+            label_selector (str): Equality-based selector, e.g. "app=nginx,tier=web".
+            node_name (str): Only return pods scheduled on this node.
+            phase (str): Only return pods in this phase, e.g. "Running".
+
+        Returns:
+            list: Matching V1Pod objects, sorted by name.
+        """
+        with self._lock:
+            keys = []
+            if label_selector:
+                for requirement in label_selector.split(","):
+                    key, _, value = requirement.partition("=")
+                    keys.append((self.label_index, (key.strip(), value.strip())))
+            if node_name is not None:
+                keys.append((self.node_index, node_name))
+            if phase is not None:
+                keys.append((self.phase_index, phase))
+
+            if not keys:
+                names = set(self.pods)
+            else:
+                names = set.intersection(*(index.get(key, set()) for index, key in keys))
+            return [self.pods[name] for name in sorted(names)]
+
+
 class KubernetesClient:
     """
     Utility class to set up and provide Kubernetes API clients.
@@ -20,35 +192,15 @@ class KubernetesClient:
         Args:
             config_file (str): Path to the configuration file.
         """
-        self.config = self._load_config(config_file)
+        self.config = load_config(config_file)
         self.k8s_config = {}
         self.api_clients = {}  # Cache for API clients
+        self._exec_apis = queue.SimpleQueue()  # Idle CoreV1Api clients reserved for exec streams
+        self._pooled_api_clients = []  # Every ApiClient created, for pool statistics
+        self.pod_informers = {}  # Namespace -> PodInformer
         self._initialize_client()
         self.api_clients = {}
 
-    def _load_config(self, config_file):
-        """
-        Load the configuration from the given TOML file.
-
-        Args:
-            config_file (str): Path to the configuration file.
-
-        Returns:
-            dict: Parsed configuration data.
-        """
-        logger.info(f"Loading configuration from {config_file}...")
-        try:
-            with open(config_file, "rb") as file:
-                config_data = tomli.load(file)
-                logger.info("Configuration loaded successfully.")
-                return config_data
-        except FileNotFoundError:
-            logger.error(f"Configuration file not found: {config_file}.")
-            raise
-        except Exception as e:
-            logger.exception(f"Failed to load configuration: {e}")
-            raise
-
     def _initialize_client(self):
         """
         Initializes the Kubernetes client based on the configuration.
@@ -57,7 +209,7 @@ class KubernetesClient:
             logger.info("Initializing Kubernetes client...")
 
             # Load Kubernetes configuration
-            config_mode = self.config.get("k8s", {}).get("config_mode", "local")
+            config_mode = self.config.k8s.config_mode
             if config_mode == "local":
                 logger.debug("Loading kubeconfig for local setup.")
                 config.load_kube_config()
@@ -69,9 +221,9 @@ class KubernetesClient:
                 raise ValueError(f"Invalid config_mode: {config_mode}. Use 'local' or 'in-cluster'.")
 
             # Get proxy configuration from the settings
-            http_proxy = self.config.get("proxy", {}).get("http_proxy")
-            https_proxy = self.config.get("proxy", {}).get("https_proxy")
-            verify_ssl = self.config.get("proxy", {}).get("verify_ssl", False)
+            http_proxy = self.config.proxy.http_proxy
+            https_proxy = self.config.proxy.https_proxy
+            verify_ssl = self.config.proxy.verify_ssl
 
             # Get the default Kubernetes configuration
             self.k8s_config = Configuration.get_default_copy()
@@ -80,25 +232,27 @@ class KubernetesClient:
             logger.info(f"Using CA certificate: { self.k8s_config.ssl_ca_cert}")
 
             # Configure SSL verification
-            self.k8s_config.verify_ssl = True
+            self.k8s_config.verify_ssl = verify_ssl
             logger.info(f"SSL verification set to: {verify_ssl}")
 
-            # Initialize the ApiClient with the configuration
-            self.api_client = ApiClient(configuration = self.k8s_config)
-
-            # Set the proxy in the ApiClient if provided
-            if http_proxy:
+            # Set the proxy on the configuration so every ApiClient (and exec websocket) uses it.
+            # The API server is reached over HTTPS, so https_proxy takes precedence.
+            if https_proxy:
                 logger.info(f"Configuring HTTPS proxy: {https_proxy}")
-                self.api_client.rest_client.pool_manager = urllib3.ProxyManager(
-                    proxy_url = https_proxy,
-                    cert_reqs = "CERT_REQUIRED" if verify_ssl else "CERT_NONE",
-                )
+                self.k8s_config.proxy = https_proxy
             elif http_proxy:
                 logger.info(f"Configuring HTTP proxy: {http_proxy}")
-                self.api_client.rest_client.pool_manager = urllib3.ProxyManager(
-                    proxy_url = http_proxy,
-                    cert_reqs = "CERT_REQUIRED" if verify_ssl else "CERT_NONE",
-                )
+                self.k8s_config.proxy = http_proxy
+
+            # Size the per-host connection pool for fan-out operations
+            self.k8s_config.connection_pool_maxsize = self.config.connection.pool_maxsize
+            logger.info(
+                f"Connection pool: maxsize={self.config.connection.pool_maxsize}, "
+                f"block={self.config.connection.pool_block}, tcp_keepalive={self.config.connection.tcp_keepalive}"
+            )
+
+            # Initialize the ApiClient with the configuration
+            self.api_client = self._new_api_client()
 
             # Initialize the Kubernetes API client
             # self.client = client.AppsV1Api(api_client)
@@ -108,6 +262,47 @@ class KubernetesClient:
             logger.exception(f"Failed to initialize Kubernetes client: {e}")
             raise
 
+    def _new_api_client(self):
+        """
+        Create an ApiClient whose connection pool follows the [connection] settings.
+
+        Returns:
+            ApiClient: New API client sharing the Kubernetes configuration.
+        """
+        api_client = ApiClient(configuration=self.k8s_config)
+        pool_kw = api_client.rest_client.pool_manager.connection_pool_kw
+        pool_kw["block"] = self.config.connection.pool_block
+        if self.config.connection.tcp_keepalive:
+            pool_kw["socket_options"] = urllib3.connection.HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        self._pooled_api_clients.append(api_client)
+        return api_client
+
+    def pool_stats(self):
+        """
+        Summarize connection pool utilization across all API clients.
+
+        Returns:
+            dict: Per API host, the pool "maxsize", "connections" opened, "requests" sent,
+                  connections currently "in_use" and "requests_per_connection".
+        """
+        stats = {}
+        for api_client in self._pooled_api_clients:
+            pools = api_client.rest_client.pool_manager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                host = stats.setdefault(
+                    f"{pool.scheme}://{pool.host}:{pool.port}",
+                    {"maxsize": pool.pool.maxsize, "connections": 0, "requests": 0, "in_use": 0},
+                )
+                host["connections"] += pool.num_connections
+                host["requests"] += pool.num_requests
+                host["in_use"] += pool.pool.maxsize - pool.pool.qsize()
+        for host in stats.values():
+            host["requests_per_connection"] = round(host["requests"] / max(host["connections"], 1), 1)
+        return stats
+
     def get_client(self, api_type):
         """
         Retrieve the specified Kubernetes API client.
@@ -124,7 +319,324 @@ class KubernetesClient:
                 self.api_clients[api_type] = client.AppsV1Api(self.api_client)
             elif api_type == "CoreV1Api":
                 self.api_clients[api_type] = client.CoreV1Api(self.api_client)
+            elif api_type == "VersionApi":
+                self.api_clients[api_type] = client.VersionApi(self.api_client)
             else:
                 logger.error(f"Unsupported API client type: {api_type}")
                 raise ValueError(f"Unsupported API client type: {api_type}")
-        return self.api_clients[api_type]
\ No newline at end of file
+        return self.api_clients[api_type]
+
+    def get_pod_informer(self, namespace):
+        """
+        Retrieve the pod informer for a namespace, starting it on first use.
+
+        Args:
+            namespace (str): Namespace to cache pods for.
+
+        Returns:
+            PodInformer: Synced informer for the namespace.
+        """
+        if namespace not in self.pod_informers:
+            logger.info(f"Starting pod informer for namespace: {namespace}")
+            informer = PodInformer(client.CoreV1Api(self._new_api_client()), namespace)
+            informer.start()
+            self.pod_informers[namespace] = informer
+        return self.pod_informers[namespace]
+
+    def list_pods(self, namespace, label_selector=None, node_name=None, phase=None):
+        """
+        List pods from the namespace's informer cache instead of the API server.
+
+        Args:
+            namespace (str): Namespace of the pods.
+            label_selector (str): Equality-based selector, e.g. "app=nginx".
+            node_name (str): Only return pods scheduled on this node.
+            phase (str): Only return pods in this phase, e.g. "Running".
+
+        Returns:
+            list: Matching V1Pod objects, sorted by name.
+        """
+        return self.get_pod_informer(namespace).list_pods(label_selector, node_name, phase)
+
+    def iter_pods(self, namespace, label_selector=None, field_selector=None, metadata_only=False,
+                  page_size=LIST_PAGE_SIZE):
+        """
+        Iterate over pods page by page using limit/continue pagination.
+
+        Only one page is held in memory at a time, so memory stays flat as the
+        number of pods grows.
+
+        Args:
+            namespace (str): Namespace of the pods.
+            label_selector (str): Label selector, e.g. "app=nginx".
+            field_selector (str): Field selector, e.g. "status.phase=Running" or "spec.nodeName=node-1".
+            metadata_only (bool): Fetch PartialObjectMetadata (name, labels, owners, ...)
+                                  as plain dicts instead of full V1Pod objects.
+            page_size (int): Number of pods requested per page.
+
+        Yields:
+            V1Pod or dict: Full pods, or metadata-only dicts when metadata_only is set.
+        """
+        core_api = self.get_client("CoreV1Api")
+        continue_token = None
+        while True:
+            if metadata_only:
+                query_params = [("limit", page_size)]
+                for name, value in (("labelSelector", label_selector), ("fieldSelector", field_selector),
+                                    ("continue", continue_token)):
+                    if value:
+                        query_params.append((name, value))
+                response = self.api_client.call_api(
+                    "/api/v1/namespaces/{namespace}/pods", "GET",
+                    path_params={"namespace": namespace},
+                    query_params=query_params,
+                    header_params={"Accept": PARTIAL_METADATA_ACCEPT},
+                    auth_settings=["BearerToken"],
+                    _return_http_data_only=True,
+                    _preload_content=False,
+                )
+                page = json.loads(response.data)
+                items = page.get("items") or []
+                continue_token = page["metadata"].get("continue")
+            else:
+                page = core_api.list_namespaced_pod(
+                    namespace=namespace,
+                    label_selector=label_selector,
+                    field_selector=field_selector,
+                    limit=page_size,
+                    _continue=continue_token,
+                )
+                items = page.items
+                continue_token = page.metadata._continue
+
+            logger.debug(f"Fetched page of {len(items)} pods in namespace '{namespace}'.")
+            yield from items
+            if not continue_token:
+                return
+
+    def iter_events(self, namespace, field_selector=None, page_size=LIST_PAGE_SIZE):
+        """
+        Iterate over events page by page using limit/continue pagination.
+
+        Args:
+            namespace (str): Namespace of the events.
+            field_selector (str): Field selector, e.g. "involvedObject.kind=Pod".
+            page_size (int): Number of events requested per page.
+
+        Yields:
+            CoreV1Event: Events in the namespace.
+        """
+        core_api = self.get_client("CoreV1Api")
+        continue_token = None
+        while True:
+            page = core_api.list_namespaced_event(
+                namespace=namespace,
+                field_selector=field_selector,
+                limit=page_size,
+                _continue=continue_token,
+            )
+            logger.debug(f"Fetched page of {len(page.items)} events in namespace '{namespace}'.")
+            yield from page.items
+            continue_token = page.metadata._continue
+            if not continue_token:
+                return
+
+    def close(self):
+        """
+        Stop all background informers.
+        """
+        for informer in self.pod_informers.values():
+            informer.stop()
+        self.pod_informers = {}
+
+    def wait_for_deployment_rollout(self, deployment_name, namespace, replicas, timeout):
+        """
+        Wait until a deployment has rolled out the given number of replicas.
+
+        Uses the watch API instead of fixed-interval polling, so it returns as soon
+        as the rollout completes. The watch resumes from the last seen resourceVersion
+        when the connection drops, and re-lists when that version has expired (410).
+
+        Args:
+            deployment_name (str): Name of the deployment.
+            namespace (str): Namespace of the deployment.
+            replicas (int): Desired number of available replicas.
+            timeout (int): Maximum time to wait in seconds.
+
+        Returns:
+            dict: Seconds elapsed until each rollout step in ROLLOUT_STEPS completed.
+
+        Raises:
+            RuntimeError: If the rollout does not complete within the timeout.
+        """
+        apps_api = self.get_client("AppsV1Api")
+        field_selector = f"metadata.name={deployment_name}"
+        start_time = time.monotonic()
+        durations = {}
+        resource_version = None
+
+        def record_progress(deployment):
+            status = deployment.status
+            logger.debug(
+                f"Deployment '{deployment_name}': replicas={status.replicas}, updated={status.updated_replicas}, "
+                f"ready={status.ready_replicas}, available={status.available_replicas}"
+            )
+            for step, check in ROLLOUT_STEPS:
+                if step not in durations and check(deployment, replicas):
+                    durations[step] = round(time.monotonic() - start_time, 3)
+                    logger.info(f"Deployment '{deployment_name}' rollout step '{step}' completed after {durations[step]}s.")
+            return all(check(deployment, replicas) for _, check in ROLLOUT_STEPS)
+
+        logger.info(f"Waiting for deployment '{deployment_name}' to roll out {replicas} replicas...")
+        while time.monotonic() - start_time < timeout:
+            if resource_version is None:
+                deployments = apps_api.list_namespaced_deployment(namespace=namespace, field_selector=field_selector)
+                if not deployments.items:
+                    raise RuntimeError(f"Deployment '{deployment_name}' not found in namespace '{namespace}'.")
+                resource_version = deployments.metadata.resource_version
+                if record_progress(deployments.items[0]):
+                    return durations
+
+            remaining = max(1, int(timeout - (time.monotonic() - start_time)))
+            w = watch.Watch()
+            try:
+                for event in w.stream(
+                    apps_api.list_namespaced_deployment,
+                    namespace=namespace,
+                    field_selector=field_selector,
+                    resource_version=resource_version,
+                    timeout_seconds=remaining,
+                ):
+                    deployment = event["object"]
+                    resource_version = deployment.metadata.resource_version
+                    if event["type"] == "DELETED":
+                        raise RuntimeError(f"Deployment '{deployment_name}' was deleted during rollout.")
+                    if record_progress(deployment):
+                        w.stop()
+                        logger.info(f"Deployment '{deployment_name}' successfully rolled out {replicas} replicas.")
+                        return durations
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                logger.info(f"Watch on deployment '{deployment_name}' expired, re-listing.")
+                resource_version = None
+            except urllib3.exceptions.HTTPError as e:
+                logger.warning(f"Watch on deployment '{deployment_name}' interrupted, resuming: {e}")
+
+        logger.error(f"Deployment '{deployment_name}' did not scale to {replicas} replicas within {timeout} seconds.")
+        raise RuntimeError(f"Deployment '{deployment_name}' did not scale to {replicas} replicas within {timeout} seconds.")
+
+    def set_deployment_env(self, deployment_name, namespace, env):
+        """
+        Set environment variables on the first container of a deployment.
+
+        Variables already present are updated in place and new ones appended; the
+        pod template change triggers a rollout.
+
+        Args:
+            deployment_name (str): Name of the deployment.
+            namespace (str): Namespace of the deployment.
+            env (dict or list): Variable name -> value to set, or a complete env list
+                                (e.g. one returned earlier) to restore as is.
+
+        Returns:
+            list: The container's previous env entries, suitable for restoring them.
+        """
+        apps_api = self.get_client("AppsV1Api")
+        deployment = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+        container = deployment.spec.template.spec.containers[0]
+        previous = self.api_client.sanitize_for_serialization(container.env or [])
+
+        if isinstance(env, dict):
+            updated = [entry for entry in previous if entry["name"] not in env]
+            updated += [{"name": name, "value": str(value)} for name, value in env.items()]
+        else:
+            updated = env
+        logger.info(f"Setting env on container '{container.name}' of deployment '{deployment_name}': {env}")
+        apps_api.patch_namespaced_deployment(
+            name=deployment_name,
+            namespace=namespace,
+            body=[{"op": "add", "path": "/spec/template/spec/containers/0/env", "value": updated}],
+        )
+        return previous
+
+    def _acquire_exec_api(self):
+        """
+        Take an idle CoreV1Api reserved for exec streams, creating one if none is free.
+
+        kubernetes.stream.stream swaps out ApiClient.request for the duration of
+        the call, so concurrent exec sessions must not share an ApiClient.
+
+        Returns:
+            CoreV1Api: Client for the exclusive use of the caller until released.
+        """
+        try:
+            return self._exec_apis.get_nowait()
+        except queue.Empty:
+            return client.CoreV1Api(self._new_api_client())
+
+    def exec_in_pod(self, pod_name, namespace, command, timeout=None):
+        """
+        Run a command in a pod and collect its exit status, output and latency.
+
+        Args:
+            pod_name (str): Name of the pod.
+            namespace (str): Namespace of the pod.
+            command (list): Command to execute, e.g. ["/bin/sh", "-c", "ls /data"].
+            timeout (int): Maximum time in seconds to wait for the command.
+
+        Returns:
+            dict: Result with keys "pod", "exit_code", "stdout", "stderr", "latency" and "error".
+                  "exit_code" is None if the command timed out or could not be started.
+        """
+        timeout = timeout or self.config.exec.timeout
+        result = {"pod": pod_name, "exit_code": None, "stdout": "", "stderr": "", "latency": None, "error": None}
+        start_time = time.monotonic()
+        core_api = self._acquire_exec_api()
+        try:
+            resp = stream(
+                core_api.connect_get_namespaced_pod_exec,
+                name=pod_name,
+                namespace=namespace,
+                command=command,
+                stderr=True, stdin=False, stdout=True, tty=False,
+                _preload_content=False,
+            )
+            resp.run_forever(timeout=timeout)
+            if resp.is_open():
+                resp.close()
+                result["error"] = f"Timed out after {timeout} seconds."
+            else:
+                result["exit_code"] = resp.returncode
+            result["stdout"] = resp.read_stdout()
+            result["stderr"] = resp.read_stderr()
+        except Exception as e:
+            result["error"] = str(e)
+        finally:
+            self._exec_apis.put(core_api)
+        result["latency"] = round(time.monotonic() - start_time, 3)
+        logger.debug(f"Exec in pod '{pod_name}' finished: exit_code={result['exit_code']}, latency={result['latency']}s")
+        return result
+
+    def exec_in_pods(self, pod_names, namespace, command, max_workers=None, timeout=None):
+        """
+        Run the same command across many pods with bounded concurrency.
+
+        Args:
+            pod_names (list): Names of the pods to run the command in.
+            namespace (str): Namespace of the pods.
+            command (list): Command to execute in every pod.
+            max_workers (int): Maximum number of concurrent exec sessions.
+            timeout (int): Per-pod timeout in seconds.
+
+        Returns:
+            list: One exec_in_pod result dict per pod, in the order of pod_names.
+        """
+        max_workers = max_workers or self.config.exec.max_workers
+        logger.info(f"Running {command} in {len(pod_names)} pods with up to {max_workers} concurrent sessions...")
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pod-exec") as executor:
+            results = list(executor.map(lambda pod_name: self.exec_in_pod(pod_name, namespace, command, timeout), pod_names))
+        failed = sum(1 for result in results if result["exit_code"] != 0)
+        logger.info(f"Exec finished in {time.monotonic() - start_time:.1f}s: {len(results) - failed} succeeded, {failed} failed.")
+        return results
@@ -1,5 +1,5 @@
 import logging
-import tomli  # For parsing TOML configuration files
+from src.utils.config_util import load_config
 
 
 def load_logging_config(config_file="config/settings.toml"):
@@ -13,12 +13,10 @@ def load_logging_config(config_file="config/settings.toml"):
         str: The log level specified in the configuration file.
     """
     try:
-        with open(config_file, "rb") as file:
-            config = tomli.load(file)
-        return config.get("logging", {}).get("level", "INFO")  # Default to INFO
-    except Exception as e:
+        return load_config(config_file).logging.log_level
+    except FileNotFoundError as e:
         print(f"Failed to load logging configuration: {e}")
-        return "INFO"  # Fallback to INFO if config fails
+        return "INFO"  # Fallback to INFO if the config file is missing
 
 
 def get_logger(name: str, config_file="config/settings.toml"):
@@ -0,0 +1,181 @@
+import functools
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from google.cloud import monitoring_v3
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+IOPS_METRIC = "parallelstore.googleapis.com/instance/read_ops_count"
+THROUGHPUT_METRIC = "parallelstore.googleapis.com/instance/transferred_byte_count"
+
+
+@functools.lru_cache(maxsize=None)
+def get_metric_client():
+    """
+    Return the process-wide Cloud Monitoring client.
+
+    Returns:
+        monitoring_v3.MetricServiceClient: Shared client instance.
+    """
+    return monitoring_v3.MetricServiceClient()
+
+
+def instance_filter(instance_id):
+    """
+    Build the resource filter selecting one Parallelstore instance.
+
+    Args:
+        instance_id (str): Parallelstore instance name.
+
+    Returns:
+        str: Cloud Monitoring filter expression.
+    """
+    return f'resource.type="parallelstore.googleapis.com/Instance" AND resource.label.instance_id="{instance_id}"'
+
+
+def summarize_rates(points):
+    """
+    Summarize a rate time series.
+
+    The rate itself is aligned and summed server-side (see MetricsCollector.query_rate),
+    but the summary over time is computed here. Cloud Monitoring's percentile reducers
+    (REDUCE_PERCENTILE_50) combine series at each aligned timestamp rather than over
+    time, and its percentile aligners only accept distribution metrics, so neither can
+    give the median of the summed rate of a delta counter like read_ops_count.
+
+    Args:
+        points (list): (timestamp, rate) tuples.
+
+    Returns:
+        dict: "points" plus the "sustained" (mean), "p50" and "peak" rate, or None values
+              when the series is empty.
+    """
+    values = [value for _, value in points]
+    return {
+        "points": points,
+        "sustained": statistics.fmean(values) if values else None,
+        "p50": statistics.median(values) if values else None,
+        "peak": max(values) if values else None,
+    }
+
+
+class MetricsCollector:
+    """
+    Collects rate-aligned Cloud Monitoring metrics for an exact time window.
+    """
+
+    def __init__(self, project_id, client=None, alignment_period=60):
+        """
+        Initializes the collector.
+
+        Args:
+            project_id (str): Project to query.
+            client (MetricServiceClient): Client to use, e.g. one replaying recorded responses.
+                                          Defaults to the shared client.
+            alignment_period (int): Width in seconds of each aligned rate point.
+        """
+        self.project_id = project_id
+        self.client = client or get_metric_client()
+        self.alignment_period = alignment_period
+
+    def query_rate(self, metric_type, resource_filter, start_time, end_time):
+        """
+        Query a counter metric as a per-second rate summed across all matching series.
+
+        The rate is computed server-side with ALIGN_RATE and REDUCE_SUM, so delta
+        counters such as read_ops_count are returned as ops/s rather than raw counts.
+
+        Args:
+            metric_type (str): Metric type, e.g. IOPS_METRIC.
+            resource_filter (str): Resource filter, e.g. from instance_filter().
+            start_time (float): Window start as a Unix timestamp.
+            end_time (float): Window end as a Unix timestamp.
+
+        Returns:
+            dict: Rate summary as returned by summarize_rates().
+        """
+        request = monitoring_v3.ListTimeSeriesRequest(
+            name=f"projects/{self.project_id}",
+            filter=f'metric.type="{metric_type}" AND {resource_filter}',
+            interval=monitoring_v3.TimeInterval(
+                start_time={"seconds": int(start_time)},
+                end_time={"seconds": int(end_time)},
+            ),
+            aggregation=monitoring_v3.Aggregation(
+                alignment_period={"seconds": self.alignment_period},
+                per_series_aligner=monitoring_v3.Aggregation.Aligner.ALIGN_RATE,
+                cross_series_reducer=monitoring_v3.Aggregation.Reducer.REDUCE_SUM,
+            ),
+            view=monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
+        )
+        result = self.client.list_time_series(request=request)
+        points = sorted(
+            (point.interval.end_time.timestamp(), point.value.double_value)
+            for series in result for point in series.points
+        )
+        summary = summarize_rates(points)
+        logger.info(
+            f"{metric_type}: {len(points)} points, sustained={summary['sustained']}, "
+            f"p50={summary['p50']}, peak={summary['peak']} per second"
+        )
+        return summary
+
+    def collect(self, metrics, resource_filter, start_time, end_time):
+        """
+        Query several metrics for the same window concurrently through the shared client.
+
+        Args:
+            metrics (dict): Result name -> metric type.
+            resource_filter (str): Resource filter applied to every metric.
+            start_time (float): Window start as a Unix timestamp.
+            end_time (float): Window end as a Unix timestamp.
+
+        Returns:
+            dict: Result name -> rate summary.
+        """
+        logger.info(f"Collecting {len(metrics)} metrics for window {int(start_time)}-{int(end_time)}...")
+        with ThreadPoolExecutor(max_workers=len(metrics), thread_name_prefix="metrics") as executor:
+            futures = {
+                name: executor.submit(self.query_rate, metric_type, resource_filter, start_time, end_time)
+                for name, metric_type in metrics.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def collect_settled(self, metrics, resource_filter, start_time, end_time, timeout=300, poll_interval=30):
+        """
+        Like collect(), but wait until every metric has ingested points up to the end of the window.
+
+        Parallelstore metrics take a few minutes to become visible, so a window that
+        just ended would otherwise come back empty or cut short. Metrics are queried
+        every poll_interval seconds until each has a point within one alignment period
+        of end_time, or until the timeout runs out.
+
+        Args:
+            metrics (dict): Result name -> metric type.
+            resource_filter (str): Resource filter applied to every metric.
+            start_time (float): Window start as a Unix timestamp.
+            end_time (float): Window end as a Unix timestamp.
+            timeout (float): Maximum seconds to wait for ingestion.
+            poll_interval (float): Seconds between queries.
+
+        Returns:
+            dict: Result name -> rate summary; possibly incomplete if the timeout ran out.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            rates = self.collect(metrics, resource_filter, start_time, end_time)
+            pending = [
+                name for name, summary in rates.items()
+                if not summary["points"] or summary["points"][-1][0] < end_time - self.alignment_period
+            ]
+            if not pending:
+                return rates
+            if time.monotonic() + poll_interval > deadline:
+                logger.warning(f"Cloud Monitoring data for {', '.join(pending)} still incomplete after {timeout}s; "
+                               f"using what has been ingested.")
+                return rates
+            logger.info(f"Waiting {poll_interval}s for Cloud Monitoring to ingest {', '.join(pending)} "
+                        f"up to {int(end_time)}...")
+            time.sleep(poll_interval)
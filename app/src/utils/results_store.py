@@ -0,0 +1,320 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+# Direction in which a metric improves, used by the baseline gate
+HIGHER_IS_BETTER = "higher"
+LOWER_IS_BETTER = "lower"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scenario TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    passed INTEGER,
+    config TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_fingerprint ON runs (scenario, fingerprint, id);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+"""
+
+
+def config_fingerprint(config):
+    """
+    Return a short, stable hash of a configuration.
+
+    Args:
+        config (dict): JSON-serializable settings that make runs comparable.
+
+    Returns:
+        str: First 12 hex digits of the SHA-256 of the canonical JSON.
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def read_run_metrics(rates, client_latency, rollout):
+    """
+    Flatten the measurements of one read perf run into the metrics stored for it.
+
+    Args:
+        rates (dict): "iops" and "throughput" (bytes/s) summaries as returned by MetricsCollector.collect().
+        client_latency (dict): Client-side summary as returned by summarize_client_latency().
+        rollout (dict): Rollout step -> seconds, as returned by wait_for_deployment_rollout().
+
+    Returns:
+        dict: Metric name -> value; IOPS and MB/s (sustained, p50, peak), client ops/s and
+              latency percentiles in ms, and time to each rollout step in seconds.
+    """
+    def to_ms(seconds):
+        return seconds * 1000 if seconds is not None else None
+
+    def to_mbps(bytes_per_s):
+        return bytes_per_s / (1024 * 1024) if bytes_per_s is not None else None
+
+    return {
+        **{f"iops_{stat}": rates["iops"][stat] for stat in ("sustained", "p50", "peak")},
+        **{f"throughput_mbps_{stat}": to_mbps(rates["throughput"][stat]) for stat in ("sustained", "p50", "peak")},
+        "client_ops_per_s": client_latency["ops_per_s"],
+        "client_p50_ms": to_ms(client_latency["p50"]),
+        "client_p99_ms": to_ms(client_latency["p99"]),
+        "client_p999_ms": to_ms(client_latency["p999"]),
+        **{f"time_to_{step}_s": seconds for step, seconds in rollout.items()},
+    }
+
+
+class ResultsStore:
+    """
+    Append-only store of perf runs and their metrics in a local SQLite file.
+    """
+
+    def __init__(self, path):
+        """
+        Opens the store, creating the file and schema if needed.
+
+        Args:
+            path (str): Path of the SQLite file, or ":memory:".
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+    def record_run(self, scenario, metrics, config, fingerprint=None, passed=None, started_at=None):
+        """
+        Append one run.
+
+        Args:
+            scenario (str): Name of the scenario that produced the run.
+            metrics (dict): Metric name -> value (None for metrics that could not be measured).
+            config (dict): Settings and environment of the run, stored as JSON.
+            fingerprint (str): Fingerprint of the settings that make runs comparable;
+                               defaults to the fingerprint of the whole config.
+            passed (bool): Whether the run passed its gate.
+            started_at (float): Unix timestamp of the run; defaults to now.
+
+        Returns:
+            int: Id of the new run.
+        """
+        fingerprint = fingerprint or config_fingerprint(config)
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (scenario, fingerprint, started_at, passed, config) VALUES (?, ?, ?, ?, ?)",
+                (scenario, fingerprint, started_at or time.time(), None if passed is None else int(passed),
+                 json.dumps(config, sort_keys=True, default=str)),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, name, value) for name, value in metrics.items()],
+            )
+        logger.info(f"Recorded run {run_id} of '{scenario}' (fingerprint {fingerprint}) in {self.path}.")
+        return run_id
+
+    def get_run(self, run_id):
+        """
+        Read one run with its metrics.
+
+        Args:
+            run_id (int): Id of the run.
+
+        Returns:
+            dict: "id", "scenario", "fingerprint", "started_at", "passed", "config" and "metrics".
+
+        Raises:
+            KeyError: If there is no such run.
+        """
+        row = self.connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No run with id {run_id} in {self.path}.")
+        metrics = self.connection.execute("SELECT name, value FROM metrics WHERE run_id = ? ORDER BY name", (run_id,))
+        return {
+            "id": row["id"],
+            "scenario": row["scenario"],
+            "fingerprint": row["fingerprint"],
+            "started_at": row["started_at"],
+            "passed": None if row["passed"] is None else bool(row["passed"]),
+            "config": json.loads(row["config"]),
+            "metrics": {name: value for name, value in metrics},
+        }
+
+    def list_runs(self, scenario=None, limit=20):
+        """
+        List the most recent runs, newest first, without their metrics.
+
+        Args:
+            scenario (str): Only list runs of this scenario.
+            limit (int): Maximum number of runs.
+
+        Returns:
+            list: Dicts with "id", "scenario", "fingerprint", "started_at" and "passed".
+        """
+        query = "SELECT id, scenario, fingerprint, started_at, passed FROM runs"
+        params = ()
+        if scenario:
+            query += " WHERE scenario = ?"
+            params = (scenario,)
+        rows = self.connection.execute(query + " ORDER BY id DESC LIMIT ?", params + (limit,))
+        return [dict(row) for row in rows]
+
+    def baseline_values(self, scenario, fingerprint, metric, window, before_run=None):
+        """
+        Values of a metric over the most recent passing runs with the same fingerprint.
+
+        Args:
+            scenario (str): Scenario name.
+            fingerprint (str): Fingerprint of comparable runs.
+            metric (str): Metric name.
+            window (int): Maximum number of runs.
+            before_run (int): Only consider runs older than this id.
+
+        Returns:
+            list: Metric values, newest first; runs where the metric is missing are skipped.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT m.value FROM runs r JOIN metrics m ON m.run_id = r.id
+            WHERE r.scenario = ? AND r.fingerprint = ? AND r.passed = 1 AND m.name = ?
+                  AND m.value IS NOT NULL AND r.id < ?
+            ORDER BY r.id DESC LIMIT ?
+            """,
+            (scenario, fingerprint, metric, before_run or sys.maxsize, window),
+        )
+        return [value for (value,) in rows]
+
+
+def evaluate_against_baseline(store, scenario, fingerprint, metrics, directions, window=10, min_runs=3,
+                              sigma=3.0, tolerance=0.1):
+    """
+    Compare a run's metrics with the rolling baseline of earlier comparable runs.
+
+    A metric fails when it is worse than the baseline mean by more than
+    max(sigma * stdev, tolerance * mean), in the metric's direction. With fewer
+    than min_runs baseline runs the metric is not judged yet.
+
+    Args:
+        store (ResultsStore): Store holding earlier runs.
+        scenario (str): Scenario name.
+        fingerprint (str): Fingerprint of comparable runs.
+        metrics (dict): Metric name -> value of the current run.
+        directions (dict): Gated metric name -> HIGHER_IS_BETTER or LOWER_IS_BETTER.
+        window (int): Number of recent passing runs forming the baseline.
+        min_runs (int): Baseline runs needed before a metric is judged.
+        sigma (float): Allowed deviation in baseline standard deviations.
+        tolerance (float): Minimum allowed deviation as a fraction of the baseline mean.
+
+    Returns:
+        dict: Metric -> "value", "runs", "mean", "stdev", "threshold" and "ok" (None when not judged).
+    """
+    verdicts = {}
+    for metric, direction in directions.items():
+        value = metrics.get(metric)
+        history = store.baseline_values(scenario, fingerprint, metric, window)
+        verdict = {"value": value, "runs": len(history), "mean": None, "stdev": None, "threshold": None, "ok": None}
+        if len(history) >= min_runs:
+            mean = statistics.fmean(history)
+            stdev = statistics.stdev(history) if len(history) > 1 else 0.0
+            margin = max(sigma * stdev, tolerance * abs(mean))
+            threshold = mean - margin if direction == HIGHER_IS_BETTER else mean + margin
+            ok = value is not None and (value >= threshold if direction == HIGHER_IS_BETTER else value <= threshold)
+            verdict.update(mean=mean, stdev=stdev, threshold=threshold, ok=ok)
+        verdicts[metric] = verdict
+        logger.info(
+            f"Baseline check '{metric}': value={value}, baseline runs={verdict['runs']}, mean={verdict['mean']}, "
+            f"threshold={verdict['threshold']} -> {'not judged' if verdict['ok'] is None else 'ok' if verdict['ok'] else 'REGRESSION'}"
+        )
+    return verdicts
+
+
+def diff_runs(store, run_a, run_b):
+    """
+    Compare the metrics of two runs.
+
+    Args:
+        store (ResultsStore): Store holding both runs.
+        run_a (int): Id of the reference run.
+        run_b (int): Id of the run to compare.
+
+    Returns:
+        list: (metric, value in a, value in b, absolute change, relative change in percent) tuples;
+              changes are None where a value is missing or zero.
+    """
+    a, b = store.get_run(run_a)["metrics"], store.get_run(run_b)["metrics"]
+    rows = []
+    for metric in sorted(set(a) | set(b)):
+        value_a, value_b = a.get(metric), b.get(metric)
+        change = value_b - value_a if value_a is not None and value_b is not None else None
+        percent = 100 * change / value_a if change is not None and value_a else None
+        rows.append((metric, value_a, value_b, change, percent))
+    return rows
+
+
+def _format(value):
+    return "-" if value is None else f"{value:.4g}"
+
+
+def main(argv=None):
+    """
+    Command line entry point: python -m src.utils.results_store {list,show,diff} ...
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.utils.results_store", description="Inspect stored perf runs.")
+    parser.add_argument("--db", help="Results file; defaults to results.path in config/settings.toml.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="List recent runs.")
+    list_parser.add_argument("--scenario")
+    list_parser.add_argument("--limit", type=int, default=20)
+    show_parser = subparsers.add_parser("show", help="Show one run as JSON.")
+    show_parser.add_argument("run", type=int)
+    diff_parser = subparsers.add_parser("diff", help="Compare the metrics of two runs.")
+    diff_parser.add_argument("run_a", type=int)
+    diff_parser.add_argument("run_b", type=int)
+    args = parser.parse_args(argv)
+
+    if args.db is None:
+        from src.utils.config_util import load_config
+        args.db = load_config().results.path
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "list":
+            for run in store.list_runs(args.scenario, args.limit):
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"]))
+                passed = {None: "-", 0: "FAIL", 1: "pass"}[run["passed"]]
+                print(f"{run['id']:>5}  {started}  {passed:<4}  {run['fingerprint']}  {run['scenario']}")
+        elif args.command == "show":
+            print(json.dumps(store.get_run(args.run), indent=2))
+        else:
+            config_a, config_b = store.get_run(args.run_a), store.get_run(args.run_b)
+            if config_a["fingerprint"] != config_b["fingerprint"]:
+                print(f"Note: runs have different fingerprints ({config_a['fingerprint']} vs {config_b['fingerprint']}).")
+            print(f"{'metric':<32} {f'run {args.run_a}':>12} {f'run {args.run_b}':>12} {'change':>12} {'%':>8}")
+            for metric, value_a, value_b, change, percent in diff_runs(store, args.run_a, args.run_b):
+                print(f"{metric:<32} {_format(value_a):>12} {_format(value_b):>12} {_format(change):>12} "
+                      f"{'-' if percent is None else f'{percent:+.1f}':>8}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+import re
+import time
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+OP_LATENCY_METRIC = "parallelstore_op_latency_seconds"
+
+# One sample line of the Prometheus text format: name{labels} value
+SAMPLE_PATTERN = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})?\s+(?P<value>\S+)')
+LABEL_PATTERN = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_histogram(text, metric_name, labels=None):
+    """
+    Extract one histogram from a Prometheus text exposition, summing across label sets.
+
+    Args:
+        text (str): Body of a /metrics response.
+        metric_name (str): Histogram name without the _bucket/_count/_sum suffix.
+        labels (dict): Only include samples carrying these label values, e.g. {"op": "write"}.
+
+    Returns:
+        dict: "buckets" (upper bound -> cumulative count), "count" and "sum".
+    """
+    histogram = {"buckets": {}, "count": 0.0, "sum": 0.0}
+    for line in text.splitlines():
+        if not line.startswith(metric_name):
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        if not match:
+            continue
+        name, value = match.group("name"), float(match.group("value"))
+        sample_labels = dict(LABEL_PATTERN.findall(match.group("labels") or ""))
+        if labels and any(sample_labels.get(key) != wanted for key, wanted in labels.items()):
+            continue
+        if name == f"{metric_name}_bucket":
+            upper_bound = float(sample_labels["le"])
+            histogram["buckets"][upper_bound] = histogram["buckets"].get(upper_bound, 0.0) + value
+        elif name == f"{metric_name}_count":
+            histogram["count"] += value
+        elif name == f"{metric_name}_sum":
+            histogram["sum"] += value
+    return histogram
+
+
+def parse_counter(text, metric_name, labels=None):
+    """
+    Extract a counter from a Prometheus text exposition, summing across label sets.
+
+    Args:
+        text (str): Body of a /metrics response.
+        metric_name (str): Counter name including the _total suffix.
+        labels (dict): Only include samples carrying these label values, e.g. {"op": "read"}.
+
+    Returns:
+        float: Sum of the matching samples, 0 if there are none.
+    """
+    total = 0.0
+    for line in text.splitlines():
+        if not line.startswith(metric_name):
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        if not match or match.group("name") != metric_name:
+            continue
+        sample_labels = dict(LABEL_PATTERN.findall(match.group("labels") or ""))
+        if labels and any(sample_labels.get(key) != wanted for key, wanted in labels.items()):
+            continue
+        total += float(match.group("value"))
+    return total
+
+
+def _bucket_increments(histogram):
+    """
+    Return the observations per bucket (upper bound -> count) of a cumulative histogram.
+
+    Buckets whose cumulative count does not change may be left out of an exposition,
+    so increments are what can safely be added up across histograms with different bounds.
+    """
+    increments, previous = {}, 0.0
+    for upper_bound, count in sorted(histogram["buckets"].items()):
+        increments[upper_bound] = count - previous
+        previous = count
+    return increments
+
+
+def _cumulative(increments):
+    """
+    Turn per-bucket increments back into cumulative bucket counts.
+    """
+    buckets, total = {}, 0.0
+    for upper_bound, increment in sorted(increments.items()):
+        total += increment
+        buckets[upper_bound] = total
+    return buckets
+
+
+def merge_histograms(histograms):
+    """
+    Add histograms together, also when they expose different bucket bounds.
+
+    Args:
+        histograms (iterable): Histograms as returned by parse_histogram().
+
+    Returns:
+        dict: Merged histogram.
+    """
+    increments = {}
+    merged = {"buckets": {}, "count": 0.0, "sum": 0.0}
+    for histogram in histograms:
+        for upper_bound, increment in _bucket_increments(histogram).items():
+            increments[upper_bound] = increments.get(upper_bound, 0.0) + increment
+        merged["count"] += histogram["count"]
+        merged["sum"] += histogram["sum"]
+    merged["buckets"] = _cumulative(increments)
+    return merged
+
+
+def subtract_histogram(after, before):
+    """
+    Return the observations recorded between two snapshots of the same histogram.
+
+    A counter reset (e.g. a restarted pod) is treated as starting from zero.
+    """
+    if after["count"] < before["count"]:
+        return after
+    increments = _bucket_increments(after)
+    for upper_bound, increment in _bucket_increments(before).items():
+        increments[upper_bound] = increments.get(upper_bound, 0.0) - increment
+    return {
+        "buckets": _cumulative(increments),
+        "count": after["count"] - before["count"],
+        "sum": after["sum"] - before["sum"],
+    }
+
+
+def histogram_quantile(quantile, histogram):
+    """
+    Estimate a quantile from cumulative buckets by linear interpolation,
+    in the same way as PromQL's histogram_quantile().
+
+    Args:
+        quantile (float): Quantile between 0 and 1.
+        histogram (dict): Histogram as returned by parse_histogram().
+
+    Returns:
+        float: Estimated value, or None if the histogram is empty.
+    """
+    buckets = sorted(histogram["buckets"].items())
+    if not buckets or buckets[-1][1] <= 0:
+        return None
+    rank = quantile * buckets[-1][1]
+    lower_bound, lower_count = 0.0, 0.0
+    for upper_bound, count in buckets:
+        if count >= rank:
+            if math.isinf(upper_bound):
+                return lower_bound
+            if count == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = upper_bound, count
+    return buckets[-1][0]
+
+
+async def _fetch_direct(pod_ip, port, timeout):
+    """
+    Fetch /metrics straight from a pod IP with a minimal HTTP/1.0 request.
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(pod_ip, port), timeout)
+    try:
+        writer.write(f"GET /metrics HTTP/1.0\r\nHost: {pod_ip}:{port}\r\n\r\n".encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    header, _, body = response.partition(b"\r\n\r\n")
+    status_line = header.split(b"\r\n", 1)[0].decode()
+    if " 200 " not in f"{status_line} ":
+        raise RuntimeError(f"Unexpected response from {pod_ip}:{port}: {status_line}")
+    return body.decode()
+
+
+async def _scrape_all(kubernetes_client, namespace, pods, port, mode, concurrency, timeout):
+    """
+    Scrape every pod with at most `concurrency` requests in flight.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    core_api = kubernetes_client.get_client("CoreV1Api")
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scrape") as executor:
+        async def scrape(pod):
+            async with semaphore:
+                try:
+                    if mode == "pod_ip":
+                        return pod.metadata.name, await _fetch_direct(pod.status.pod_ip, port, timeout)
+                    return pod.metadata.name, await loop.run_in_executor(
+                        executor,
+                        lambda: core_api.connect_get_namespaced_pod_proxy_with_path(
+                            f"{pod.metadata.name}:{port}", namespace, "metrics", _request_timeout=timeout
+                        ),
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to scrape pod '{pod.metadata.name}': {e}")
+                    return pod.metadata.name, None
+
+        return dict(await asyncio.gather(*(scrape(pod) for pod in pods)))
+
+
+def scrape_pods(kubernetes_client, namespace, pods, port=7001, mode="proxy", concurrency=64, timeout=10):
+    """
+    Fetch /metrics from many pods concurrently.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used for the API-server proxy.
+        namespace (str): Namespace of the pods.
+        pods (list): V1Pod objects to scrape.
+        port (int): Port the metrics endpoint listens on.
+        mode (str): "pod_ip" to connect to pod IPs directly (runner inside the cluster
+                    network) or "proxy" to go through the API-server pod proxy.
+        concurrency (int): Maximum number of requests in flight.
+        timeout (int): Per-pod timeout in seconds.
+
+    Returns:
+        dict: Pod name -> response body, or None if the scrape failed.
+    """
+    if mode not in ("pod_ip", "proxy"):
+        raise ValueError(f"Invalid scrape mode: {mode}. Use 'pod_ip' or 'proxy'.")
+    start_time = time.monotonic()
+    bodies = asyncio.run(_scrape_all(kubernetes_client, namespace, pods, port, mode, concurrency, timeout))
+    failed = sum(1 for body in bodies.values() if body is None)
+    logger.info(f"Scraped {len(bodies) - failed}/{len(bodies)} pods in {time.monotonic() - start_time:.1f}s ({mode} mode).")
+    return bodies
+
+
+def snapshot_histograms(kubernetes_client, namespace, pods, metric_name=OP_LATENCY_METRIC, labels=None, **scrape_options):
+    """
+    Scrape a histogram from every pod.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used for the API-server proxy.
+        namespace (str): Namespace of the pods.
+        pods (list): V1Pod objects to scrape.
+        metric_name (str): Histogram to extract.
+        labels (dict): Label values to select, passed on to parse_histogram().
+        **scrape_options: Passed on to scrape_pods().
+
+    Returns:
+        dict: "time" of the snapshot and "histograms" (pod name -> histogram) for pods that responded.
+    """
+    bodies = scrape_pods(kubernetes_client, namespace, pods, **scrape_options)
+    return {
+        "time": time.time(),
+        "histograms": {pod: parse_histogram(body, metric_name, labels) for pod, body in bodies.items() if body is not None},
+    }
+
+
+def summarize_client_latency(before, after):
+    """
+    Merge per-pod histogram deltas between two snapshots into cluster-wide client-side figures.
+
+    Args:
+        before (dict): Earlier result of snapshot_histograms().
+        after (dict): Later result of snapshot_histograms().
+
+    Returns:
+        dict: "pods" merged, "ops" observed, "ops_per_s" and the "p50", "p99" and "p999"
+              latency in seconds.
+    """
+    deltas = [
+        subtract_histogram(histogram, before["histograms"][pod])
+        for pod, histogram in after["histograms"].items() if pod in before["histograms"]
+    ]
+    merged = merge_histograms(deltas)
+    elapsed = max(after["time"] - before["time"], 1e-3)
+    summary = {
+        "pods": len(deltas),
+        "ops": merged["count"],
+        "ops_per_s": merged["count"] / elapsed,
+        "p50": histogram_quantile(0.5, merged),
+        "p99": histogram_quantile(0.99, merged),
+        "p999": histogram_quantile(0.999, merged),
+    }
+    logger.info(
+        f"Client-side latency over {elapsed:.0f}s from {summary['pods']} pods: {summary['ops_per_s']:.1f} ops/s, "
+        f"p50={summary['p50']}s, p99={summary['p99']}s, p999={summary['p999']}s"
+    )
+    return summary
@@ -0,0 +1,195 @@
+import math
+import statistics
+from collections import defaultdict
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+# Startup phases in the order a pod goes through them. Pod conditions and events
+# carry second-resolution timestamps, so each phase is accurate to about a second.
+#   scheduling:      pod created -> PodScheduled
+#   volume_attach:   PodScheduled -> SuccessfulAttachVolume (only for drivers that attach)
+#   volume_mount:    scheduled/attached -> PodReadyToStartContainers, i.e. CSI NodeStage and
+#                    NodePublish plus sandbox creation, which the kubelet only starts once
+#                    all volumes are mounted
+#   image_pull:      first Pulling -> last Pulled event (0 when the image was already present)
+#   container_start: sandbox ready / image pulled -> container started
+#   readiness:       container started -> ContainersReady
+#   total:           pod created -> Ready
+PHASES = ("scheduling", "volume_attach", "volume_mount", "image_pull", "container_start", "readiness", "total")
+
+# Conditions set once the pod sandbox exists; PodHasNetwork is the pre-1.29 name
+SANDBOX_CONDITIONS = ("PodReadyToStartContainers", "PodHasNetwork")
+MOUNT_FAILURE_REASONS = ("FailedMount", "FailedAttachVolume")
+
+
+def _condition_times(pod):
+    """
+    Return condition type -> time it last became True, as Unix timestamps.
+    """
+    return {
+        condition.type: condition.last_transition_time.timestamp()
+        for condition in pod.status.conditions or []
+        if condition.status == "True" and condition.last_transition_time
+    }
+
+
+def _event_times(event):
+    """
+    Return the (first, last) Unix timestamps of a possibly aggregated event.
+    """
+    first = event.first_timestamp or event.event_time or event.metadata.creation_timestamp
+    last = event.last_timestamp or first
+    return first.timestamp(), last.timestamp()
+
+
+def _elapsed(start, end):
+    """
+    Seconds between two timestamps, or None if either is unknown.
+    """
+    if start is None or end is None:
+        return None
+    return max(end - start, 0.0)
+
+
+def _pod_timeline(pod, events):
+    """
+    Compute the startup phases of one pod from its conditions, container status and events.
+    """
+    conditions = _condition_times(pod)
+    created = pod.metadata.creation_timestamp.timestamp()
+    scheduled = conditions.get("PodScheduled")
+    sandbox_ready = next((conditions[name] for name in SANDBOX_CONDITIONS if name in conditions), None)
+
+    attached = pulling = pulled = created_container = None
+    mount_failures = 0
+    for event in events:
+        first, last = _event_times(event)
+        if event.reason == "SuccessfulAttachVolume":
+            attached = max(attached or first, first)
+        elif event.reason == "Pulling":
+            pulling = min(pulling or first, first)
+        elif event.reason == "Pulled":
+            pulled = max(pulled or last, last)
+        elif event.reason == "Created":
+            created_container = min(created_container or first, first)
+        elif event.reason in MOUNT_FAILURE_REASONS:
+            mount_failures += event.count or 1
+
+    # Without the sandbox condition, the first image or container event marks the end of the mount
+    if sandbox_ready is None:
+        sandbox_ready = min((t for t in (pulling, pulled, created_container) if t is not None), default=None)
+
+    started = None
+    for status in pod.status.container_statuses or []:
+        if status.state and status.state.running and status.state.running.started_at:
+            started = max(started or 0.0, status.state.running.started_at.timestamp())
+
+    return {
+        "pod": pod.metadata.name,
+        "node": pod.spec.node_name,
+        "mount_failures": mount_failures,
+        "phases": {
+            "scheduling": _elapsed(created, scheduled),
+            "volume_attach": _elapsed(scheduled, attached),
+            "volume_mount": _elapsed(max(filter(None, (scheduled, attached)), default=None), sandbox_ready),
+            "image_pull": _elapsed(pulling, pulled) if pulling is not None else (0.0 if sandbox_ready else None),
+            "container_start": _elapsed(max(filter(None, (sandbox_ready, pulled)), default=None), started),
+            "readiness": _elapsed(started, conditions.get("ContainersReady")),
+            "total": _elapsed(created, conditions.get("Ready")),
+        },
+    }
+
+
+def collect_startup_timelines(kubernetes_client, namespace, label_selector, since=None):
+    """
+    Collect the startup phases of every pod of a rollout from pod conditions and events.
+
+    Events expire (by default after an hour), so this should run soon after the rollout.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to list pods and events.
+        namespace (str): Namespace of the pods.
+        label_selector (str): Selects the pods, e.g. "app=ps-perf".
+        since (float): Only include pods created at or after this Unix time, e.g. when scaling started.
+
+    Returns:
+        list: One dict per pod with "pod", "node", "mount_failures" and "phases" (phase -> seconds or None).
+    """
+    pods = [
+        pod for pod in kubernetes_client.list_pods(namespace, label_selector=label_selector)
+        # Creation timestamps are truncated to the second
+        if since is None or pod.metadata.creation_timestamp.timestamp() >= math.floor(since)
+    ]
+    uids = {pod.metadata.uid for pod in pods}
+    events_by_pod = defaultdict(list)
+    for event in kubernetes_client.iter_events(namespace, field_selector="involvedObject.kind=Pod"):
+        if event.involved_object.uid in uids:
+            events_by_pod[event.involved_object.uid].append(event)
+    logger.info(f"Collected {sum(len(events) for events in events_by_pod.values())} events for {len(pods)} pods.")
+    return [_pod_timeline(pod, events_by_pod[pod.metadata.uid]) for pod in pods]
+
+
+def _percentile(sorted_values, quantile):
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    return sorted_values[max(math.ceil(quantile * len(sorted_values)) - 1, 0)]
+
+
+def summarize_startup(timelines, max_outliers=20):
+    """
+    Compute per-phase latency distributions and the nodes where pods start slowest.
+
+    A node is an outlier for a phase when the median of its pods is above the
+    fleet-wide p95 of that phase.
+
+    Args:
+        timelines (list): Pod timelines as returned by collect_startup_timelines().
+        max_outliers (int): Maximum number of node outliers to report, slowest first.
+
+    Returns:
+        dict: "pods", "phases" (phase -> count, p50, p95 and max in seconds), "mount_failures",
+              "pods_with_mount_failures" and "node_outliers" (node, phase, pods, median_s, fleet_p95_s).
+    """
+    summary = {
+        "pods": len(timelines),
+        "phases": {},
+        "mount_failures": sum(timeline["mount_failures"] for timeline in timelines),
+        "pods_with_mount_failures": sum(1 for timeline in timelines if timeline["mount_failures"]),
+        "node_outliers": [],
+    }
+    for phase in PHASES:
+        values = sorted(t["phases"][phase] for t in timelines if t["phases"][phase] is not None)
+        summary["phases"][phase] = {
+            "count": len(values),
+            "p50": _percentile(values, 0.5) if values else None,
+            "p95": _percentile(values, 0.95) if values else None,
+            "max": values[-1] if values else None,
+        }
+        if not values:
+            continue
+        by_node = defaultdict(list)
+        for timeline in timelines:
+            if timeline["phases"][phase] is not None:
+                by_node[timeline["node"]].append(timeline["phases"][phase])
+        fleet_p95 = summary["phases"][phase]["p95"]
+        summary["node_outliers"] += [
+            {"node": node, "phase": phase, "pods": len(node_values),
+             "median_s": statistics.median(node_values), "fleet_p95_s": fleet_p95}
+            for node, node_values in by_node.items() if statistics.median(node_values) > fleet_p95
+        ]
+    summary["node_outliers"].sort(key=lambda outlier: outlier["median_s"] - outlier["fleet_p95_s"], reverse=True)
+    del summary["node_outliers"][max_outliers:]
+
+    for phase, stats in summary["phases"].items():
+        if stats["count"]:
+            logger.info(f"Startup phase '{phase}' over {stats['count']} pods: "
+                        f"p50={stats['p50']:.1f}s, p95={stats['p95']:.1f}s, max={stats['max']:.1f}s")
+    if summary["mount_failures"]:
+        logger.warning(f"{summary['mount_failures']} mount/attach failure events on "
+                       f"{summary['pods_with_mount_failures']} pods.")
+    for outlier in summary["node_outliers"]:
+        logger.info(f"Slow node '{outlier['node']}' in '{outlier['phase']}': median {outlier['median_s']:.1f}s "
+                    f"over {outlier['pods']} pods (fleet p95 {outlier['fleet_p95_s']:.1f}s)")
+    return summary
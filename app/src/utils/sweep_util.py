@@ -0,0 +1,176 @@
+import csv
+import itertools
+import json
+import os
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+# Metrics plotted on the scaling curve, in column order
+CURVE_METRICS = ("iops_sustained", "throughput_mbps_sustained", "client_ops_per_s", "client_p99_ms")
+
+
+def parse_values(text, value_type=int):
+    """
+    Parse a comma-separated list of step parameters, e.g. "500, 1000, 5000".
+
+    Args:
+        text (str): Comma-separated values.
+        value_type (type): Type to convert each value to.
+
+    Returns:
+        list: Parsed values in the given order.
+    """
+    return [value_type(value.strip()) for value in text.split(",") if value.strip()]
+
+
+def sweep_points(replicas, file_sizes_mb):
+    """
+    Build the sweep matrix of replica counts and file sizes.
+
+    Points are grouped by file size so the data set only has to be reseeded
+    once per size. Replica counts ascend in the first group and then alternate
+    direction, so each group starts at the replica count the previous one
+    ended at and the deployment is never scaled from the largest count back
+    to the smallest between groups.
+
+    Args:
+        replicas (iterable): Replica counts to measure.
+        file_sizes_mb (iterable): File sizes in MB to measure.
+
+    Returns:
+        list: Points as {"file_size_mb": int, "replicas": int} dicts.
+    """
+    replica_counts = sorted(set(replicas))
+    return [
+        {"file_size_mb": file_size_mb, "replicas": replica_count}
+        for group, file_size_mb in enumerate(sorted(set(file_sizes_mb)))
+        for replica_count in (replica_counts if group % 2 == 0 else reversed(replica_counts))
+    ]
+
+
+def run_sweep(points, run_point):
+    """
+    Measure every point of a sweep, continuing past points that fail.
+
+    Args:
+        points (list): Points as returned by sweep_points().
+        run_point (callable): Called with a point, returns its metrics dict.
+
+    Returns:
+        list: One dict per point with the point's keys, "metrics" (None if it failed) and "error".
+    """
+    results = []
+    for number, point in enumerate(points, 1):
+        logger.info(f"Sweep point {number}/{len(points)}: {point}")
+        try:
+            results.append({**point, "metrics": run_point(point), "error": None})
+        except Exception as e:
+            logger.error(f"Sweep point {point} failed: {e}")
+            results.append({**point, "metrics": None, "error": str(e)})
+    return results
+
+
+def scaling_curve(results, metrics=CURVE_METRICS):
+    """
+    Turn sweep results into scaling-curve rows.
+
+    Besides the raw metrics, each row carries IOPS per replica and the scaling
+    efficiency: IOPS per replica relative to the smallest replica count measured
+    with the same file size (1.0 is linear scaling).
+
+    Args:
+        results (list): Results as returned by run_sweep().
+        metrics (iterable): Metric names to include.
+
+    Returns:
+        list: Rows sorted by file size and replicas.
+    """
+    rows = []
+    for file_size_mb, group in itertools.groupby(
+        sorted(results, key=lambda result: (result["file_size_mb"], result["replicas"])),
+        key=lambda result: result["file_size_mb"],
+    ):
+        reference = None
+        for result in group:
+            values = result["metrics"] or {}
+            row = {"file_size_mb": file_size_mb, "replicas": result["replicas"]}
+            row.update({metric: values.get(metric) for metric in metrics})
+            iops = values.get("iops_sustained")
+            row["iops_per_replica"] = iops / result["replicas"] if iops is not None else None
+            if reference is None and row["iops_per_replica"]:
+                reference = row["iops_per_replica"]
+            row["scaling_efficiency"] = (
+                row["iops_per_replica"] / reference if reference and row["iops_per_replica"] is not None else None
+            )
+            row["error"] = result["error"]
+            rows.append(row)
+    return rows
+
+
+def write_scaling_curve(rows, path_prefix):
+    """
+    Write scaling-curve rows as CSV (for spreadsheets and plotting) and JSON.
+
+    Args:
+        rows (list): Rows as returned by scaling_curve().
+        path_prefix (str): Output path without extension.
+
+    Returns:
+        list: Paths of the written files.
+    """
+    if os.path.dirname(path_prefix):
+        os.makedirs(os.path.dirname(path_prefix), exist_ok=True)
+    csv_path, json_path = f"{path_prefix}.csv", f"{path_prefix}.json"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["file_size_mb", "replicas"])
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(json_path, "w") as f:
+        json.dump(rows, f, indent=2)
+    for row in rows:
+        logger.info(
+            f"{row['file_size_mb']} MB files, {row['replicas']} replicas: IOPS={row.get('iops_sustained')}, "
+            f"MB/s={row.get('throughput_mbps_sustained')}, efficiency={row['scaling_efficiency']}"
+        )
+    logger.info(f"Wrote scaling curve to {csv_path} and {json_path}.")
+    return [csv_path, json_path]
+
+
+def find_knee(rows, metric="iops_sustained", min_gain=0.25):
+    """
+    Find the knee of a scaling curve: the last replica count before added replicas stop paying off.
+
+    The marginal gain of a step is the metric added per added replica, relative
+    to the metric per replica at the first step. The knee is the step before the
+    first one whose marginal gain falls below min_gain.
+
+    Args:
+        rows (list): Curve rows with "replicas" and the metric, e.g. from scaling_curve().
+        metric (str): Metric to detect saturation in.
+        min_gain (float): Marginal gain below which added replicas count as no longer adding throughput.
+
+    Returns:
+        dict: Knee "replicas" and "value" (None if the curve did not saturate or lacks data),
+              and the "marginal_gains" of every step after the first.
+    """
+    points = sorted(
+        ((row["replicas"], row[metric]) for row in rows if row.get(metric) is not None and row["replicas"] > 0),
+        key=lambda point: point[0],
+    )
+    knee = {"replicas": None, "value": None, "marginal_gains": []}
+    if len(points) < 2 or points[0][1] <= 0:
+        return knee
+    reference = points[0][1] / points[0][0]
+    for (previous_replicas, previous_value), (replicas, value) in zip(points, points[1:]):
+        if replicas == previous_replicas:
+            continue
+        gain = (value - previous_value) / (replicas - previous_replicas) / reference
+        knee["marginal_gains"].append({"replicas": replicas, "gain": gain})
+        if knee["replicas"] is None and gain < min_gain:
+            knee["replicas"], knee["value"] = previous_replicas, previous_value
+    if knee["replicas"] is None:
+        logger.info(f"No knee in '{metric}' up to {points[-1][0]} replicas; the curve is still scaling.")
+    else:
+        logger.info(f"Knee in '{metric}' at {knee['replicas']} replicas ({knee['value']:.1f}).")
+    return knee
@@ -0,0 +1,87 @@
+"""
+Unit tests for comparing Parallelstore checksums with GCS object metadata, against a fake storage client. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import base64
+import hashlib
+from types import SimpleNamespace
+
+import google_crc32c
+
+from src.utils.gcs_util import compare_checksums
+
+
+def md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+def crc32c(data):
+    return base64.b64encode(google_crc32c.Checksum(data).digest()).decode()
+
+
+class FakeStorageClient:
+    """
+    Stand-in for storage.Client over a dict of object name -> (content, composite).
+
+    Composite objects carry only a CRC32C, like objects GCS composes from parts.
+    Content is never handed out, so any attempt to download it fails.
+    """
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def list_blobs(self, bucket_name, prefix=None, page_size=None, fields=None):
+        assert "crc32c" in fields
+        blobs = [
+            SimpleNamespace(
+                name=name,
+                md5_hash=None if composite else base64.b64encode(hashlib.md5(data).digest()),
+                crc32c=crc32c(data),
+            )
+            for name, (data, composite) in sorted(self.objects.items()) if name.startswith(prefix or "")
+        ]
+        return SimpleNamespace(pages=[blobs])
+
+
+def test_regular_objects_are_checked_from_metadata():
+    client = FakeStorageClient({"a.txt": (b"alpha", False), "b.txt": (b"beta", False), "extra.txt": (b"x", False)})
+
+    result = compare_checksums("bucket", {
+        "a.txt": {"md5": md5(b"alpha")},
+        "b.txt": {"md5": md5(b"other")},
+        "gone.txt": {"md5": md5(b"")},
+    }, storage_client=client)
+
+    assert result["verified"] == 1
+    assert result["mismatch"] == [("b.txt", md5(b"other"), md5(b"beta"))]
+    assert result["missing"] == ["gone.txt"]
+    assert result["unverified"] == []
+
+
+def test_composite_objects_are_checked_on_crc32c():
+    client = FakeStorageClient({
+        "dir/big.dat": (b"composite content", True),
+        "dir/bad.dat": (b"corrupted", True),
+        "dir/small.txt": (b"small", False),
+    })
+
+    result = compare_checksums("bucket", {
+        "big.dat": {"md5": md5(b"composite content"), "crc32c": crc32c(b"composite content")},
+        "bad.dat": {"md5": md5(b"original"), "crc32c": crc32c(b"original")},
+        "small.txt": {"md5": md5(b"small"), "crc32c": crc32c(b"small")},
+    }, prefix="dir/", storage_client=client)
+
+    assert result["verified"] == 2
+    assert result["mismatch"] == [("bad.dat", crc32c(b"original"), crc32c(b"corrupted"))]
+    assert result["unverified"] == []
+
+
+def test_composite_objects_without_local_crc32c_are_unverified():
+    client = FakeStorageClient({"big.dat": (b"content", True), "small.txt": (b"small", False)})
+
+    result = compare_checksums("bucket", {"big.dat": {"md5": md5(b"content")}, "small.txt": {"md5": md5(b"small")}},
+                               storage_client=client)
+
+    assert result["verified"] == 1
+    assert result["unverified"] == ["big.dat"]
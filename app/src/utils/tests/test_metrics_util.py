@@ -0,0 +1,132 @@
+"""
+Unit tests for the Cloud Monitoring rate queries, against a fake metric client. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import pytest
+from google.cloud import monitoring_v3
+
+from src.utils import metrics_util
+from src.utils.metrics_util import MetricsCollector, summarize_rates, instance_filter, IOPS_METRIC, THROUGHPUT_METRIC
+
+START = 1_700_000_000
+END = START + 300
+
+
+def series(*points):
+    """Build a TimeSeries from (end timestamp, rate) pairs."""
+    return monitoring_v3.TimeSeries(points=[
+        monitoring_v3.Point(interval={"end_time": {"seconds": timestamp}}, value={"double_value": value})
+        for timestamp, value in points
+    ])
+
+
+class FakeMetricClient:
+    """
+    Stand-in for MetricServiceClient returning canned series per metric type.
+
+    Each entry of responses is a list of successive responses; the last one repeats.
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def list_time_series(self, request):
+        self.requests.append(request)
+        metric_type = request.filter.split('"')[1]
+        replies = self.responses[metric_type]
+        return replies.pop(0) if len(replies) > 1 else replies[0]
+
+
+def test_summarize_rates():
+    summary = summarize_rates([(1, 10.0), (2, 30.0), (3, 20.0), (4, 40.0)])
+
+    assert summary["sustained"] == 25.0
+    assert summary["p50"] == 25.0
+    assert summary["peak"] == 40.0
+
+
+def test_summarize_empty_series():
+    assert summarize_rates([]) == {"points": [], "sustained": None, "p50": None, "peak": None}
+
+
+def test_query_rate_requests_summed_rate_over_window():
+    client = FakeMetricClient({IOPS_METRIC: [[series((START + 60, 1.0))]]})
+    collector = MetricsCollector("my-project", client=client, alignment_period=60)
+
+    collector.query_rate(IOPS_METRIC, instance_filter("ps-instance"), START + 0.9, END + 0.9)
+
+    request = client.requests[0]
+    assert request.name == "projects/my-project"
+    assert request.filter == f'metric.type="{IOPS_METRIC}" AND {instance_filter("ps-instance")}'
+    assert request.interval.start_time.timestamp() == START
+    assert request.interval.end_time.timestamp() == END
+    assert request.aggregation.alignment_period.total_seconds() == 60
+    assert request.aggregation.per_series_aligner == monitoring_v3.Aggregation.Aligner.ALIGN_RATE
+    assert request.aggregation.cross_series_reducer == monitoring_v3.Aggregation.Reducer.REDUCE_SUM
+
+
+def test_query_rate_merges_and_orders_points():
+    # With REDUCE_SUM there is normally one series, but points from several are still ordered by time
+    client = FakeMetricClient({IOPS_METRIC: [[
+        series((START + 180, 300.0), (START + 60, 100.0)),
+        series((START + 120, 200.0)),
+    ]]})
+
+    summary = MetricsCollector("my-project", client=client).query_rate(IOPS_METRIC, "", START, END)
+
+    assert summary["points"] == [(START + 60, 100.0), (START + 120, 200.0), (START + 180, 300.0)]
+    assert summary["sustained"] == 200.0
+    assert summary["peak"] == 300.0
+
+
+def test_collect_queries_every_metric():
+    client = FakeMetricClient({
+        IOPS_METRIC: [[series((END, 5000.0))]],
+        THROUGHPUT_METRIC: [[series((END, 2.5e8))]],
+    })
+
+    rates = MetricsCollector("my-project", client=client).collect(
+        {"iops": IOPS_METRIC, "throughput": THROUGHPUT_METRIC}, "", START, END)
+
+    assert rates["iops"]["sustained"] == 5000.0
+    assert rates["throughput"]["sustained"] == 2.5e8
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    now = [0.0]
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(metrics_util.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(metrics_util.time, "sleep", sleep)
+    return sleeps
+
+
+def test_collect_settled_waits_for_points_up_to_window_end(sleeps):
+    client = FakeMetricClient({IOPS_METRIC: [
+        [],
+        [series((START + 60, 100.0))],
+        [series((START + 60, 100.0), (END, 100.0))],
+    ]})
+
+    rates = MetricsCollector("my-project", client=client).collect_settled(
+        {"iops": IOPS_METRIC}, "", START, END, timeout=300, poll_interval=30)
+
+    assert sleeps == [30, 30]
+    assert len(rates["iops"]["points"]) == 2
+
+
+def test_collect_settled_returns_partial_data_after_timeout(sleeps):
+    client = FakeMetricClient({IOPS_METRIC: [[series((START + 60, 100.0))]]})
+
+    rates = MetricsCollector("my-project", client=client).collect_settled(
+        {"iops": IOPS_METRIC}, "", START, END, timeout=100, poll_interval=30)
+
+    assert sleeps == [30, 30, 30]
+    assert rates["iops"]["points"] == [(START + 60, 100.0)]
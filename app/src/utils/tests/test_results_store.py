@@ -0,0 +1,126 @@
+"""
+Unit tests for the results store and its rolling-baseline gate. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import pytest
+
+from src.utils.results_store import (
+    ResultsStore,
+    evaluate_against_baseline,
+    diff_runs,
+    config_fingerprint,
+    HIGHER_IS_BETTER,
+    LOWER_IS_BETTER,
+)
+
+SCENARIO = "read_outline"
+FINGERPRINT = "abc123"
+DIRECTIONS = {"iops_sustained": HIGHER_IS_BETTER, "client_p99_ms": LOWER_IS_BETTER}
+
+
+@pytest.fixture
+def store():
+    store = ResultsStore(":memory:")
+    yield store
+    store.close()
+
+
+def record(store, passed=True, fingerprint=FINGERPRINT, scenario=SCENARIO, **metrics):
+    return store.record_run(scenario, metrics, {"replicas": 10}, fingerprint=fingerprint, passed=passed)
+
+
+def test_config_fingerprint_ignores_key_order():
+    assert config_fingerprint({"a": 1, "b": 2}) == config_fingerprint({"b": 2, "a": 1})
+    assert config_fingerprint({"a": 1}) != config_fingerprint({"a": 2})
+
+
+def test_record_and_get_run(store):
+    run_id = record(store, iops_sustained=1000.0, client_p99_ms=None)
+
+    run = store.get_run(run_id)
+
+    assert run["scenario"] == SCENARIO
+    assert run["passed"] is True
+    assert run["config"] == {"replicas": 10}
+    assert run["metrics"] == {"client_p99_ms": None, "iops_sustained": 1000.0}
+    with pytest.raises(KeyError):
+        store.get_run(run_id + 1)
+
+
+def test_metric_is_not_judged_below_min_runs(store):
+    record(store, iops_sustained=1000.0)
+    record(store, iops_sustained=1000.0)
+
+    verdicts = evaluate_against_baseline(store, SCENARIO, FINGERPRINT, {"iops_sustained": 1.0},
+                                         {"iops_sustained": HIGHER_IS_BETTER}, min_runs=3)
+
+    assert verdicts["iops_sustained"]["runs"] == 2
+    assert verdicts["iops_sustained"]["ok"] is None
+
+
+def test_baseline_gate_in_both_directions(store):
+    for iops, p99 in ((1000.0, 10.0), (1010.0, 10.1), (990.0, 9.9)):
+        record(store, iops_sustained=iops, client_p99_ms=p99)
+
+    # Baseline stdev is 10 IOPS and 0.1 ms, so the 10% tolerance sets the margin: 100 IOPS and 1 ms
+    ok = evaluate_against_baseline(store, SCENARIO, FINGERPRINT,
+                                   {"iops_sustained": 905.0, "client_p99_ms": 10.9}, DIRECTIONS)
+    regressed = evaluate_against_baseline(store, SCENARIO, FINGERPRINT,
+                                          {"iops_sustained": 895.0, "client_p99_ms": 11.1}, DIRECTIONS)
+
+    assert ok["iops_sustained"]["mean"] == 1000.0
+    assert ok["iops_sustained"]["threshold"] == pytest.approx(900.0)
+    assert ok["client_p99_ms"]["threshold"] == pytest.approx(11.0)
+    assert ok["iops_sustained"]["ok"] and ok["client_p99_ms"]["ok"]
+    assert regressed["iops_sustained"]["ok"] is False
+    assert regressed["client_p99_ms"]["ok"] is False
+
+
+def test_noisy_baseline_widens_margin_to_sigma_stdev(store):
+    for iops in (800.0, 1000.0, 1200.0):
+        record(store, iops_sustained=iops)
+
+    verdicts = evaluate_against_baseline(store, SCENARIO, FINGERPRINT, {"iops_sustained": 500.0},
+                                         {"iops_sustained": HIGHER_IS_BETTER}, sigma=2.0)
+
+    assert verdicts["iops_sustained"]["stdev"] == pytest.approx(200.0)
+    assert verdicts["iops_sustained"]["threshold"] == pytest.approx(600.0)
+    assert verdicts["iops_sustained"]["ok"] is False
+
+
+def test_missing_value_fails_a_judged_metric(store):
+    for _ in range(3):
+        record(store, iops_sustained=1000.0)
+
+    verdicts = evaluate_against_baseline(store, SCENARIO, FINGERPRINT, {}, {"iops_sustained": HIGHER_IS_BETTER})
+
+    assert verdicts["iops_sustained"]["ok"] is False
+
+
+def test_baseline_only_uses_recent_passing_comparable_runs(store):
+    record(store, iops_sustained=1.0)  # Outside the window
+    for _ in range(3):
+        record(store, iops_sustained=1000.0)
+    record(store, passed=False, iops_sustained=10.0)
+    record(store, fingerprint="other", iops_sustained=10.0)
+    record(store, scenario="write_outline", iops_sustained=10.0)
+    record(store, iops_sustained=None)
+
+    verdicts = evaluate_against_baseline(store, SCENARIO, FINGERPRINT, {"iops_sustained": 1000.0},
+                                         {"iops_sustained": HIGHER_IS_BETTER}, window=3)
+
+    assert verdicts["iops_sustained"]["runs"] == 3
+    assert verdicts["iops_sustained"]["mean"] == 1000.0
+
+
+def test_diff_runs(store):
+    run_a = record(store, iops_sustained=1000.0, client_p99_ms=10.0, only_in_a=1.0)
+    run_b = record(store, iops_sustained=1100.0, client_p99_ms=None, only_in_b=2.0)
+
+    rows = {row[0]: row[1:] for row in diff_runs(store, run_a, run_b)}
+
+    assert rows["iops_sustained"] == (1000.0, 1100.0, 100.0, 10.0)
+    assert rows["client_p99_ms"] == (10.0, None, None, None)
+    assert rows["only_in_a"] == (1.0, None, None, None)
+    assert rows["only_in_b"] == (None, 2.0, None, None)
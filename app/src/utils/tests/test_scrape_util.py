@@ -0,0 +1,128 @@
+"""
+Unit tests for parsing, merging and summarising scraped latency histograms. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import pytest
+
+from src.utils.scrape_util import (
+    parse_histogram,
+    parse_counter,
+    merge_histograms,
+    subtract_histogram,
+    histogram_quantile,
+    summarize_client_latency,
+)
+
+EXPOSITION = """\
+# HELP parallelstore_op_latency_seconds Operation latency
+# TYPE parallelstore_op_latency_seconds histogram
+parallelstore_op_latency_seconds_bucket{op="read",le="0.001"} 10.0
+parallelstore_op_latency_seconds_bucket{op="read",le="0.01"} 90.0
+parallelstore_op_latency_seconds_bucket{op="read",le="+Inf"} 100.0
+parallelstore_op_latency_seconds_count{op="read"} 100.0
+parallelstore_op_latency_seconds_sum{op="read"} 0.5
+parallelstore_op_latency_seconds_bucket{op="write",le="0.01"} 4.0
+parallelstore_op_latency_seconds_bucket{op="write",le="+Inf"} 5.0
+parallelstore_op_latency_seconds_count{op="write"} 5.0
+parallelstore_op_latency_seconds_sum{op="write"} 0.1
+# TYPE parallelstore_ops_total counter
+parallelstore_ops_total{op="read"} 100.0
+parallelstore_ops_total{op="write"} 5.0
+"""
+
+
+def histogram(buckets, total_sum=0.0):
+    """Build a histogram from cumulative buckets; the count is the last bucket."""
+    return {"buckets": dict(buckets), "count": max(buckets.values(), default=0.0), "sum": total_sum}
+
+
+def test_parse_histogram_sums_label_sets():
+    parsed = parse_histogram(EXPOSITION, "parallelstore_op_latency_seconds")
+
+    assert parsed["buckets"] == {0.001: 10.0, 0.01: 94.0, float("inf"): 105.0}
+    assert parsed["count"] == 105.0
+    assert parsed["sum"] == pytest.approx(0.6)
+
+
+def test_parse_histogram_filters_labels():
+    parsed = parse_histogram(EXPOSITION, "parallelstore_op_latency_seconds", {"op": "write"})
+
+    assert parsed == {"buckets": {0.01: 4.0, float("inf"): 5.0}, "count": 5.0, "sum": 0.1}
+
+
+def test_parse_counter():
+    assert parse_counter(EXPOSITION, "parallelstore_ops_total") == 105.0
+    assert parse_counter(EXPOSITION, "parallelstore_ops_total", {"op": "read"}) == 100.0
+    assert parse_counter(EXPOSITION, "parallelstore_missing_total") == 0.0
+
+
+def test_merge_histograms_with_different_bounds():
+    first = histogram({0.001: 2.0, 0.01: 6.0, float("inf"): 6.0}, 0.02)
+    # The second exposition leaves out the 0.001 bucket, which stayed at zero
+    second = histogram({0.01: 3.0, 0.1: 4.0, float("inf"): 4.0}, 0.1)
+
+    merged = merge_histograms([first, second])
+
+    assert merged["buckets"] == {0.001: 2.0, 0.01: 9.0, 0.1: 10.0, float("inf"): 10.0}
+    assert merged["count"] == 10.0
+    assert merged["sum"] == pytest.approx(0.12)
+
+
+def test_merge_no_histograms():
+    assert merge_histograms([]) == {"buckets": {}, "count": 0.0, "sum": 0.0}
+
+
+def test_subtract_histogram():
+    before = histogram({0.001: 5.0, 0.01: 10.0, float("inf"): 10.0}, 1.0)
+    after = histogram({0.001: 5.0, 0.01: 18.0, float("inf"): 20.0}, 3.0)
+
+    delta = subtract_histogram(after, before)
+
+    assert delta["buckets"] == {0.001: 0.0, 0.01: 8.0, float("inf"): 10.0}
+    assert delta["count"] == 10.0
+    assert delta["sum"] == 2.0
+
+
+def test_subtract_histogram_after_counter_reset():
+    before = histogram({0.01: 100.0, float("inf"): 100.0})
+    after = histogram({0.01: 3.0, float("inf"): 3.0})
+
+    assert subtract_histogram(after, before) is after
+
+
+def test_histogram_quantile_interpolates_within_bucket():
+    buckets = histogram({0.001: 10.0, 0.01: 90.0, float("inf"): 100.0})
+
+    assert histogram_quantile(0.05, buckets) == pytest.approx(0.0005)
+    assert histogram_quantile(0.5, buckets) == pytest.approx(0.001 + 0.009 * 40 / 80)
+
+
+def test_histogram_quantile_in_inf_bucket_returns_last_finite_bound():
+    assert histogram_quantile(0.99, histogram({0.001: 10.0, 0.01: 90.0, float("inf"): 100.0})) == 0.01
+
+
+def test_histogram_quantile_of_empty_histogram():
+    assert histogram_quantile(0.5, histogram({})) is None
+    assert histogram_quantile(0.5, histogram({0.01: 0.0, float("inf"): 0.0})) is None
+
+
+def test_summarize_client_latency_merges_pod_deltas():
+    before = {"time": 100.0, "histograms": {
+        "pod-a": histogram({0.001: 10.0, 0.01: 10.0, float("inf"): 10.0}),
+        "pod-b": histogram({0.001: 0.0, 0.01: 5.0, float("inf"): 5.0}),
+    }}
+    after = {"time": 110.0, "histograms": {
+        "pod-a": histogram({0.001: 60.0, 0.01: 60.0, float("inf"): 60.0}),
+        "pod-b": histogram({0.001: 0.0, 0.01: 55.0, float("inf"): 55.0}),
+        # Started after the first snapshot, so it has no baseline and is left out
+        "pod-c": histogram({0.001: 1000.0, float("inf"): 1000.0}),
+    }}
+
+    summary = summarize_client_latency(before, after)
+
+    assert summary["pods"] == 2
+    assert summary["ops"] == 100.0
+    assert summary["ops_per_s"] == 10.0
+    assert summary["p50"] == pytest.approx(0.001)
+    assert summary["p99"] == pytest.approx(0.001 + 0.009 * 49 / 50)
@@ -0,0 +1,131 @@
+"""
+Unit tests for the pod startup breakdown. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.startup_util import PHASES, summarize_startup, collect_startup_timelines
+
+T0 = datetime(2024, 5, 1, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def at(seconds):
+    return T0 + timedelta(seconds=seconds)
+
+
+def timeline(pod, node, mount_failures=0, **phases):
+    """Build a pod timeline; phases that are not given are unknown."""
+    return {"pod": pod, "node": node, "mount_failures": mount_failures,
+            "phases": {phase: phases.get(phase) for phase in PHASES}}
+
+
+def test_phase_percentiles():
+    timelines = [timeline(f"pod-{i}", "node-a", volume_mount=float(i), total=10.0 + i) for i in range(1, 21)]
+
+    summary = summarize_startup(timelines)
+
+    assert summary["pods"] == 20
+    assert summary["phases"]["volume_mount"] == {"count": 20, "p50": 10.0, "p95": 19.0, "max": 20.0}
+    assert summary["phases"]["total"]["p50"] == 20.0
+    assert summary["phases"]["scheduling"] == {"count": 0, "p50": None, "p95": None, "max": None}
+
+
+def test_mount_failures_are_counted():
+    timelines = [
+        timeline("pod-1", "node-a", mount_failures=3, total=60.0),
+        timeline("pod-2", "node-a", mount_failures=1, total=30.0),
+        timeline("pod-3", "node-b", total=5.0),
+    ]
+
+    summary = summarize_startup(timelines)
+
+    assert summary["mount_failures"] == 4
+    assert summary["pods_with_mount_failures"] == 2
+
+
+def test_nodes_above_fleet_p95_are_outliers_slowest_first():
+    timelines = (
+        [timeline(f"fast-{i}", f"node-{i % 10}", volume_mount=1.0, image_pull=1.0) for i in range(95)]
+        + [timeline(f"slow-mount-{i}", "node-slow-mount", volume_mount=30.0, image_pull=1.0) for i in range(3)]
+        + [timeline(f"slow-pull-{i}", "node-slow-pull", volume_mount=1.0, image_pull=60.0) for i in range(3)]
+    )
+
+    summary = summarize_startup(timelines)
+
+    assert [(o["node"], o["phase"]) for o in summary["node_outliers"]] == [
+        ("node-slow-pull", "image_pull"),
+        ("node-slow-mount", "volume_mount"),
+    ]
+    assert summary["node_outliers"][1] == {"node": "node-slow-mount", "phase": "volume_mount", "pods": 3,
+                                           "median_s": 30.0, "fleet_p95_s": 1.0}
+
+
+def test_outliers_are_capped():
+    timelines = [timeline(f"pod-{i}", f"node-{i}", total=float(i)) for i in range(1, 101)]
+
+    assert len(summarize_startup(timelines, max_outliers=2)["node_outliers"]) == 2
+    assert summarize_startup(timelines, max_outliers=2)["node_outliers"][0]["node"] == "node-100"
+
+
+def test_no_pods():
+    summary = summarize_startup([])
+
+    assert summary["pods"] == 0
+    assert summary["node_outliers"] == []
+    assert all(stats["count"] == 0 for stats in summary["phases"].values())
+
+
+def fake_pod(uid, created, conditions, started):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=f"pod-{uid}", uid=uid, creation_timestamp=at(created)),
+        spec=SimpleNamespace(node_name="node-a"),
+        status=SimpleNamespace(
+            conditions=[SimpleNamespace(type=kind, status="True", last_transition_time=at(seconds))
+                        for kind, seconds in conditions.items()],
+            container_statuses=[SimpleNamespace(state=SimpleNamespace(running=SimpleNamespace(started_at=at(started))))],
+        ),
+    )
+
+
+def fake_event(uid, reason, first, last=None, count=1):
+    return SimpleNamespace(
+        involved_object=SimpleNamespace(uid=uid), reason=reason, count=count,
+        first_timestamp=at(first), last_timestamp=at(last if last is not None else first),
+        event_time=None, metadata=SimpleNamespace(creation_timestamp=at(first)),
+    )
+
+
+class FakeKubernetesClient:
+    def __init__(self, pods, events):
+        self.pods, self.events = pods, events
+
+    def list_pods(self, namespace, label_selector=None):
+        return self.pods
+
+    def iter_events(self, namespace, field_selector=None):
+        return iter(self.events)
+
+
+def test_pod_timeline_from_conditions_and_events():
+    conditions = {"PodScheduled": 2, "PodReadyToStartContainers": 12, "ContainersReady": 20, "Ready": 20}
+    pods = [fake_pod("a", 0, conditions, started=18), fake_pod("old", -600, conditions, started=18)]
+    events = [
+        fake_event("a", "FailedMount", 5, count=2),
+        fake_event("a", "Pulling", 12),
+        fake_event("a", "Pulled", 15),
+        fake_event("a", "Created", 16),
+        fake_event("other", "FailedMount", 5),
+    ]
+
+    timelines = collect_startup_timelines(FakeKubernetesClient(pods, events), "ps", "app=ps-perf", since=at(0).timestamp())
+
+    assert len(timelines) == 1
+    assert timelines[0]["mount_failures"] == 2
+    assert timelines[0]["phases"] == pytest.approx({
+        "scheduling": 2.0, "volume_attach": None, "volume_mount": 10.0, "image_pull": 3.0,
+        "container_start": 3.0, "readiness": 2.0, "total": 20.0,
+    })
@@ -0,0 +1,72 @@
+"""
+Unit tests for the scaling sweep helpers. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import pytest
+
+from src.utils.sweep_util import find_knee, sweep_points
+
+
+def test_sweep_points_alternate_replica_direction_per_file_size():
+    points = sweep_points([1000, 500, 1000, 100], [25, 1, 5])
+
+    assert [(point["file_size_mb"], point["replicas"]) for point in points] == [
+        (1, 100), (1, 500), (1, 1000),
+        (5, 1000), (5, 500), (5, 100),
+        (25, 100), (25, 500), (25, 1000),
+    ]
+
+
+def curve(*points):
+    """Build curve rows from (replicas, iops) pairs."""
+    return [{"replicas": replicas, "iops_sustained": iops} for replicas, iops in points]
+
+
+def test_knee_is_step_before_gain_drops():
+    # 10 IOPS per replica up to 500 replicas, then only 1 per added replica
+    knee = find_knee(curve((100, 1000.0), (500, 5000.0), (1000, 5500.0), (2000, 6000.0)))
+
+    assert knee["replicas"] == 500
+    assert knee["value"] == 5000.0
+    assert [step["replicas"] for step in knee["marginal_gains"]] == [500, 1000, 2000]
+    assert [step["gain"] for step in knee["marginal_gains"]] == pytest.approx([1.0, 0.1, 0.05])
+
+
+def test_no_knee_while_still_scaling():
+    knee = find_knee(curve((100, 1000.0), (200, 1900.0), (400, 3500.0)))
+
+    assert knee["replicas"] is None
+    assert knee["value"] is None
+    assert [step["gain"] for step in knee["marginal_gains"]] == pytest.approx([0.9, 0.8])
+
+
+def test_min_gain_sets_the_threshold():
+    rows = curve((100, 1000.0), (200, 1500.0), (300, 1700.0))
+
+    assert find_knee(rows, min_gain=0.25)["replicas"] == 200
+    assert find_knee(rows, min_gain=0.6)["replicas"] == 100
+
+
+def test_rows_are_sorted_and_missing_values_skipped():
+    rows = curve((1000, 5500.0), (100, 1000.0), (250, None), (500, 5000.0), (0, 0.0))
+
+    knee = find_knee(rows)
+
+    assert knee["replicas"] == 500
+    assert [step["replicas"] for step in knee["marginal_gains"]] == [500, 1000]
+
+
+def test_other_metric():
+    rows = [{"replicas": 100, "throughput_mbps_sustained": 100.0}, {"replicas": 200, "throughput_mbps_sustained": 110.0}]
+
+    assert find_knee(rows, metric="throughput_mbps_sustained")["replicas"] == 100
+
+
+@pytest.mark.parametrize("rows", [
+    [],
+    curve((100, 1000.0)),
+    curve((100, 0.0), (200, 1000.0)),
+])
+def test_not_enough_data(rows):
+    assert find_knee(rows) == {"replicas": None, "value": None, "marginal_gains": []}
@@ -0,0 +1,127 @@
+"""
+Unit tests for run_transfer against a scripted operations API. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import pytest
+
+from src.utils import transfer_util
+from src.utils.transfer_util import run_transfer
+
+OPERATION = "projects/p/locations/us-central1-a/operations/op-1"
+
+
+class FakeOperationsApi:
+    """
+    Stand-in for ParallelstoreOperationsApi that returns scripted operation states.
+    """
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.started = []
+        self.polls = 0
+
+    def start_transfer(self, instance_name, kind, source, destination):
+        self.started.append((instance_name, kind, source, destination))
+        return OPERATION
+
+    def get_operation(self, operation_name):
+        assert operation_name == OPERATION
+        self.polls += 1
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+class FakeClock:
+    """
+    Replaces time.monotonic and time.sleep in transfer_util; sleeping advances the clock.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(transfer_util.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(transfer_util.time, "sleep", clock.sleep)
+    return clock
+
+
+def done(counters=None, create_time="2024-05-01T10:00:00.123456789Z", end_time="2024-05-01T10:00:10.123456789Z"):
+    return {
+        "done": True,
+        "metadata": {
+            "createTime": create_time,
+            "endTime": end_time,
+            "operationMetadata": {"counters": counters or {}},
+        },
+    }
+
+
+def test_polls_with_exponential_backoff_capped_at_max_interval(clock):
+    api = FakeOperationsApi([{"done": False}] * 6 + [done()])
+
+    run_transfer(api, "ps-instance", "import", "gs://bucket/", "/", initial_interval=2, max_interval=10)
+
+    assert api.started == [("ps-instance", "import", "gs://bucket/", "/")]
+    assert api.polls == 7
+    assert clock.sleeps == [2, 4, 8, 10, 10, 10]
+
+
+def test_computes_rates_from_operation_counters(clock):
+    counters = {"bytesCopied": str(50 * 1024 * 1024), "objectsCopied": "200"}
+    api = FakeOperationsApi([done(counters)])
+
+    stats = run_transfer(api, "ps-instance", "export", "/", "gs://bucket/")
+
+    assert clock.sleeps == []
+    assert stats["operation"] == OPERATION
+    assert stats["duration_s"] == 10.0
+    assert stats["bytes"] == 50 * 1024 * 1024
+    assert stats["objects"] == 200
+    assert stats["mb_per_s"] == 5.0
+    assert stats["files_per_s"] == 20.0
+    assert stats["start_time"] == "2024-05-01T10:00:00.123456+00:00"
+
+
+def test_missing_counters_count_as_zero(clock):
+    stats = run_transfer(FakeOperationsApi([done()]), "ps-instance", "import", "gs://bucket/", "/")
+
+    assert stats["bytes"] == 0
+    assert stats["objects"] == 0
+    assert stats["mb_per_s"] == 0.0
+
+
+def test_missing_operation_times_fall_back_to_local_clock(clock):
+    stats = run_transfer(FakeOperationsApi([done(create_time=None, end_time=None)]),
+                         "ps-instance", "import", "gs://bucket/", "/")
+
+    # The local start and end are taken right after another, so the duration is clamped to 1 ms
+    assert stats["duration_s"] == 0.001
+
+
+def test_failed_operation_raises(clock):
+    api = FakeOperationsApi([{"done": False}, {"done": True, "error": {"code": 7, "message": "Permission denied"}}])
+
+    with pytest.raises(RuntimeError, match="failed: 7 Permission denied"):
+        run_transfer(api, "ps-instance", "import", "gs://bucket/", "/")
+
+
+def test_timeout_raises(clock):
+    api = FakeOperationsApi([{"done": False}])
+
+    with pytest.raises(RuntimeError, match="did not finish within 30 seconds"):
+        run_transfer(api, "ps-instance", "import", "gs://bucket/", "/", timeout=30, initial_interval=4)
+
+    # The last sleep is cut short so the deadline is not overshot
+    assert clock.now == 30
+    assert clock.sleeps == [4, 8, 16, 2]
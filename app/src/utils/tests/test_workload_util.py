@@ -0,0 +1,139 @@
+"""
+Unit tests for the load generator workload helpers. Run from app/ with:
+
+    PYTHONPATH=. pytest src/utils/tests
+"""
+import math
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import workload_util
+from src.utils.scrape_util import OP_LATENCY_METRIC
+from src.utils.workload_util import wait_for_running_pods, wait_for_steady_state, coefficient_of_variation
+
+
+def pod(name, deleting=False):
+    return SimpleNamespace(metadata=SimpleNamespace(
+        name=name, deletion_timestamp=datetime.now(timezone.utc) if deleting else None,
+    ))
+
+
+class LaggingPodCache:
+    """
+    Stand-in for the informer-backed list_pods that returns successive cache states; the last one repeats.
+    """
+
+    def __init__(self, *states):
+        self.states = list(states)
+
+    def list_pods(self, namespace, label_selector=None, phase=None):
+        assert phase == "Running"
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(workload_util.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(workload_util.time, "time", lambda: now[0])
+    monkeypatch.setattr(workload_util.time, "sleep", lambda seconds: now.__setitem__(0, now[0] + seconds))
+    return now
+
+
+def test_waits_for_new_pods_and_skips_terminating_ones(clock):
+    cache = LaggingPodCache(
+        [pod("old-1", deleting=True), pod("new-1")],
+        [pod("old-1", deleting=True), pod("new-1"), pod("new-2")],
+    )
+
+    pods = wait_for_running_pods(cache, "ps", "app=ps-perf", 2, timeout=60)
+
+    assert [p.metadata.name for p in pods] == ["new-1", "new-2"]
+    assert clock[0] == 1
+
+
+def test_waits_for_scale_down(clock):
+    cache = LaggingPodCache([pod("a"), pod("b"), pod("c")], [pod("a"), pod("b")])
+
+    assert len(wait_for_running_pods(cache, "ps", "app=ps-perf", 2, timeout=60)) == 2
+
+
+def test_times_out(clock):
+    cache = LaggingPodCache([pod("a")])
+
+    with pytest.raises(RuntimeError, match="shows 1 running 'app=ps-perf' pods instead of 2"):
+        wait_for_running_pods(cache, "ps", "app=ps-perf", 2, timeout=5)
+    assert clock[0] == 5
+
+
+@pytest.mark.parametrize("values, cv", [
+    ([100.0, 100.0, 100.0], 0.0),
+    ([50.0, 150.0], 0.5),
+    ([0.0, 0.0], math.inf),
+    ([], math.inf),
+])
+def test_coefficient_of_variation(values, cv):
+    assert coefficient_of_variation(values) == cv
+
+
+def metrics_body(count):
+    """A /metrics body in which one pod has completed `count` reads, each taking 5 ms."""
+    return (
+        f'{OP_LATENCY_METRIC}_bucket{{op="read",le="0.01"}} {count}\n'
+        f'{OP_LATENCY_METRIC}_bucket{{op="read",le="+Inf"}} {count}\n'
+        f'{OP_LATENCY_METRIC}_count{{op="read"}} {count}\n'
+        f'{OP_LATENCY_METRIC}_sum{{op="read"}} {count * 0.005}\n'
+    )
+
+
+@pytest.fixture
+def scrapes(monkeypatch):
+    """
+    Replaces scrape_pods; set the successive cumulative read counts to serve, the last one repeats.
+    """
+    counts = []
+
+    def scrape_pods(kubernetes_client, namespace, pods, **scrape_options):
+        return {"pod-1": metrics_body(counts.pop(0) if len(counts) > 1 else counts[0])}
+
+    monkeypatch.setattr(workload_util, "scrape_pods", scrape_pods)
+    return counts
+
+
+def test_steady_state_after_warm_up(clock, scrapes):
+    # 10 and 50 reads/s while warming up, then a constant 100 reads/s
+    scrapes.extend([0, 100, 600, 1600, 2600, 3600])
+
+    result = wait_for_steady_state(None, "ps", [], interval=10, window=3, cv_tolerance=0.05, max_duration=600)
+
+    assert result["steady"] is True
+    assert result["cv"] == 0.0
+    assert result["rates"] == [10.0, 50.0, 100.0, 100.0, 100.0]
+    assert (result["start"], result["end"], result["warmup_s"]) == (20, 50, 20)
+    assert result["client_latency"]["ops_per_s"] == 100.0
+    assert clock[0] == 50
+
+
+def test_not_steady_within_max_duration(clock, scrapes):
+    # Alternates between 10 and 100 reads/s
+    scrapes.extend([0, 100, 1100, 1200, 2200, 2300, 3300])
+
+    result = wait_for_steady_state(None, "ps", [], interval=10, window=3, cv_tolerance=0.05, max_duration=60)
+
+    assert result["steady"] is False
+    assert result["cv"] == pytest.approx(coefficient_of_variation([100.0, 10.0, 100.0]))
+    assert len(result["rates"]) == 6
+    assert (result["start"], result["end"]) == (30, 60)
+    assert clock[0] == 60
+
+
+def test_no_throughput_is_never_steady(clock, scrapes):
+    scrapes.append(0)
+
+    result = wait_for_steady_state(None, "ps", [], interval=10, window=3, cv_tolerance=0.05, max_duration=60)
+
+    assert result["steady"] is False
+    assert result["cv"] == math.inf
+    assert result["rates"] == [0.0] * 6
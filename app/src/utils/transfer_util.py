@@ -0,0 +1,154 @@
+import re
+import time
+from datetime import datetime, timezone
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from src.utils.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+PARALLELSTORE_API = "https://parallelstore.googleapis.com/v1"
+
+
+class ParallelstoreOperationsApi:
+    """
+    Minimal client for starting Parallelstore data transfers and reading their
+    long-running operations through the REST API.
+    """
+
+    def __init__(self, project_id, location, session=None):
+        """
+        Initializes the client.
+
+        Args:
+            project_id (str): Project that owns the instance.
+            location (str): Location (zone) of the instance.
+            session (AuthorizedSession): Session to use; one is created from the default credentials if not given.
+        """
+        self.project_id = project_id
+        self.location = location
+        if session is None:
+            credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+            session = AuthorizedSession(credentials)
+        self.session = session
+
+    def start_transfer(self, instance_name, kind, source, destination):
+        """
+        Start an import or export and return the operation name.
+
+        Args:
+            instance_name (str): Parallelstore instance name.
+            kind (str): "import" (GCS to Parallelstore) or "export" (Parallelstore to GCS).
+            source (str): gs:// URI for imports, Parallelstore path for exports.
+            destination (str): Parallelstore path for imports, gs:// URI for exports.
+
+        Returns:
+            str: Full name of the long-running operation.
+        """
+        if kind == "import":
+            verb = "importData"
+            body = {"sourceGcsBucket": {"uri": source}, "destinationParallelstore": {"path": destination}}
+        elif kind == "export":
+            verb = "exportData"
+            body = {"sourceParallelstore": {"path": source}, "destinationGcsBucket": {"uri": destination}}
+        else:
+            raise ValueError(f"Invalid transfer kind: {kind}. Use 'import' or 'export'.")
+
+        url = (f"{PARALLELSTORE_API}/projects/{self.project_id}/locations/{self.location}"
+               f"/instances/{instance_name}:{verb}")
+        response = self.session.post(url, json=body)
+        response.raise_for_status()
+        return response.json()["name"]
+
+    def get_operation(self, operation_name):
+        """
+        Read the current state of a long-running operation.
+
+        Args:
+            operation_name (str): Full operation name returned by start_transfer.
+
+        Returns:
+            dict: Operation resource with "done", "metadata" and "error" or "response".
+        """
+        response = self.session.get(f"{PARALLELSTORE_API}/{operation_name}")
+        response.raise_for_status()
+        return response.json()
+
+
+def _parse_time(value):
+    """
+    Parse an RFC 3339 timestamp with up to nanosecond precision into an aware datetime.
+    """
+    if not value:
+        return None
+    value = re.sub(r"(\.\d{6})\d+", r"\1", value).replace("Z", "+00:00")
+    return datetime.fromisoformat(value)
+
+
+def run_transfer(operations_api, instance_name, kind, source, destination, timeout=3600,
+                 initial_interval=2, max_interval=30):
+    """
+    Start a Parallelstore transfer, wait for it with exponential backoff and measure it.
+
+    Args:
+        operations_api (ParallelstoreOperationsApi): Client, or a stand-in with the same
+                                                     start_transfer/get_operation methods.
+        instance_name (str): Parallelstore instance name.
+        kind (str): "import" or "export".
+        source (str): Transfer source (gs:// URI or Parallelstore path).
+        destination (str): Transfer destination (Parallelstore path or gs:// URI).
+        timeout (int): Maximum time in seconds to wait for the operation.
+        initial_interval (float): First polling interval in seconds.
+        max_interval (float): Upper bound for the polling interval in seconds.
+
+    Returns:
+        dict: Transfer statistics: "operation", "start_time", "end_time", "duration_s",
+              "bytes", "objects", "mb_per_s" and "files_per_s".
+
+    Raises:
+        RuntimeError: If the operation fails or does not finish within the timeout.
+    """
+    logger.info(f"Starting {kind} from '{source}' to '{destination}' on instance '{instance_name}'...")
+    local_start = datetime.now(timezone.utc)
+    operation_name = operations_api.start_transfer(instance_name, kind, source, destination)
+    logger.info(f"Started operation: {operation_name}")
+
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        operation = operations_api.get_operation(operation_name)
+        if operation.get("done"):
+            break
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Operation '{operation_name}' did not finish within {timeout} seconds.")
+        time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+        interval = min(interval * 2, max_interval)
+    local_end = datetime.now(timezone.utc)
+
+    if "error" in operation:
+        error = operation["error"]
+        raise RuntimeError(f"Operation '{operation_name}' failed: {error.get('code')} {error.get('message')}")
+
+    metadata = operation.get("metadata", {})
+    counters = metadata.get("operationMetadata", {}).get("counters", {})
+    start_time = _parse_time(metadata.get("createTime")) or local_start
+    end_time = _parse_time(metadata.get("endTime")) or local_end
+    duration = max((end_time - start_time).total_seconds(), 1e-3)
+    transferred_bytes = int(counters.get("bytesCopied", 0))
+    transferred_objects = int(counters.get("objectsCopied", 0))
+
+    stats = {
+        "operation": operation_name,
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+        "duration_s": round(duration, 3),
+        "bytes": transferred_bytes,
+        "objects": transferred_objects,
+        "mb_per_s": round(transferred_bytes / (1024 * 1024) / duration, 3),
+        "files_per_s": round(transferred_objects / duration, 3),
+    }
+    logger.info(
+        f"{kind.capitalize()} finished in {stats['duration_s']}s: {transferred_objects} objects, "
+        f"{transferred_bytes} bytes ({stats['mb_per_s']} MB/s, {stats['files_per_s']} files/s)."
+    )
+    return stats
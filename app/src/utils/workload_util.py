@@ -0,0 +1,301 @@
+import math
+import statistics
+import time
+from collections import deque
+from src.utils.logging_util import get_logger
+from src.utils.scrape_util import (
+    scrape_pods, parse_histogram, subtract_histogram, summarize_client_latency, OP_LATENCY_METRIC,
+)
+from src.utils.startup_util import collect_startup_timelines, summarize_startup
+
+logger = get_logger(__name__)
+
+
+def switch_workload(kubernetes_client, deployment_name, namespace, env, replicas, timeout):
+    """
+    Reconfigure the load generator deployment and wait until the new pods are rolled out.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to patch and watch the deployment.
+        deployment_name (str): Name of the load generator deployment.
+        namespace (str): Namespace of the deployment.
+        env (dict): Environment variables selecting the workload, e.g. {"WORKLOAD": "write"}.
+        replicas (int): Number of replicas to run the workload on.
+        timeout (int): Maximum time in seconds to wait for the rollout.
+
+    Returns:
+        callable: Restores the previous environment and replica count when called.
+    """
+    apps_api = kubernetes_client.get_client("AppsV1Api")
+    original_replicas = apps_api.read_namespaced_deployment(name=deployment_name, namespace=namespace).spec.replicas
+    previous_env = kubernetes_client.set_deployment_env(deployment_name, namespace, env)
+
+    def restore():
+        logger.info(f"Restoring deployment '{deployment_name}' to its previous workload and {original_replicas} replicas.")
+        kubernetes_client.set_deployment_env(deployment_name, namespace, previous_env)
+        apps_api.patch_namespaced_deployment_scale(
+            name=deployment_name, namespace=namespace, body={"spec": {"replicas": original_replicas}}
+        )
+
+    logger.info(f"Scaling deployment '{deployment_name}' in namespace '{namespace}' to {replicas} replicas.")
+    try:
+        apps_api.patch_namespaced_deployment_scale(
+            name=deployment_name, namespace=namespace, body={"spec": {"replicas": replicas}}
+        )
+        durations = kubernetes_client.wait_for_deployment_rollout(deployment_name, namespace, replicas, timeout)
+    except Exception:
+        restore()
+        raise
+    logger.info(f"Deployment '{deployment_name}' rollout step durations (s): {durations}")
+    return restore
+
+
+def wait_for_running_pods(kubernetes_client, namespace, label_selector, replicas, timeout, poll_interval=1):
+    """
+    Wait until the pod informer cache shows the given number of running pods that are not being deleted.
+
+    The cache trails the API server, so right after a rollout it can still miss
+    new pods or hold terminating ones, which would then be left out of or
+    added to the measurement.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client whose informer cache is read.
+        namespace (str): Namespace of the pods.
+        label_selector (str): Selects the pods, e.g. "app=ps-perf".
+        replicas (int): Number of running pods to wait for.
+        timeout (float): Maximum time in seconds to wait.
+        poll_interval (float): Seconds between looks at the cache.
+
+    Returns:
+        list: The running V1Pod objects.
+
+    Raises:
+        RuntimeError: If the cache does not show exactly `replicas` running pods within the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        pods = [
+            pod for pod in kubernetes_client.list_pods(namespace, label_selector=label_selector, phase="Running")
+            if pod.metadata.deletion_timestamp is None
+        ]
+        if len(pods) == replicas:
+            return pods
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Pod cache shows {len(pods)} running '{label_selector}' pods instead of {replicas} "
+                               f"after {timeout} seconds.")
+        time.sleep(poll_interval)
+
+
+def _snapshot_ops(kubernetes_client, namespace, pods, ops, scrape_options):
+    """
+    Scrape every pod once and extract the per-operation latency histogram for each op.
+    """
+    bodies = scrape_pods(kubernetes_client, namespace, pods, **scrape_options)
+    snapshot_time = time.time()
+    return {
+        op: {
+            "time": snapshot_time,
+            "histograms": {
+                pod: parse_histogram(body, OP_LATENCY_METRIC, {"op": op})
+                for pod, body in bodies.items() if body is not None
+            },
+        }
+        for op in ops
+    }
+
+
+def measure_op_latency(kubernetes_client, namespace, pods, ops, duration, **scrape_options):
+    """
+    Measure client-side rates and latency percentiles per operation type over a window.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used for the API-server proxy.
+        namespace (str): Namespace of the load generator pods.
+        pods (list): V1Pod objects to scrape.
+        ops (iterable): Values of the "op" label to summarize, e.g. ("create", "stat").
+        duration (float): Length of the measurement window in seconds.
+        **scrape_options: Passed on to scrape_pods().
+
+    Returns:
+        dict: Operation -> summary as returned by summarize_client_latency().
+    """
+    before = _snapshot_ops(kubernetes_client, namespace, pods, ops, scrape_options)
+    logger.info(f"Measuring {', '.join(ops)} for {duration / 60:.1f} minutes...")
+    time.sleep(duration)
+    after = _snapshot_ops(kubernetes_client, namespace, pods, ops, scrape_options)
+    summaries = {}
+    for op in ops:
+        logger.info(f"Operation '{op}':")
+        summaries[op] = summarize_client_latency(before[op], after[op])
+    return summaries
+
+
+def coefficient_of_variation(values):
+    """
+    Return the coefficient of variation (population standard deviation / mean) of a sample.
+
+    Args:
+        values (list): Samples, e.g. throughput per interval.
+
+    Returns:
+        float: The coefficient of variation; infinite when there are no samples or the mean is zero.
+    """
+    mean = statistics.fmean(values) if values else 0.0
+    return statistics.pstdev(values) / mean if mean > 0 else math.inf
+
+
+def _ops_rate(before, after):
+    """
+    Return the pod-wide operations per second between two histogram snapshots.
+    """
+    completed = sum(
+        subtract_histogram(histogram, before["histograms"][pod])["count"]
+        for pod, histogram in after["histograms"].items() if pod in before["histograms"]
+    )
+    return completed / max(after["time"] - before["time"], 1e-3)
+
+
+def wait_for_steady_state(kubernetes_client, namespace, pods, interval, window, cv_tolerance, max_duration,
+                          op="read", **scrape_options):
+    """
+    Sample client-side throughput until it is steady and return the steady window.
+
+    Throughput is sampled from the pods' latency histograms every `interval`
+    seconds. The warm-up ends once the coefficient of variation of the last
+    `window` samples is within `cv_tolerance`; those samples form the measured
+    window. If that does not happen within `max_duration`, the last `window`
+    samples are returned and marked as not steady.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used for the API-server proxy.
+        namespace (str): Namespace of the load generator pods.
+        pods (list): V1Pod objects to scrape.
+        interval (float): Seconds between throughput samples.
+        window (int): Number of samples the coefficient of variation is computed over.
+        cv_tolerance (float): Maximum coefficient of variation for the window to count as steady.
+        max_duration (float): Maximum seconds to sample, warm-up and window included.
+        op (str): Value of the "op" label to measure.
+        **scrape_options: Passed on to scrape_pods().
+
+    Returns:
+        dict: "start" and "end" of the measured window (Unix time), its "client_latency" summary,
+              whether it was "steady", its "cv", the "warmup_s" before it and the "rates" of every sample.
+    """
+    start_time = time.monotonic()
+    snapshots = deque([_snapshot_ops(kubernetes_client, namespace, pods, (op,), scrape_options)[op]], maxlen=window + 1)
+    first_time = snapshots[0]["time"]
+    rates, cv = [], None
+    logger.info(f"Waiting for steady '{op}' throughput (CV <= {cv_tolerance} over {window} x {interval}s, "
+                f"at most {max_duration / 60:.1f} minutes)...")
+    while True:
+        time.sleep(interval)
+        snapshots.append(_snapshot_ops(kubernetes_client, namespace, pods, (op,), scrape_options)[op])
+        rates.append(_ops_rate(snapshots[-2], snapshots[-1]))
+        if len(rates) >= window:
+            cv = coefficient_of_variation(rates[-window:])
+        logger.info(f"Throughput sample {len(rates)}: {rates[-1]:.1f} ops/s, CV={cv if cv is None else round(cv, 4)}")
+        steady = cv is not None and cv <= cv_tolerance
+        elapsed = time.monotonic() - start_time
+        if steady or elapsed + interval > max_duration:
+            break
+
+    start, end = snapshots[0], snapshots[-1]
+    warmup = start["time"] - first_time
+    if steady:
+        logger.info(f"Throughput steady after {warmup:.0f}s of warm-up.")
+    else:
+        logger.warning(f"Throughput did not reach steady state within {max_duration:.0f}s; "
+                       f"measuring the last {end['time'] - start['time']:.0f}s anyway.")
+    return {
+        "start": start["time"],
+        "end": end["time"],
+        "client_latency": summarize_client_latency(start, end),
+        "steady": steady,
+        "cv": cv,
+        "warmup_s": round(warmup, 1),
+        "rates": rates,
+    }
+
+
+def scale_and_measure(kubernetes_client, deployment_name, namespace, label_selector, replicas, timeout, interval,
+                      window, cv_tolerance, max_duration, op="read", **scrape_options):
+    """
+    Scale the load generator deployment, wait for the rollout and measure its steady-state window.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to scale, watch and scrape.
+        deployment_name (str): Name of the load generator deployment.
+        namespace (str): Namespace of the deployment.
+        label_selector (str): Selects the load generator pods, e.g. "app=ps-perf".
+        replicas (int): Number of replicas to run.
+        timeout (int): Maximum time in seconds to wait for the rollout.
+        interval (float): See wait_for_steady_state().
+        window (int): See wait_for_steady_state().
+        cv_tolerance (float): See wait_for_steady_state().
+        max_duration (float): See wait_for_steady_state().
+        op (str): Value of the "op" label to measure.
+        **scrape_options: Passed on to scrape_pods().
+
+    Returns:
+        dict: "replicas", "rollout" step durations, the "startup" phase breakdown of the pods this
+              step created ("summary" from summarize_startup() and per-pod "timelines"; None if it
+              could not be collected) and the window as returned by wait_for_steady_state().
+    """
+    apps_api = kubernetes_client.get_client("AppsV1Api")
+    logger.info(f"Scaling deployment '{deployment_name}' in namespace '{namespace}' to {replicas} replicas.")
+    scaled_at = time.time()
+    apps_api.patch_namespaced_deployment_scale(
+        name=deployment_name, namespace=namespace, body={"spec": {"replicas": replicas}}
+    )
+    durations = kubernetes_client.wait_for_deployment_rollout(deployment_name, namespace, replicas, timeout)
+    logger.info(f"Deployment '{deployment_name}' rollout step durations (s): {durations}")
+    pods = wait_for_running_pods(kubernetes_client, namespace, label_selector, replicas, timeout)
+
+    # Collect right away: the events the breakdown is built from expire
+    startup = None
+    try:
+        timelines = collect_startup_timelines(kubernetes_client, namespace, label_selector, since=scaled_at)
+        startup = {"summary": summarize_startup(timelines), "timelines": timelines}
+    except Exception as e:
+        logger.warning(f"Could not collect the pod startup breakdown: {e}")
+
+    steady_window = wait_for_steady_state(
+        kubernetes_client, namespace, pods, interval, window, cv_tolerance, max_duration, op, **scrape_options
+    )
+    return {"replicas": replicas, "rollout": durations, "startup": startup, **steady_window}
+
+
+def ramp_deployment(kubernetes_client, deployment_name, namespace, label_selector, steps, timeout, interval,
+                    window, cv_tolerance, max_hold, op="read", **scrape_options):
+    """
+    Scale the load generator deployment up in stages and measure each plateau once it is steady.
+
+    Args:
+        kubernetes_client (KubernetesClient): Client used to scale, watch and scrape.
+        deployment_name (str): Name of the load generator deployment.
+        namespace (str): Namespace of the deployment.
+        label_selector (str): Selects the load generator pods, e.g. "app=ps-perf".
+        steps (iterable): Replica counts to ramp through, in order.
+        timeout (int): Maximum time in seconds to wait for each step's rollout.
+        interval (float): See wait_for_steady_state().
+        window (int): See wait_for_steady_state().
+        cv_tolerance (float): See wait_for_steady_state().
+        max_hold (float): Maximum seconds to hold each step, passed on as max_duration.
+        op (str): Value of the "op" label to measure.
+        **scrape_options: Passed on to scrape_pods().
+
+    Returns:
+        list: One result of scale_and_measure() per step.
+    """
+    plateaus = []
+    for replicas in steps:
+        plateau = scale_and_measure(
+            kubernetes_client, deployment_name, namespace, label_selector, replicas, timeout,
+            interval, window, cv_tolerance, max_hold, op, **scrape_options,
+        )
+        logger.info(
+            f"Plateau at {replicas} replicas: {plateau['client_latency']['ops_per_s']:.1f} ops/s "
+            f"({'steady' if plateau['steady'] else 'not steady'} after {plateau['warmup_s']}s of warm-up)"
+        )
+        plateaus.append(plateau)
+    return plateaus